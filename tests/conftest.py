@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from orhelper import FlightDataType
+
+from visualizer.columns import FlightColumns
+from visualizer.recording import save_recording
+from visualizer.rocket import Body, Fin, Nose, Rocket
+from visualizer.simulation import SimulationResult
+
+
+@pytest.fixture
+def recording(tmp_path):
+    """Recording of a synthetic rocket and flight, to run without Java"""
+    rocket = Rocket("simple.ork")
+    rocket.length, rocket.radius, rocket.dry_mass = 0.4, 0.0125, 0.05
+    rocket.nose = Nose(np.sqrt(np.linspace(0, 1, 101)) * 0.0125, 0.1, 0.4)
+    body = Body(0.1, 0.3, 0.0125, 0.4)
+    body.fins.append(
+        Fin(
+            np.array([0.1, 0.0]),
+            np.array([0.32, 0.0125]),
+            [np.array(point) for point in [[0, 0], [0.04, 0.04], [0.08, 0.04]]],
+            3,
+            0.4,
+            0.002,
+        )
+    )
+    rocket.bodys = [body]
+    rocket.build_meshes()
+
+    time = np.linspace(0, 10, 1001)
+    flight_data = {
+        FlightDataType.TYPE_TIME: time,
+        FlightDataType.TYPE_ALTITUDE: 100 * np.sin(np.pi * time / 10),
+        FlightDataType.TYPE_POSITION_X: 2 * time,
+        FlightDataType.TYPE_POSITION_Y: np.zeros_like(time),
+        FlightDataType.TYPE_POSITION_XY: 2 * time,
+        FlightDataType.TYPE_ORIENTATION_THETA: np.radians(90 - 6 * time),
+        FlightDataType.TYPE_ORIENTATION_PHI: np.zeros_like(time),
+        FlightDataType.TYPE_AOA: np.zeros_like(time),
+    }
+    rocket.apply_result(
+        SimulationResult(FlightColumns(flight_data), 100.0, 31.4, 10.0, 5.0, 0.01, 0.1)
+    )
+    path = tmp_path / "simple.npz"
+    save_recording(rocket, path)
+    return path, rocket
@@ -0,0 +1,52 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import dataclasses
+from pathlib import Path
+
+import visualizer.scene as scene
+from visualizer.allocations import AllocationTracker
+from visualizer.recording import RecordedRocket
+from visualizer.settings import LibrarySettings
+
+# peak allocation of a steady-state frame (unit: byte)
+FRAME_ALLOCATION_BUDGET = 128 * 1024
+RETAINED_ALLOCATION_BUDGET = 16 * 1024  # growth over the tracked frames (unit: byte)
+
+
+def test_briefing_frames_stay_within_allocation_budget(
+    recording, tmp_path, monkeypatch
+):
+    path, _ = recording
+    monkeypatch.setattr(
+        scene,
+        "Rocket",
+        lambda file_path, settings=None: RecordedRocket(file_path, path, settings),
+    )
+    app = scene.AppMain()
+    library = LibrarySettings((str(tmp_path),), str(tmp_path / "library.sqlite"))
+    app.settings = dataclasses.replace(app.settings, library=library)
+    app.switch_scene(scene.SCENE_STATE.LIBRARY)
+    app.scene.ork_file = Path("simple.ork")  # picked in the library
+    app.switch_scene(scene.SCENE_STATE.BRIEFING)
+    assert app.scene.rocket is not None
+    for _ in range(30):  # warm up the caches
+        app.run_frame()
+
+    tracker = AllocationTracker(attribute=False)
+    app.allocation_tracker = tracker
+    tracker.start()
+    try:
+        for _ in range(5):  # replace the objects allocated before tracing
+            app.run_frame()
+        tracker.reset()
+        for _ in range(30):
+            app.run_frame()
+    finally:
+        tracker.stop()
+
+    assert isinstance(app.scene, scene.BriefingScene)
+    assert max(tracker.frame_peak()) < FRAME_ALLOCATION_BUDGET
+    retained = sum(sum(stats.retained) for stats in tracker.phases.values())
+    assert retained < RETAINED_ALLOCATION_BUDGET
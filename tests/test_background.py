@@ -0,0 +1,42 @@
+import pygame as pg
+
+from visualizer.background import SkyBackground
+from visualizer.layout import Layout
+
+
+def test_tiles_are_rendered_once_per_window_size():
+    Layout.set_window_size((320, 240))
+    background = SkyBackground(100)
+    background.update()
+    tiles = background.tiles
+    for altitude in (0, 50, 100, 1000):
+        background.set_view(altitude, altitude / 2)
+        background.update()
+        assert background.tiles is tiles
+
+    Layout.set_window_size((640, 480))
+    background.update()
+    assert background.tiles is not tiles
+    assert background.tiles["sky"][0].get_size() == (640, 480)
+    Layout.set_window_size((320, 240))
+    background.update()
+    assert background.tiles is tiles  # cached at the seen size
+
+
+def test_background_covers_window_at_any_altitude():
+    Layout.set_window_size((320, 240))
+    background = SkyBackground(100)
+    screen = pg.Surface((320, 240))
+    colors = []
+    for altitude in (-10, 0, 30, 50, 100, 1e6):
+        screen.fill((255, 0, 255))
+        background.set_view(altitude, 1e4)
+        background.update()
+        background.draw(screen)
+        assert pg.transform.average_color(screen)[:3] != (255, 0, 255)
+        assert screen.get_at((0, 0))[:3] != (255, 0, 255)
+        assert screen.get_at((319, 239))[:3] != (255, 0, 255)
+        colors.append(screen.get_at((160, 0)))
+    assert colors[0] == colors[1]  # below the ground
+    assert colors[-2] == colors[-1]  # above maxAltitude
+    assert colors[1] != colors[-1]
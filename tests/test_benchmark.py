@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from visualizer import benchmark
+from visualizer.benchmark import default_scenario, run_benchmark
+from visualizer.profiler import profile_phase
+
+
+def test_benchmark_runs_scenario_without_java(recording):
+    path, _ = recording
+    result = run_benchmark("simple.ork", path, default_scenario(frames=4))
+
+    assert [step["name"] for step in result["steps"]] == [
+        "top",
+        "open",
+        "briefing",
+        "resize",
+        "game",
+        "back_to_briefing",
+        "back_to_top",
+    ]
+    assert result["time_to_briefing_s"] > 0
+    assert result["steps"][-1]["frame_ms"]["p95"] >= 0
+    json.dumps(result)  # machine-readable
+
+
+def test_pipeline_benchmark_reports_cold_and_warm_runs(tmp_path, monkeypatch):
+    class ProfiledRocket:
+        def __init__(self, file_path, settings=None):
+            self.file_path = str(file_path)
+            self.profiler = None
+
+        def run_simulation(self):
+            with profile_phase(self.profiler, "load_doc"):
+                if "broken" in self.file_path:
+                    raise ValueError("No simulation")
+            with profile_phase(self.profiler, "run_simulation"):
+                self.profiler.count("timeseries_values", 10)
+
+    monkeypatch.setattr(benchmark, "Rocket", ProfiledRocket)
+    (tmp_path / "sub").mkdir()
+    for name in ("a.ork", "sub/b.ork", "sub/broken.ork"):
+        (tmp_path / name).write_bytes(b"")
+    result = benchmark.run_pipeline_benchmark([tmp_path], repeats=2, processes=0)
+
+    assert len(result["files"]) == 3
+    assert [run["jvm"] for run in result["runs"]] == ["cold"] + ["warm"] * 5
+    summary = result["summary"]
+    assert summary["cold"]["total_s"]["n"] == 1
+    assert summary["warm"]["phases_s"]["run_simulation"]["n"] == 3
+    broken = [file for file in summary["files"] if "broken" in file][0]
+    assert summary["files"][broken]["errors"] == 2
+    json.dumps(result)
+
+
+def test_startup_error_is_not_hidden_by_the_tracker(monkeypatch):
+    def fail():
+        raise RuntimeError("no display")
+
+    monkeypatch.setattr(benchmark, "AppMain", fail)
+    with pytest.raises(RuntimeError, match="no display"):
+        run_benchmark("simple.ork", track_allocations=True)
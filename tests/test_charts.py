@@ -0,0 +1,57 @@
+import time
+
+import numpy as np
+import pygame as pg
+
+from visualizer.charts import BackgroundChart, minmax_decimate
+from visualizer.layout import Layout
+
+
+def wait_for_render(chart: BackgroundChart) -> None:
+    deadline = time.perf_counter() + 5
+    while chart.is_rendering and time.perf_counter() < deadline:
+        time.sleep(0.001)
+    chart.update()
+
+
+def test_decimation_keeps_peaks():
+    x = np.linspace(0, 10, 100_001)
+    y = np.sin(x)
+    y[12_345] = 5.0  # spike
+    y[50_000] = np.nan
+    dx, dy = minmax_decimate(x, y, 200)
+    assert len(dx) <= 400
+    assert np.all(np.diff(dx) >= 0)
+    assert dy.max() == 5.0
+    assert np.isclose(dy.min(), -1.0, atol=1e-3)
+
+
+def test_chart_renders_in_background_only_on_resize_or_new_data():
+    Layout.set_window_size((800, 600))
+    chart = BackgroundChart((10, 10, 50, 20), [pg.Color("red")])
+    x = np.linspace(0, 10, 10_001)
+    chart.set_series(x, [100 * np.sin(x / 10 * np.pi)])
+    chart.update()
+    assert chart.renders == 1
+    wait_for_render(chart)
+    assert chart.image.get_size() == chart.rect.size
+
+    for _ in range(10):
+        chart.update()
+    assert chart.renders == 1  # cached for the size
+
+    Layout.set_window_size((1000, 600))
+    chart.update()
+    wait_for_render(chart)
+    assert chart.renders == 2
+    assert chart.image.get_size() == (500, 120)
+
+    Layout.set_window_size((800, 600))
+    chart.update()
+    assert chart.renders == 2  # back to the cached size
+    assert chart.image.get_size() == (400, 120)
+
+    chart.set_series(x, [x])
+    chart.update()
+    wait_for_render(chart)
+    assert chart.renders == 3
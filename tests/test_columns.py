@@ -0,0 +1,51 @@
+import numpy as np
+from orhelper import FlightDataType
+
+from visualizer.columns import (
+    DISTANCE_FROM_PAD,
+    TOTAL_VELOCITY,
+    VERTICAL_VELOCITY,
+    FlightColumns,
+)
+
+
+def test_derived_columns_are_computed_and_memoized():
+    time = np.array([0.0, 1.0, 2.0, 3.0])
+    columns = FlightColumns(
+        {
+            FlightDataType.TYPE_TIME: time,
+            FlightDataType.TYPE_ALTITUDE: 10 * time,
+            FlightDataType.TYPE_POSITION_XY: np.zeros(4),
+        }
+    )
+
+    assert np.allclose(columns[VERTICAL_VELOCITY], 10)
+    assert np.allclose(columns[TOTAL_VELOCITY], 10)
+    assert columns[TOTAL_VELOCITY] is columns[TOTAL_VELOCITY]
+    assert not columns.is_available(DISTANCE_FROM_PAD)
+
+
+def test_missing_columns_are_fetched_on_demand_at_once():
+    requests = []
+
+    def fetch(data_types):
+        requests.append(list(data_types))
+        return {data_type: np.array([3.0, 0.0]) for data_type in data_types}
+
+    columns = FlightColumns({FlightDataType.TYPE_TIME: np.array([0.0, 1.0])}, fetch)
+
+    assert np.allclose(columns[DISTANCE_FROM_PAD], [np.hypot(3, 3), 0])
+    columns[DISTANCE_FROM_PAD]
+    columns[FlightDataType.TYPE_POSITION_X]
+    assert requests == [
+        [FlightDataType.TYPE_POSITION_X, FlightDataType.TYPE_POSITION_Y]
+    ]
+
+
+def test_fetched_columns_are_padded_to_time():
+    def fetch(data_types):
+        return {data_type: np.array([3.0]) for data_type in data_types}
+
+    columns = FlightColumns({FlightDataType.TYPE_TIME: np.array([0.0, 1.0])}, fetch)
+
+    np.testing.assert_array_equal(columns[DISTANCE_FROM_PAD], [np.hypot(3, 3), np.nan])
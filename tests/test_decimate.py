@@ -0,0 +1,20 @@
+import numpy as np
+
+from visualizer.decimate import adaptive_profile, douglas_peucker
+
+
+def test_adaptive_profile_keeps_ends_and_concentrates_on_curvature():
+    axial = np.linspace(0, 1, 201)
+    radius = np.sqrt(axial)  # curvature is large near the tip
+    sampled_axial, sampled_radius = adaptive_profile(axial, radius, 12)
+
+    assert len(sampled_axial) <= 12
+    assert sampled_axial[0] == 0 and sampled_axial[-1] == 1
+    assert np.allclose(sampled_radius, np.sqrt(sampled_axial))
+    assert np.sum(sampled_axial < 0.5) > np.sum(sampled_axial >= 0.5)
+
+
+def test_douglas_peucker_removes_collinear_points():
+    points = np.array([[0, 0], [1, 0.001], [2, 0], [3, 1], [4, 2]])
+    simplified = douglas_peucker(points, 0.01)
+    assert np.array_equal(simplified, np.array([[0, 0], [2, 0], [4, 2]]))
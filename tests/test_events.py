@@ -0,0 +1,46 @@
+import numpy as np
+from orhelper import FlightDataType, FlightEvent
+
+from visualizer.columns import FlightColumns
+from visualizer.events import FlightEventIndex, event_markers
+from visualizer.recording import RecordedRocket
+
+
+def test_events_map_to_nearest_samples():
+    time = np.array([0.0, 0.1, 0.2, 0.3, 1.0, 0.5])  # not sorted
+    flight_data = FlightColumns({FlightDataType.TYPE_TIME: time})
+    events = FlightEventIndex.build(
+        flight_data,
+        {
+            FlightEvent.LAUNCH: [0.0],
+            FlightEvent.BURNOUT: [0.26],
+            FlightEvent.APOGEE: [0.55],
+            FlightEvent.RECOVERY_DEVICE_DEPLOYMENT: [0.56, 0.9],
+        },
+    )
+    assert events.index_of(FlightEvent.BURNOUT) == 3
+    assert events.index_of(FlightEvent.APOGEE) == 5
+    assert events.time_of(FlightEvent.RECOVERY_DEVICE_DEPLOYMENT) == 0.56  # first one
+    assert events.index_of(FlightEvent.GROUND_HIT) is None
+    assert [event for event, _ in events.key_events()] == [
+        FlightEvent.LAUNCH,
+        FlightEvent.BURNOUT,
+        FlightEvent.APOGEE,
+        FlightEvent.RECOVERY_DEVICE_DEPLOYMENT,
+    ]
+    assert event_markers(events, 0.0, 1.0)[2] == (0.55, "Apogee")
+
+    restored = FlightEventIndex.from_dict(events.to_dict())
+    assert restored.index_of(FlightEvent.APOGEE) == 5
+    assert restored.names == events.names
+
+
+def test_recording_keeps_events(recording):
+    path, original = recording
+    # the synthetic result has no events of OpenRocket: indexed from the columns
+    assert original.events.index_of(FlightEvent.APOGEE) == 500
+    assert original.events.time_of(FlightEvent.LAUNCH) == 0.0
+
+    rocket = RecordedRocket("simple.ork", path, original.settings)
+    rocket.run_simulation()
+    assert rocket.events.to_dict() == original.events.to_dict()
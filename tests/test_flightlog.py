@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from visualizer.flightlog import FlightLog, FlightLogLoader, read_csv_columns
+
+
+def write_log(path, time: np.ndarray, altitude: np.ndarray) -> None:
+    with open(path, "w") as f:
+        f.write("Time,Pressure,Altitude\n")
+        for t, a in zip(time, altitude):
+            f.write(f"{t:.3f},1013.25,{a + 250:.3f}\n")  # 250 m above sea level
+
+
+def flight(time: np.ndarray, liftoff: float, apogee: float) -> np.ndarray:
+    return np.where(
+        time < liftoff, 0, apogee * np.sin(np.pi * np.clip(time - liftoff, 0, 10) / 10)
+    )
+
+
+@pytest.mark.filterwarnings("error")
+def test_csv_columns_are_read_in_chunks(tmp_path):
+    time = np.arange(1000) * 0.01
+    write_log(tmp_path / "log.csv", time, time)
+    with open(tmp_path / "log.csv", "a") as f:
+        f.writelines(["# comment\n"] * 64)  # a chunk of only the comment lines
+    read_time, altitude = read_csv_columns(
+        tmp_path / "log.csv", [("time",), ("altitude",)], chunk_rows=64
+    )
+    assert read_time == pytest.approx(time)
+    assert altitude == pytest.approx(time + 250)
+
+
+def test_log_is_aligned_and_compared_by_the_launch(tmp_path):
+    log_time = np.arange(-5, 15, 0.01)  # log clock starts before the launch
+    write_log(tmp_path / "log.csv", log_time, flight(log_time, 2.0, 110))
+    log = FlightLog.read_csv(tmp_path / "log.csv")
+
+    time = np.linspace(0, 10, 1001)
+    altitude = flight(time, 0.0, 100)
+    aligned = log.aligned(time, altitude)
+    assert log.aligned(time, altitude) is aligned  # cached
+    assert aligned == pytest.approx(flight(time, 0.0, 110), abs=2.0)
+
+    comparison = log.compare(time, altitude)
+    assert comparison.apogee == pytest.approx(110, abs=0.1)
+    assert comparison.apogee_delta == pytest.approx(10, abs=0.1)
+    assert comparison.apogee_time_delta == pytest.approx(0, abs=0.1)
+
+
+def test_loader_reads_in_background_and_caches(tmp_path):
+    time = np.arange(0, 12, 0.01)
+    write_log(tmp_path / "log.csv", time, flight(time, 1.0, 50))
+    loader = FlightLogLoader(tmp_path / "log.csv").start()
+    while loader.is_running:
+        pass
+    log = loader.poll()
+    assert log is not None and loader.poll() is None
+    assert FlightLogLoader(tmp_path / "log.csv").start().poll() is log
+
+
+def test_byte_order_mark_is_dropped(tmp_path):
+    with open(tmp_path / "log.csv", "w", encoding="utf-8-sig") as f:
+        f.write("Time,Altitude\n0.0,1.0\n0.1,2.0\n")
+    time, altitude = read_csv_columns(tmp_path / "log.csv", [("time",), ("altitude",)])
+    assert time == pytest.approx([0.0, 0.1])
+    assert altitude == pytest.approx([1.0, 2.0])
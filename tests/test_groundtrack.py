@@ -0,0 +1,65 @@
+import time
+
+import numpy as np
+import pygame as pg
+
+from visualizer.groundtrack import GroundTrack
+from visualizer.layout import Layout
+
+
+def make_view() -> GroundTrack:
+    Layout.set_window_size((1000, 800))
+    t = np.linspace(0, 30, 3001)
+    view = GroundTrack((50, 50, 40, 40), 3 * t, 20 * np.sin(t / 10), (45, 20))
+    rng = np.random.default_rng(0)
+    view.set_landings(rng.normal([90, 10], [40, 30], size=(50_000, 2)))
+    view.update()
+    return view
+
+
+def count_renders(view: GroundTrack) -> list:
+    rendered = []
+    render_tile = view.render_tile
+
+    def counting(*key):
+        rendered.append(key)
+        return render_tile(*key)
+
+    view.render_tile = counting
+    return rendered
+
+
+def test_pan_only_blits_cached_tiles():
+    view = make_view()
+    screen = pg.Surface((1000, 800))
+    rendered = count_renders(view)
+    view.draw(screen)
+    assert rendered  # first frame renders the visible tiles
+
+    rendered.clear()
+    view.pan(3, -2)
+    view.draw(screen)
+    view.pan(-3, 2)
+    view.draw(screen)
+    assert not rendered
+
+
+def test_many_landing_points_stay_interactive():
+    view = make_view()
+    screen = pg.Surface((1000, 800))
+    view.draw(screen)
+    start = time.perf_counter()
+    for _ in range(30):
+        view.pan(7, 5)
+        view.draw(screen)
+    assert (time.perf_counter() - start) / 30 < 0.05
+
+
+def test_zoom_keeps_point_under_mouse():
+    view = make_view()
+    pos = (view.rect.left + 20, view.rect.top + 30)
+    before = view.to_world(pos)
+    view.zoom_at(3, pos)
+    assert np.allclose(view.to_world(pos), before)
+    view.zoom_at(-5, pos)
+    assert np.allclose(view.to_world(pos), before)
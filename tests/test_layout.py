@@ -0,0 +1,17 @@
+from visualizer.layout import RenderCache
+
+
+def test_render_cache_reuses_renders_at_seen_sizes():
+    renders = []
+
+    def render(size):
+        renders.append(size)
+        return f"render at {size}"
+
+    cache = RenderCache(max_size=2)
+    for size in [(800, 450), (960, 540), (800, 450), (1280, 720), (800, 450)]:
+        assert cache.get(size, lambda: render(size)) == f"render at {size}"
+    assert renders == [(800, 450), (960, 540), (1280, 720)]
+
+    cache.get((960, 540), lambda: render((960, 540)))  # evicted as least recently used
+    assert renders[-1] == (960, 540)
@@ -0,0 +1,43 @@
+import os
+import shutil
+
+import pygame as pg
+import pytest
+
+from visualizer.library import LibraryIndex, read_ork_summary, render_thumbnail
+
+
+def test_ork_summary_is_read_without_openrocket():
+    summary = read_ork_summary("simple.ork")
+    assert summary["name"] == "A simple model rocket"
+    assert summary["length"] == pytest.approx(0.4)
+    assert summary["diameter"] == pytest.approx(0.025)
+    assert 0.02 < summary["mass"] < 0.2
+    assert summary["motor"] == "C6"
+    assert len(summary["profile"]["fins"]) == 3
+
+
+def test_index_is_updated_incrementally(tmp_path):
+    library = tmp_path / "rockets"
+    (library / "sub").mkdir(parents=True)
+    shutil.copy("simple.ork", library / "a.ork")
+    shutil.copy("simple.ork", library / "sub" / "b.ork")
+    (library / "broken.ork").write_text("not a rocket")
+    index = LibraryIndex(tmp_path / "library.sqlite")
+
+    assert index.scan([library]) == 3
+    assert [os.path.basename(entry.path) for entry in index.entries()] == [
+        "a.ork",
+        "b.ork",
+    ]  # the broken file is indexed but not listed
+    assert index.scan([library]) == 0  # nothing is modified
+
+    os.utime(library / "a.ork", ns=(0, 10**18))
+    (library / "sub" / "b.ork").unlink()
+    assert index.scan([library]) == 1
+    assert len(index.entries()) == 1
+    assert index.entries("c6") and not index.entries("no such rocket")
+
+    image = render_thumbnail(index.entries()[0], (120, 30), pg.Color("black"))
+    assert image.get_bounding_rect().height >= 28
+    index.close()
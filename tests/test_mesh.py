@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from visualizer.mesh import MeshBatch, RocketMesh, rotation_matrix
+
+
+def make_mesh() -> RocketMesh:
+    mesh = RocketMesh(segments=16)
+    mesh.add_revolution([0, 0.01, 0.0125], [-0.2, -0.15, -0.1], (255, 165, 0))
+    mesh.add_revolution(
+        [0.0125, 0.0125], [-0.1, 0.2], (255, 255, 255), cap_front=True, cap_back=True
+    )
+    for i in range(4):
+        mesh.add_fin(
+            [[0.0125, 0.12], [0.05, 0.16], [0.05, 0.19], [0.0125, 0.2]],
+            np.pi / 2 * i,
+            0.003,
+            (0, 0, 255),
+        )
+    mesh.finalize()
+    return mesh
+
+
+@pytest.mark.parametrize("angles", [(0, 0, 0), (0.3, 1.2, -0.5), (2.0, -0.7, 0.9)])
+def test_rotation_matrix_is_orthonormal(angles):
+    rotation = rotation_matrix(*angles)
+    assert np.allclose(rotation @ rotation.T, np.eye(3))
+    assert np.linalg.det(rotation) == pytest.approx(1)
+
+
+def test_normals_point_outward():
+    mesh = make_mesh()
+    body_faces = np.abs(mesh.centroids[:, 1]) < 0.09  # side faces of the body tube
+    radial = mesh.centroids[body_faces] * np.array([1, 0, 1])
+    assert np.all(np.einsum("ij,ij->i", mesh.normals[body_faces], radial) > 0)
+
+
+def test_back_faces_are_culled():
+    mesh = make_mesh()
+    mesh.project(rotation_matrix(0, 0, 0), 1000, np.array([480, 270]), 0.4)
+    assert 0 < len(mesh.polygons) < len(mesh.faces)
+    assert len(mesh.polygons) == len(mesh.polygon_colors)
+
+
+def test_batch_projects_like_each_mesh():
+    meshes = [make_mesh(), make_mesh()]
+    rotations = np.stack([rotation_matrix(0.3, 1.2, -0.5), rotation_matrix(2, -0.7, 0)])
+    scales = np.array([1000.0, 600.0])
+    offsets = np.array([[200.0, 270.0], [800.0, 300.0]])
+    lengths = np.array([0.4, 0.5])
+    batch = MeshBatch(meshes)
+    batch.project(rotations, scales, offsets, lengths)
+
+    for i, mesh in enumerate(meshes):
+        mesh.project(rotations[i], scales[i], offsets[i], lengths[i])
+        # the meshes are apart on the screen: pick the polygons of each from the batch
+        owned = [
+            j
+            for j, polygon in enumerate(batch.polygons)
+            if (np.mean(polygon, axis=0)[0] > 500) == (i == 1)
+        ]
+        assert len(owned) == len(mesh.polygons)
+        for j, polygon in zip(owned, mesh.polygons):
+            assert np.allclose(batch.polygons[j], polygon)
+        assert [batch.polygon_colors[j] for j in owned] == mesh.polygon_colors
+        assert [batch.polygon_outlines[j] for j in owned] == mesh.polygon_outlines
@@ -0,0 +1,41 @@
+import pickle
+
+import numpy as np
+from orhelper import FlightDataType
+
+from visualizer.rocket import Rocket
+
+
+def test_pickled_data_rehydrates_rocket(recording):
+    _, original = recording
+    data = pickle.loads(pickle.dumps(original.to_data()))
+
+    rocket = Rocket("simple.ork", original.settings)
+    rocket.apply_data(data)
+    assert rocket.length == original.length
+    assert np.array_equal(rocket.nose.radius, original.nose.radius)
+    fin, original_fin = rocket.bodys[0].fins[0], original.bodys[0].fins[0]
+    assert np.array_equal(fin.points, original_fin.points)
+    assert np.array_equal(fin.shape, original_fin.shape)
+    assert fin.n_fin == original_fin.n_fin
+    assert [len(mesh.face_lists) for _, mesh in rocket.meshes] == [
+        len(mesh.face_lists) for _, mesh in original.meshes
+    ]
+
+    assert rocket.max_altitude == original.max_altitude
+    altitude = rocket.flight_data[FlightDataType.TYPE_ALTITUDE]
+    time = rocket.flight_data[FlightDataType.TYPE_TIME]
+    assert np.array_equal(altitude, original.flight_data[FlightDataType.TYPE_ALTITUDE])
+    assert np.shares_memory(altitude, data.flight.columns)  # views, not copies
+    assert np.shares_memory(time, data.flight.columns)
+
+
+def test_timeseries_pickles_as_one_buffer(recording):
+    _, original = recording
+    flight = original.to_data().flight
+    buffers = []
+    pickle.dumps(flight, protocol=5, buffer_callback=buffers.append)
+    sizes = sorted(buffer.raw().nbytes for buffer in buffers)
+    # all the columns in one contiguous buffer
+    assert sizes[-1] == flight.columns.nbytes
+    assert sum(sizes[:-1]) < 1024
@@ -0,0 +1,53 @@
+import math
+
+from visualizer.optimizer import Evaluation, LaunchOptimizer, Objective
+from visualizer.settings import SimulationSettings
+
+
+def synthetic_flight(settings: SimulationSettings) -> Evaluation:
+    """Apogee rises toward the vertical rod, and the rod tilted into the wind reduces the drift"""
+    elevation = math.radians(settings.launch_rod_angle)
+    apogee = 150 * math.sin(elevation) ** 2 * (1 + 0.05 * settings.launch_rod_length)
+    apogee -= 2 * settings.wind_speed
+    distance = abs(8 * settings.wind_speed - 300 * math.cos(elevation))
+    return Evaluation(apogee, distance, 10.0)
+
+
+def test_search_hits_target_apogee_and_memoizes():
+    optimizer = LaunchOptimizer(synthetic_flight, max_workers=4)
+    objective = Objective(apogee=120, tolerance=0.2)
+    base = SimulationSettings(launch_rod_length=1.0)
+    result = optimizer.optimize(objective, base, (45, 90), (0.5, 1.5), winds=[0, 4])
+
+    assert result.satisfied
+    assert abs(result.best.apogee - 120) <= 0.2
+    assert result.settings.launch_rod_angle == result.best.angle
+    assert result.settings.wind_speed == base.wind_speed
+    assert len(result.history) > 1
+    # the best point is kept in the narrowed grid
+    assert result.history[-1].cache_hits > 0
+
+    simulations = optimizer.simulations
+    again = optimizer.optimize(objective, base, (45, 90), (0.5, 1.5), winds=[0, 4])
+    assert optimizer.simulations == simulations  # repeated query is served by the memo
+    assert again.best == result.best
+
+
+def test_landing_distance_constraint(tmp_path):
+    optimizer = LaunchOptimizer(synthetic_flight, max_workers=2)
+    objective = Objective(max_distance=5)  # maximize the apogee within 5 m
+    result = optimizer.optimize(objective, SimulationSettings(), (60, 90), winds=[2])
+
+    assert result.best.landing_distance <= 5
+    assert result.best.angle < 90  # the vertical rod is the highest, but drifts too far
+
+    ork_file = tmp_path / "rocket.ork"
+    ork_file.write_bytes(b"")
+    optimizer.save_cache(tmp_path / "memo.json", ork_file)
+    restored = LaunchOptimizer(synthetic_flight)
+    restored.load_cache(tmp_path / "memo.json", ork_file)
+    assert restored.cache == optimizer.cache
+    ork_file.write_bytes(b"modified")
+    stale = LaunchOptimizer(synthetic_flight)
+    stale.load_cache(tmp_path / "memo.json", ork_file)
+    assert stale.cache == {}
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from orhelper import FlightDataType
+
+from visualizer.playback import Timeline, attitude
+
+
+def make_flight_data(n_samples: int = 100_000) -> dict[FlightDataType, np.ndarray]:
+    time = np.linspace(0, 10, n_samples)
+    return {
+        FlightDataType.TYPE_TIME: time,
+        FlightDataType.TYPE_ALTITUDE: 100 * np.sin(np.pi * time / 10),
+        FlightDataType.TYPE_POSITION_X: 2 * time,
+        FlightDataType.TYPE_ORIENTATION_THETA: np.radians(90 - 6 * time),
+        FlightDataType.TYPE_ORIENTATION_PHI: np.zeros(n_samples),
+    }
+
+
+def test_attitude_of_vertical_and_tilted_rocket():
+    pitch, yaw = attitude(np.radians([90, 60]), np.radians([0, 0]))
+    assert pitch == pytest.approx([0, 30])
+    assert yaw == pytest.approx([0, 0])
+
+
+def test_timeline_state_matches_flight_data():
+    flight_data = make_flight_data()
+    timeline = Timeline(flight_data)
+    position, rotation, scale = timeline.state_at(5.0)
+
+    assert position == pytest.approx([10, 100], abs=1e-2)
+    assert np.allclose(rotation @ rotation.T, np.eye(3), atol=1e-3)
+    assert scale == pytest.approx(1 / 150, rel=1e-3)
+
+
+def test_timeline_seek_is_clamped_and_indexed():
+    flight_data = make_flight_data(1001)
+    timeline = Timeline(flight_data)
+    assert timeline.state_at(-1)[0] == pytest.approx([0, 0])
+    assert timeline.sample_index(5.0) == 500
+    assert timeline.sample_index(100) == 1000
+
+
+def test_rotation_stays_orthonormal_between_keyframes():
+    flight_data = make_flight_data(1001)
+    flight_data[FlightDataType.TYPE_ORIENTATION_THETA] = np.radians(
+        90 - 36 * flight_data[FlightDataType.TYPE_TIME]
+    )
+    timeline = Timeline(flight_data, interval=1.0)  # 36 degrees between keyframes
+    _, rotation, _ = timeline.state_at(2.5)
+    assert np.allclose(rotation @ rotation.T, np.eye(3))
+    assert np.linalg.det(rotation) == pytest.approx(1)
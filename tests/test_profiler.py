@@ -0,0 +1,51 @@
+from visualizer.profiler import PipelineProfiler
+
+
+class JavaObject:
+    pass
+
+
+class JavaList(JavaObject, list):
+    pass
+
+
+class Coordinate(JavaObject):
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+
+
+class TrapezoidFinSet(JavaObject):
+    def getLocations(self):
+        return JavaList([Coordinate(0.1, 0.0)])
+
+    def getFinCount(self):
+        return 3
+
+
+class BodyTube(JavaObject):
+    def getChildren(self):
+        return JavaList([TrapezoidFinSet(), TrapezoidFinSet()])
+
+    def getLength(self):
+        return 0.3
+
+
+def test_calls_are_counted_per_phase():
+    profiler = PipelineProfiler(is_java=lambda value: isinstance(value, JavaObject))
+    body = profiler.wrap(BodyTube())
+
+    fins = 0
+    with profiler.phase("extract_structure"):
+        assert body.getLength() == 0.3
+        for component in body.getChildren():
+            assert "FinSet" in type(component).__name__  # checked by the type name
+            fins += component.getFinCount()
+            assert component.getLocations()[0].x == 0.1
+    assert fins == 6
+
+    # getLength, getChildren, 2 x (next, getFinCount, getLocations, [0], x)
+    assert profiler.calls["extract_structure"] == 2 + 2 * 5
+    assert profiler.methods["getFinCount"] == 2
+    summary = profiler.summary()
+    assert summary["java_calls"] == {"extract_structure": 12}
+    assert summary["phases_s"]["extract_structure"] >= 0
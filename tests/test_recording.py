@@ -0,0 +1,22 @@
+import numpy as np
+from orhelper import FlightDataType
+
+from visualizer.recording import RecordedRocket
+
+
+def test_recorded_rocket_replays_structure_and_result(recording):
+    path, original = recording
+    rocket = RecordedRocket("simple.ork", path, original.settings)
+    rocket.run_simulation()
+
+    assert rocket.length == original.length
+    assert np.allclose(rocket.nose.radius, original.nose.radius)
+    assert np.allclose(rocket.bodys[0].fins[0].points, original.bodys[0].fins[0].points)
+    assert [len(mesh.face_lists) for _, mesh in rocket.meshes] == [
+        len(mesh.face_lists) for _, mesh in original.meshes
+    ]
+    assert rocket.max_altitude == 100.0
+    assert np.array_equal(
+        rocket.flight_data[FlightDataType.TYPE_ALTITUDE],
+        original.flight_data[FlightDataType.TYPE_ALTITUDE],
+    )
@@ -0,0 +1,49 @@
+import pygame as pg
+
+from visualizer.layout import Layout
+from visualizer.resolution import RenderScaler
+from visualizer.settings import RenderSettings
+
+
+def test_render_size_follows_scale():
+    Layout.set_window_size((640, 480))
+    scaler = RenderScaler(RenderSettings(scale=0.5))
+    assert Layout.get_render_size() == (320, 240)
+    scaler.apply_settings(RenderSettings(scale=2.0))
+    assert Layout.get_render_size() == (640, 480)  # never above the native resolution
+    scaler.apply_settings(RenderSettings(scale=0.1, min_scale=0.5))
+    assert Layout.get_render_size() == (320, 240)
+    Layout.set_render_scale(1.0)
+
+
+def test_dynamic_scale_within_budget():
+    settings = RenderSettings(dynamic=True, min_scale=0.5, frame_budget=10.0)
+    scaler = RenderScaler(settings)
+    for _ in range(RenderScaler.COOLDOWN_FRAMES * 20):
+        scaler.record(30.0)
+    assert scaler.scale == 0.5  # lowered down to the minimum scale
+    assert Layout.get_render_scale() == 0.5
+
+    scaler.record(1.0)
+    assert scaler.scale == 0.5  # not raised before the average frame time settles
+    for _ in range(RenderScaler.COOLDOWN_FRAMES * 20):
+        scaler.record(1.0)
+    assert scaler.scale == 1.0
+    Layout.set_render_scale(1.0)
+
+
+def test_world_is_upscaled_to_screen():
+    Layout.set_window_size((200, 100))
+    scaler = RenderScaler(RenderSettings(scale=0.5))
+    screen = pg.Surface((200, 100))
+
+    surface = scaler.begin(screen)
+    assert surface.get_size() == (100, 50)
+    surface.fill((0, 0, 255))
+    pg.draw.rect(surface, (255, 0, 0), (0, 0, 50, 50))  # left half of the world
+    scaler.end(screen, surface)
+    assert screen.get_at((10, 50))[:3] == (255, 0, 0)
+    assert screen.get_at((190, 50))[:3] == (0, 0, 255)
+
+    scaler.apply_settings(RenderSettings(scale=1.0))
+    assert scaler.begin(screen) is screen
@@ -0,0 +1,104 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import dataclasses
+import shutil
+from pathlib import Path
+
+import pytest
+
+import visualizer.scene as scene
+from visualizer.columns import TOTAL_VELOCITY, FlightColumns
+from visualizer.recording import RecordedRocket
+from visualizer.settings import LibrarySettings
+from visualizer.simulation import SimulationResult
+
+SCENE_STATE = scene.SCENE_STATE
+
+
+def make_app(recording_path: Path, tmp_path: Path, monkeypatch) -> scene.AppMain:
+    monkeypatch.setattr(
+        scene,
+        "Rocket",
+        lambda file_path, settings=None: RecordedRocket(
+            file_path, recording_path, settings
+        ),
+    )
+    app = scene.AppMain()
+    app.adjust_window_size(960, 540)  # the dummy display keeps the last size
+    library = LibrarySettings((str(tmp_path),), str(tmp_path / "library.sqlite"))
+    app.settings = dataclasses.replace(app.settings, library=library)
+    app.scene.apply_settings(app.settings)
+    return app
+
+
+def open_briefing(app: scene.AppMain, ork_file: Path) -> scene.BriefingScene:
+    app.switch_scene(SCENE_STATE.TOP)
+    app.switch_scene(SCENE_STATE.LIBRARY)
+    app.scene.ork_file = ork_file  # picked in the library
+    app.switch_scene(SCENE_STATE.BRIEFING)
+    return app.scene
+
+
+def test_briefing_and_game_are_resumed(recording, tmp_path, monkeypatch):
+    path, _ = recording
+    app = make_app(path, tmp_path, monkeypatch)
+    briefing = open_briefing(app, Path("simple.ork"))
+    assert briefing.rocket is not None
+    app.run_frame()  # the recorded result is final: the game scene is pre-warmed
+    game = app.scenes[SCENE_STATE.GAME]
+    assert isinstance(game, scene.GameScene) and game.is_for(briefing.rocket)
+
+    app.switch_scene(SCENE_STATE.GAME)
+    assert app.scene is game
+
+    game_settings = dataclasses.replace(app.settings.game, max_altitude=500.0)
+    app.settings = dataclasses.replace(app.settings, game=game_settings)
+    app.switch_scene(SCENE_STATE.BRIEFING)
+    assert app.scene is briefing
+    assert briefing.settings is app.settings  # applied on resume
+    assert briefing.state == SCENE_STATE.BRIEFING
+
+    app.switch_scene(SCENE_STATE.GAME)
+    assert app.scene is game
+    assert game.settings is app.settings
+
+
+def test_different_file_replaces_pooled_scenes(recording, tmp_path, monkeypatch):
+    path, _ = recording
+    app = make_app(path, tmp_path, monkeypatch)
+    briefing = open_briefing(app, Path("simple.ork"))
+    app.run_frame()
+    game = app.scenes[SCENE_STATE.GAME]
+
+    other = tmp_path / "other.ork"
+    shutil.copy("simple.ork", other)
+    other_briefing = open_briefing(app, other)
+    assert other_briefing is not briefing
+    assert Path(other_briefing.rocket.file_path) == other
+
+    app.switch_scene(SCENE_STATE.GAME)
+    assert app.scene is not game  # the pooled game plays back the previous rocket
+    assert app.scene.rocket is other_briefing.rocket
+
+
+def test_game_plays_back_its_own_result(recording, tmp_path, monkeypatch):
+    path, original = recording
+    app = make_app(path, tmp_path, monkeypatch)
+    briefing = open_briefing(app, Path("simple.ork"))
+    app.run_frame()
+    game = app.scenes[SCENE_STATE.GAME]
+    flight_data = game.flight_data
+
+    # the result of the briefing is replaced after the game scene is pre-warmed
+    columns = {key: value[:10] for key, value in original.flight_data.items()}
+    briefing.rocket.apply_result(
+        SimulationResult(FlightColumns(columns), 1.0, 1.0, 0.09, 1.0, 0.01, 0.1)
+    )
+    game.seek(5.0)
+    game.update()
+    assert game.flight_data is flight_data
+    assert game.velocity == pytest.approx(
+        flight_data[TOTAL_VELOCITY][game.timeline.sample_index(game.time)]
+    )
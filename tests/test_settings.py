@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import pytest
+
+from visualizer.settings import Settings, SettingsWatcher
+
+SETTINGS_TEXT = """
+[game]
+maxAltitude=100
+
+[simulation]
+launchRod.angle=80
+launchRod.length=0.50
+wind.speed={wind_speed}
+"""
+
+
+def write_settings(path: Path, wind_speed: float = 0) -> None:
+    path.write_text(SETTINGS_TEXT.format(wind_speed=wind_speed))
+
+
+def test_load_settings():
+    settings = Settings.load("settings.toml")
+    assert settings.game.max_altitude == 100
+    assert settings.simulation.launch_rod_angle == 80
+    assert settings.openrocket.url.endswith(".jar")
+    assert settings.library.directories == (".",)
+
+
+def test_watcher_detects_simulation_change(tmp_path: Path):
+    path = tmp_path / "settings.toml"
+    write_settings(path)
+    watcher = SettingsWatcher(path, interval=0)
+    assert watcher.poll() is None
+
+    write_settings(path, wind_speed=12.5)
+    settings = watcher.poll()
+    assert settings is not None
+    assert settings.simulation.wind_speed == pytest.approx(12.5)
+    assert settings.game == watcher.settings.game
+
+
+def test_watcher_keeps_settings_on_broken_file(tmp_path: Path):
+    path = tmp_path / "settings.toml"
+    write_settings(path)
+    watcher = SettingsWatcher(path, interval=0)
+
+    path.write_text("[simulation\nbroken")
+    assert watcher.poll() is None
+    assert watcher.settings.simulation.launch_rod_angle == 80
@@ -0,0 +1,199 @@
+import threading
+import time
+from array import array
+
+import numpy as np
+from orhelper import FlightDataType
+
+from visualizer import simulation
+from visualizer.profiler import PipelineProfiler
+
+
+class DoubleList(list):
+    """java.util.List<Double> converted to double[] in Java"""
+
+    def stream(self):
+        return self
+
+    def mapToDouble(self, function):
+        return self
+
+    def toArray(self):
+        return array("d", self)  # buffer like a Java primitive array
+
+
+class Branch:
+    def __init__(self, columns):
+        self.columns = columns
+
+    def get(self, data_type):
+        return self.columns.get(data_type)
+
+
+class Simulation:
+    def __init__(self, columns):
+        self.branch = Branch(columns)
+
+    def getSimulatedData(self):
+        return self
+
+    def getBranch(self, number):
+        return self.branch
+
+
+class Helper:
+    def translate_flight_data_type(self, data_type):
+        return data_type
+
+
+def test_timeseries_is_one_array(monkeypatch):
+    monkeypatch.setattr(simulation, "java_unboxing", lambda: None)
+    sim = Simulation(
+        {
+            FlightDataType.TYPE_TIME: DoubleList([0.0, 0.1, 0.2]),
+            FlightDataType.TYPE_ALTITUDE: [0.0, 1.0, None],  # converted one by one
+        }
+    )
+    types = [
+        FlightDataType.TYPE_TIME,
+        FlightDataType.TYPE_ALTITUDE,
+        FlightDataType.TYPE_MACH_NUMBER,  # not recorded
+    ]
+    profiler = PipelineProfiler()
+    data, columns = simulation.get_timeseries(Helper(), sim, types, profiler=profiler)
+
+    assert data.shape == (3, 3) and data.dtype == np.float64
+    np.testing.assert_array_equal(columns[FlightDataType.TYPE_TIME], [0.0, 0.1, 0.2])
+    np.testing.assert_array_equal(columns[FlightDataType.TYPE_ALTITUDE], [0, 1, np.nan])
+    assert np.isnan(columns[FlightDataType.TYPE_MACH_NUMBER]).all()
+    assert np.shares_memory(columns[FlightDataType.TYPE_TIME], data)
+    assert profiler.counts == {"bulk_columns": 1, "elementwise_columns": 1}
+    assert "transfer.TYPE_TIME" in profiler.times
+
+
+class Options:
+    def __init__(self, time_step):
+        self.time_step = time_step
+
+    def getTimeStep(self):
+        return self.time_step
+
+    def setTimeStep(self, time_step):
+        self.time_step = time_step
+
+
+class SimulatedData(Branch):
+    def __init__(self, columns, max_altitude):
+        super().__init__(columns)
+        self.max_altitude = max_altitude
+
+    def getBranch(self, number):
+        return self
+
+    def getMaxAltitude(self):
+        return self.max_altitude
+
+    def getMaxVelocity(self):
+        return 50.0
+
+    def getFlightTime(self):
+        return 20.0
+
+    def getLaunchRodVelocity(self):
+        return 15.0
+
+
+class ProgressiveSimulationStub:
+    """Simulation whose apogee depends on the time step"""
+
+    def __init__(self, time_step=0.01):
+        self.options = Options(time_step)
+        self.data = None
+
+    def copy(self):
+        return ProgressiveSimulationStub(self.options.getTimeStep())
+
+    def getOptions(self):
+        return self.options
+
+    def getSimulatedData(self):
+        return self.data
+
+
+class ProgressiveHelper(Helper):
+    """Helper that holds the full-fidelity run until released, and fails it if asked"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.release = threading.Event()
+        self.time_steps = []
+
+    def run_simulation(self, sim):
+        time_step = sim.getOptions().getTimeStep()
+        self.time_steps.append(time_step)
+        if time_step < 0.05:  # full fidelity
+            self.release.wait(5)
+            if self.fail:
+                raise RuntimeError("simulation failed")
+        columns = {
+            FlightDataType.TYPE_TIME: [0.0, 1.0, 2.0],
+            FlightDataType.TYPE_ALTITUDE: [0.0, 100.0, 50.0],
+        }
+        sim.data = SimulatedData(columns, 100.0 - 100 * time_step)
+
+    def get_events(self, sim):
+        return {}
+
+
+class SettingsStub:
+    def apply(self, opts):
+        pass
+
+
+def start_progressive(monkeypatch, helper):
+    monkeypatch.setattr(simulation, "java_unboxing", lambda: None)
+    monkeypatch.setattr(simulation.OpenRocket, "attach_thread", lambda: None)
+    progressive = simulation.ProgressiveSimulation(
+        helper,
+        ProgressiveSimulationStub(),
+        SettingsStub(),
+        [FlightDataType.TYPE_TIME, FlightDataType.TYPE_ALTITUDE],
+        coarse_factor=10,
+    )
+    return progressive, progressive.start()
+
+
+def wait_for(condition):
+    deadline = time.perf_counter() + 5
+    while not condition() and time.perf_counter() < deadline:
+        time.sleep(0.001)
+    assert condition()
+
+
+def test_progressive_refines_in_background(monkeypatch):
+    helper = ProgressiveHelper()
+    progressive, preview = start_progressive(monkeypatch, helper)
+    assert preview.time_step == helper.time_steps[0] == 0.1  # coarse
+    assert preview.max_altitude == 90.0
+    assert progressive.is_running
+    assert progressive.poll() is None
+    assert progressive.apogee_difference is None
+
+    helper.release.set()
+    wait_for(lambda: progressive.refined is not None)
+    assert not progressive.is_running  # even if the thread is still alive
+    refined = progressive.poll()
+    assert refined.time_step == 0.01
+    assert progressive.poll() is None  # delivered once
+    assert progressive.apogee_difference == refined.max_altitude - 90.0
+
+
+def test_progressive_error_keeps_preview(monkeypatch):
+    helper = ProgressiveHelper(fail=True)
+    progressive, preview = start_progressive(monkeypatch, helper)
+    helper.release.set()
+    wait_for(lambda: progressive.error is not None)
+    assert not progressive.is_running
+    assert progressive.poll() is None
+    assert progressive.preview is preview
+    assert progressive.apogee_difference is None
@@ -0,0 +1,93 @@
+import numpy as np
+
+from visualizer.sweep import (
+    DesignSweep,
+    DesignVariable,
+    VariantResult,
+    make_variants,
+    stability_summary,
+)
+
+
+class Component:
+    """Component of the object model of OpenRocket (class name as the Java type)"""
+
+    def __init__(self, name: str, children: list | None = None) -> None:
+        self.name = name
+        self.children = children or []
+        self.values = {}
+
+    def getName(self):
+        return self.name
+
+    def getChildren(self):
+        return self.children
+
+    def getChild(self, index: int):
+        return self.children[index]
+
+    def __getattr__(self, name: str):
+        if not name.startswith("set"):
+            raise AttributeError(name)
+        return lambda value: self.values.__setitem__(name, value)
+
+
+NoseCone = type("NoseCone", (Component,), {})
+BodyTube = type("BodyTube", (Component,), {})
+TrapezoidFinSet = type("TrapezoidFinSet", (Component,), {})
+MassComponent = type("MassComponent", (Component,), {})
+
+
+def make_rocket():
+    fins = TrapezoidFinSet("Fins")
+    ballast = MassComponent("Ballast")
+    sustainer = Component(
+        "Sustainer",
+        [
+            NoseCone("Nose"),
+            BodyTube("Upper", [ballast]),
+            BodyTube("Lower", [fins]),
+        ],
+    )
+    return Component("Rocket", [sustainer]), sustainer
+
+
+def test_variants_set_components():
+    variables = [
+        DesignVariable("fin_span", (0.03, 0.05)),
+        DesignVariable("body_length", (0.3,), "Lower"),
+        DesignVariable("ballast_mass", (0.0, 0.01, 0.02)),
+    ]
+    variants = make_variants(variables)
+    assert len(variants) == 6
+    assert variants[1].label == "fin_span=0.03 body_length:Lower=0.3 ballast_mass=0.01"
+
+    rocket, sustainer = make_rocket()
+    variants[-1].apply(rocket)
+    nose, upper, lower = sustainer.children
+    assert lower.children[0].values == {"setHeight": 0.05}
+    assert lower.values == {"setLength": 0.3}
+    assert upper.values == {}  # only the named body tube
+    assert upper.children[0].values == {"setComponentMass": 0.02}
+
+
+def test_failed_variant_does_not_stop_sweep():
+    variants = make_variants([DesignVariable("nose_length", (0.1, -1.0, 0.2))])
+
+    def evaluate(variant):
+        length = variant.values[0][2]
+        if length < 0:
+            raise ValueError("negative length")
+        return VariantResult(variant, apogee=1000 * length)
+
+    results = DesignSweep(evaluate, max_workers=3).run(variants)
+    assert [r.variant for r in results] == variants
+    assert [r.apogee for r in results[::2]] == [100, 200]
+    assert results[1].error == "negative length"
+
+
+def test_stability_until_apogee():
+    altitude = np.array([0, 10, 30, 40, 30, 0])
+    stability = np.array([np.nan, 2.5, 1.8, 2.0, -3.0, np.nan])
+    assert stability_summary(altitude, stability) == (2.5, 1.8)
+    assert np.isnan(stability_summary(altitude, np.full(6, np.nan))).all()
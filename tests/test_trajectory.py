@@ -0,0 +1,67 @@
+import numpy as np
+
+from visualizer.trajectory import Trajectory
+
+
+def make_trajectory(n_samples: int = 10_000) -> Trajectory:
+    time = np.linspace(0, 10, n_samples)
+    return Trajectory(time, 2 * time, 100 * np.sin(np.pi * time / 10))
+
+
+def distance_to_path(points: np.ndarray, path: np.ndarray) -> np.ndarray:
+    start, segment = path[:-1], np.diff(path, axis=0)
+    offset = points[:, None, :] - start[None, :, :]
+    squared_length = np.maximum(np.sum(segment**2, axis=1), 1e-12)
+    ratio = np.clip(np.sum(offset * segment, axis=2) / squared_length, 0, 1)
+    distance = np.linalg.norm(offset - ratio[:, :, None] * segment, axis=2)
+    return distance.min(axis=1)
+
+
+def test_levels_are_nested_and_within_tolerance():
+    trajectory = make_trajectory(2_000)
+    full = trajectory.points[0]
+    for level in range(1, len(trajectory.points)):
+        points = trajectory.points[level]
+        assert len(points) <= len(trajectory.points[level - 1])
+        assert np.array_equal(points[[0, -1]], full[[0, -1]])
+        # each dropped sample is within the error bound of the decimated path
+        assert np.all(distance_to_path(full, points) <= trajectory.errors[level] + 1e-9)
+    assert len(trajectory.points[-1]) < 10
+
+
+def test_zooming_out_selects_coarser_level():
+    trajectory = make_trajectory()
+    assert trajectory.select_level(1000) < trajectory.select_level(1)
+    assert trajectory.select_level(1e9) == 0
+
+
+def test_drawn_path_ends_at_current_time():
+    trajectory = make_trajectory()
+    position = np.array([10.0, 100.0])
+    trajectory.update(5.0, position, 2.0, (400, 500))
+    first = len(trajectory.screen_points)
+    assert first >= 2
+    assert trajectory.tip == (400, 300)
+
+    trajectory.update(7.5, position, 2.0, (400, 500))
+    assert len(trajectory.screen_points) > first
+    time = trajectory.time[trajectory.level]
+    assert time[len(trajectory.screen_points) - 1] <= 7.5
+
+    trajectory.update(2.5, position, 2.0, (400, 500))  # seek backwards
+    assert time[len(trajectory.screen_points) - 1] <= 2.5
+
+
+def test_moving_view_appends_passed_vertices():
+    trajectory = make_trajectory()
+    trajectory.update(5.0, np.array([10.0, 100.0]), 2.0, (400, 500))
+    first = trajectory.end
+    restarts = trajectory.restarts
+
+    # the camera follows the rocket and the scale changes with the altitude
+    trajectory.update(5.5, np.array([11.0, 98.0]), 2.01, (400, 500))
+    assert trajectory.restarts == restarts
+    assert trajectory.appended == trajectory.end - first > 0
+    east, altitude = trajectory.points[trajectory.level][trajectory.end - 1]
+    expected = (400 + (east - 11.0) * 2.01, 500 - altitude * 2.01)
+    assert np.allclose(trajectory.screen_points[-1], expected)
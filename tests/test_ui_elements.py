@@ -0,0 +1,29 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame as pg
+
+import visualizer.config as cfg
+from visualizer.layout import Layout
+from visualizer.ui_elements import GlyphAtlas, TelemetryText
+
+
+def test_telemetry_text_has_stable_layout():
+    pg.display.init()
+    pg.display.set_mode((800, 600))
+    Layout.set_window_size((800, 600))
+    text = TelemetryText("{:6.1f} m", "oswald", 2, cfg.COLOR_BLACK, (10, 10))
+    text.set_values(1.0)
+    text.update()
+    rect = text.rect.copy()
+    positions = [dest for _, dest, _ in text.blit_sequence]
+
+    text.set_values(987.6)
+    assert text.rect == rect
+    assert [dest for _, dest, _ in text.blit_sequence][-2:] == positions[-2:]
+    assert len(text.blit_sequence) == len("987.6 m") - 1  # spaces are not drawn
+
+    atlas = GlyphAtlas.get_atlas("oswald", int(800 * 0.02), cfg.COLOR_BLACK)
+    assert text.atlas is atlas
+    pg.display.quit()
@@ -0,0 +1,190 @@
+"""
+allocations.py
+
+Notes:
+    - Instrumentation mode to find the allocations in the per-frame path. Tracing slows the application down,
+      so that the tracker is not used in the normal run.
+    - `peak` of a phase is the largest memory allocated on top of the memory at the start of the phase,
+      including the temporary objects freed in the phase. `retained` is the memory still allocated at the end.
+    - The allocations are attributed to the source lines whose live memory grew in each phase.
+      Objects replacing the ones of the previous frame net out there, and show up only in the peak.
+"""
+
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+
+
+@dataclass
+class PhaseAllocations:
+    """
+    Allocations of a frame phase accumulated over the frames.
+
+    Attributes:
+        frames (int): number of the tracked frames.
+        peaks (list[int]): peak allocation of each frame (unit: byte).
+        retained (list[int]): retained allocation of each frame (unit: byte).
+        lines (dict[str, int]): total retained allocation of each source line (unit: byte).
+        counts (dict[str, int]): total number of the retained blocks of each source line.
+    """
+
+    frames: int = 0
+    peaks: list[int] = field(default_factory=list)
+    retained: list[int] = field(default_factory=list)
+    lines: dict[str, int] = field(default_factory=dict)
+    counts: dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self, top: int = 10) -> dict:
+        """
+        Convert to the machine-readable summary.
+
+        Args:
+            top (int): number of the source lines to report.
+
+        Returns:
+            dict: summary of the phase.
+        """
+        lines = sorted(self.lines.items(), key=lambda item: -item[1])[:top]
+        frames = max(self.frames, 1)
+        return {
+            "frames": self.frames,
+            "peak_bytes_mean": sum(self.peaks) / frames,
+            "peak_bytes_max": max(self.peaks, default=0),
+            "retained_bytes_mean": sum(self.retained) / frames,
+            "top_lines": [
+                {
+                    "line": line,
+                    "bytes_per_frame": size / frames,
+                    "blocks_per_frame": self.counts[line] / frames,
+                }
+                for line, size in lines
+            ],
+        }
+
+
+class AllocationTracker:
+    """
+    Per-frame allocation tracker with tracemalloc.
+    Wrap each phase of a frame with `phase`, e.g. `with tracker.phase("update"): scene.update()`.
+    """
+
+    def __init__(self, attribute: bool = True) -> None:
+        """
+        Initialize the tracker.
+
+        Args:
+            attribute (bool): whether to attribute the allocations to the source lines with snapshots (slow).
+        """
+        self.attribute = attribute
+        self.phases: dict[str, PhaseAllocations] = {}
+        self.__started = False
+        self.__filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+
+    def start(self) -> None:
+        """Start tracing the allocations (if not started yet)"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.__started = True
+
+    def stop(self) -> None:
+        """Stop tracing the allocations if started by this tracker"""
+        if self.__started:
+            tracemalloc.stop()
+            self.__started = False
+
+    def reset(self) -> None:
+        """Clear the tracked allocations (e.g. to skip the warm-up frames)"""
+        self.phases = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Track the allocations in the phase of a frame.
+
+        Args:
+            name (str): name of the phase.
+        """
+        if not tracemalloc.is_tracing():
+            yield
+            return
+        before = tracemalloc.take_snapshot() if self.attribute else None
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            stats = self.phases.setdefault(name, PhaseAllocations())
+            stats.frames += 1
+            stats.peaks.append(peak - start)
+            stats.retained.append(current - start)
+            if before is not None:
+                after = tracemalloc.take_snapshot().filter_traces(self.__filters)
+                for diff in after.compare_to(
+                    before.filter_traces(self.__filters), "lineno"
+                ):
+                    if diff.size_diff <= 0:
+                        continue
+                    line = str(diff.traceback[0])
+                    stats.lines[line] = stats.lines.get(line, 0) + diff.size_diff
+                    stats.counts[line] = stats.counts.get(line, 0) + max(
+                        diff.count_diff, 0
+                    )
+
+    def frame_peak(self) -> list[int]:
+        """
+        Peak allocation of each frame over all phases (the phases of a frame are summed).
+
+        Returns:
+            list[int]: peak allocation of each frame (unit: byte).
+        """
+        peaks = [stats.peaks for stats in self.phases.values()]
+        return [sum(frame) for frame in zip(*peaks)]
+
+    def summary(self, top: int = 10) -> dict:
+        """
+        Make the machine-readable summary of all phases.
+
+        Args:
+            top (int): number of the source lines to report for each phase.
+
+        Returns:
+            dict: summary of each phase.
+        """
+        return {name: stats.to_dict(top) for name, stats in self.phases.items()}
+
+    def print_report(self, top: int = 10) -> None:
+        """
+        Print the allocations of each phase and the top source lines.
+
+        Args:
+            top (int): number of the source lines to print for each phase.
+        """
+        for name, summary in self.summary(top).items():
+            print(
+                f"[{name}] peak {summary['peak_bytes_mean'] / 1024:.1f} KiB/frame "
+                f"(max {summary['peak_bytes_max'] / 1024:.1f} KiB), "
+                f"retained {summary['retained_bytes_mean'] / 1024:.1f} KiB/frame"
+            )
+            for line in summary["top_lines"]:
+                print(
+                    f"    {line['bytes_per_frame'] / 1024:8.1f} KiB "
+                    f"{line['blocks_per_frame']:6.1f} blocks  {line['line']}"
+                )
+
+
+def allocation_phase(tracker: AllocationTracker | None, name: str):
+    """
+    Track the phase with the tracker, or do nothing if the tracker is None.
+
+    Args:
+        tracker (AllocationTracker | None): the tracker.
+        name (str): name of the phase.
+
+    Returns:
+        context manager of the phase.
+    """
+    return nullcontext() if tracker is None else tracker.phase(name)
@@ -0,0 +1,199 @@
+"""
+background.py
+
+Notes:
+    - The sky is a parallax background of the flight playback. The altitude is mapped to the layers by
+      `[game] maxAltitude`: the ground and the hills at 0 m, the clouds in the middle and the dark
+      atmosphere at maxAltitude and above.
+    - The layers are rendered into tiles once for each window size, and only blitted while playing back,
+      so that the cost of a frame does not depend on the altitude.
+"""
+
+import random
+
+import numpy as np
+import pygame as pg
+
+import visualizer.config as cfg
+from visualizer.layout import Layout, RenderCache
+
+
+class SkyBackground:
+    """
+    Altitude-aware parallax background of the flight playback.
+    """
+
+    SKY_SCREENS = 3  # height of the sky layer vs. window height
+    CLOUD_SCREENS = 5  # height of the cloud layer vs. window height (scrolls faster)
+    CLOUD_ALTITUDE = 0.5  # altitude of the clouds vs. maxAltitude
+    CLOUD_COUNT = 6  # number of the clouds in a tile
+    HILL_HEIGHT = 0.3  # height of the hills vs. window height
+    CLOUD_PARALLAX = 0.3  # horizontal scroll of the clouds vs. the vertical one
+    HILL_PARALLAX = 0.2  # horizontal scroll of the hills vs. the vertical one
+    SKY_COLORS = (  # gradient from the ground to maxAltitude
+        cfg.COLOR_PALE_WHITE1,
+        pg.Color(0xD8, 0xE6, 0xF4),
+        pg.Color(0x30, 0x38, 0x58),
+    )
+    CLOUD_COLOR = pg.Color(0xFF, 0xFF, 0xFF, 0xC0)
+    HILL_COLOR = pg.Color(0xE0, 0xE4, 0xE0)
+
+    def __init__(self, max_altitude: float, seed: int = 0) -> None:
+        """
+        Initialize the background.
+
+        Args:
+            max_altitude (float): altitude at the top of the sky layer (unit: m).
+            seed (int): seed of the cloud shapes.
+        """
+        self.max_altitude = max(max_altitude, 1e-3)
+        self.seed = seed
+        self.window_size: tuple[int, int] = None
+        self.tiles: dict[str, list[pg.Surface]] = None
+        self.cache = RenderCache()  # tiles at the previously seen sizes
+        self.altitude = 0.0
+        self.east = 0.0
+        self.__blits: list[tuple[pg.Surface, tuple[float, float]]] = []
+
+    def set_max_altitude(self, max_altitude: float) -> None:
+        """
+        Change the altitude at the top of the sky layer (e.g. when the settings are reloaded).
+
+        Args:
+            max_altitude (float): altitude at the top of the sky layer (unit: m).
+        """
+        self.max_altitude = max(max_altitude, 1e-3)
+
+    def set_view(self, altitude: float, east: float) -> None:
+        """
+        Set the position of the camera.
+
+        Args:
+            altitude (float): altitude of the camera (unit: m).
+            east (float): east position of the camera (unit: m).
+        """
+        self.altitude = altitude
+        self.east = east
+
+    def update(self) -> None:
+        """
+        Render the tiles when the window size is changed, and scroll the layers to the camera.
+        """
+        if self.window_size != Layout.get_render_size():
+            self.window_size = Layout.get_render_size()
+            self.tiles = self.cache.get(self.window_size, self.render)
+
+        width, height = self.window_size
+        ratio = min(max(self.altitude / self.max_altitude, 0.0), 1.0)
+        drift = self.east / self.max_altitude * width  # window widths per maxAltitude
+        blits = []
+
+        # sky: the view moves from the bottom to the top of the layer up to maxAltitude
+        sky_height = height * self.SKY_SCREENS
+        view_top = (sky_height - height) * (1 - ratio)
+        first = int(view_top // height)
+        for index in range(first, min(first + 2, self.SKY_SCREENS)):
+            blits.append((self.tiles["sky"][index], (0, index * height - view_top)))
+
+        # hills at the bottom of the sky layer
+        hill = self.tiles["hill"][0]
+        hill_y = sky_height - hill.get_height() - view_top
+        if hill_y < height:
+            blits.extend(self.wrap(hill, drift * self.HILL_PARALLAX, hill_y))
+
+        # clouds scroll faster than the sky, as they are nearer
+        cloud = self.tiles["cloud"][0]
+        cloud_height = height * self.CLOUD_SCREENS
+        cloud_top = (cloud_height - height) * (1 - ratio)
+        cloud_y = (
+            (cloud_height - height) * (1 - self.CLOUD_ALTITUDE)
+            + (height - cloud.get_height()) / 2
+            - cloud_top
+        )
+        if -cloud.get_height() < cloud_y < height:
+            blits.extend(self.wrap(cloud, drift * self.CLOUD_PARALLAX, cloud_y))
+
+        self.__blits = blits
+
+    def wrap(
+        self, tile: pg.Surface, drift: float, y: float
+    ) -> list[tuple[pg.Surface, tuple[float, float]]]:
+        """
+        Make the blits of the horizontally repeated tile.
+
+        Args:
+            tile (pg.Surface): tile of the window width.
+            drift (float): horizontal scroll of the layer (unit: px).
+            y (float): vertical position of the tile on the screen (unit: px).
+
+        Returns:
+            list[tuple[pg.Surface, tuple[float, float]]]: two blits covering the window width.
+        """
+        x = -(drift % tile.get_width())
+        return [(tile, (x, y)), (tile, (x + tile.get_width(), y))]
+
+    def render(self) -> dict[str, list[pg.Surface]]:
+        """
+        Render the tiles of the layers at the current window size.
+
+        Returns:
+            dict[str, list[pg.Surface]]: tiles of the sky (from the top), the hills and the clouds.
+        """
+        width, height = self.window_size
+        width, height = max(width, 1), max(height, 1)
+
+        # vertical gradient of the whole sky layer, scaled to the window width for each tile
+        sky_height = height * self.SKY_SCREENS
+        position = np.linspace(1, 0, sky_height)  # 1 at the top
+        stops = np.linspace(0, 1, len(self.SKY_COLORS))
+        colors = np.array([tuple(color)[:3] for color in self.SKY_COLORS], dtype=float)
+        column = np.stack(
+            [np.interp(position, stops, colors[:, channel]) for channel in range(3)],
+            axis=1,
+        ).astype(np.uint8)
+        gradient = pg.surfarray.make_surface(column[np.newaxis, :, :])
+        sky = [
+            pg.transform.scale(
+                gradient.subsurface((0, index * height, 1, height)), (width, height)
+            )
+            for index in range(self.SKY_SCREENS)
+        ]
+
+        # hills repeated horizontally (whole periods in the tile width)
+        hill_height = max(int(height * self.HILL_HEIGHT), 1)
+        hill = pg.Surface((width, hill_height), pg.SRCALPHA)
+        x = np.arange(width + 1)
+        phase = 2 * np.pi * x / width
+        ridge = hill_height * (
+            0.55 + 0.2 * np.sin(2 * phase) + 0.15 * np.sin(5 * phase + 1.0)
+        )
+        points = [(0, hill_height), *zip(x, hill_height - ridge), (width, hill_height)]
+        pg.draw.polygon(hill, self.HILL_COLOR, points)
+
+        # clouds repeated horizontally (drawn also across the edges)
+        cloud_height = max(height // 3, 1)
+        cloud = pg.Surface((width, cloud_height), pg.SRCALPHA)
+        rng = random.Random(self.seed)
+        for _ in range(self.CLOUD_COUNT):
+            center_x = rng.uniform(0, width)
+            center_y = rng.uniform(0.3, 0.7) * cloud_height
+            size = rng.uniform(0.05, 0.1) * width
+            for _ in range(4):  # a cloud is a cluster of the ellipses
+                rect = pg.Rect(0, 0, size * rng.uniform(1.0, 1.8), size * 0.6)
+                rect.center = (
+                    center_x + rng.uniform(-0.6, 0.6) * size,
+                    center_y + rng.uniform(-0.2, 0.2) * size,
+                )
+                for offset in (-width, 0, width):
+                    pg.draw.ellipse(cloud, self.CLOUD_COLOR, rect.move(offset, 0))
+
+        return {"sky": sky, "hill": [hill], "cloud": [cloud]}
+
+    def draw(self, screen: pg.Surface) -> None:
+        """
+        Draw the background on the screen.
+
+        Args:
+            screen (pg.Surface): screen to draw the background.
+        """
+        screen.blits(self.__blits, doreturn=False)
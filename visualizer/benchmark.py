@@ -0,0 +1,600 @@
+"""
+benchmark.py
+
+Headless end-to-end benchmark of the application with a scripted input.
+
+Usage:
+    # record the structure and the simulation result once (requires Java)
+    python -m visualizer.benchmark record simple.ork simple.npz
+    # run the scripted scenario (without Java if the recording is given)
+    python -m visualizer.benchmark run simple.ork --recording simple.npz --output result.json
+    # time the phases of the simulation pipeline over the ork files (requires Java)
+    python -m visualizer.benchmark pipeline ork_dir simple.ork --repeats 3 --processes 3 --output pipeline.json
+
+Notes:
+    - The application runs under the SDL dummy video driver, and the file dialog is replaced by the given file.
+    - Frame times are the work of each frame without waiting for the frame rate.
+    - With --allocations, the allocations of each frame phase are tracked with tracemalloc (slower frames).
+    - The pipeline benchmark runs each ork file `repeats` times in each of `processes` fresh processes.
+      The first run of a process starts the JVM ("cold"), and the other runs reuse it ("warm").
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # before pygame is initialized
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame as pg
+
+import visualizer.scene as scene
+from visualizer.allocations import AllocationTracker
+from visualizer.profiler import PipelineProfiler
+from visualizer.recording import RecordedRocket, save_recording
+from visualizer.rocket import Rocket
+from visualizer.scene import SCENE_STATE, AppMain, BriefingScene, LibraryScene
+from visualizer.settings import Settings
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+@dataclass
+class Step:
+    """
+    Step of the scripted scenario.
+
+    Attributes:
+        name (str): name of the step in the result.
+        action (Callable[[AppMain], None] | None): called once before the first frame (e.g. to post events).
+        frame_action (Callable[[AppMain, int], None] | None): called before each frame with the frame index.
+        frames (int): number of frames to run after `until` is satisfied.
+        until (Callable[[AppMain], bool] | None): frames are run until it returns True before counting `frames`.
+        timeout (float): maximum time to wait for `until` (unit: s).
+    """
+
+    name: str
+    action: Callable[[AppMain], None] | None = None
+    frame_action: Callable[[AppMain, int], None] | None = None
+    frames: int = 60
+    until: Callable[[AppMain], bool] | None = None
+    timeout: float = 120.0
+
+
+@dataclass
+class StepResult:
+    """
+    Measurements of a step.
+
+    Attributes:
+        name (str): name of the step.
+        frame_times (list[float]): work time of each frame (unit: s).
+        wall_time (float): time of the whole step (unit: s).
+        until_time (float | None): time until `until` is satisfied (unit: s). None if the step has no condition.
+        max_rss (float | None): memory high-water mark of the process after the step (unit: MB).
+        allocations (dict | None): allocations of each frame phase. None if not tracked.
+    """
+
+    name: str
+    frame_times: list[float] = field(default_factory=list)
+    wall_time: float = 0.0
+    until_time: float | None = None
+    max_rss: float | None = None
+    allocations: dict | None = None
+
+    def to_dict(self) -> dict:
+        """Convert to the machine-readable result"""
+        times = np.array(self.frame_times) * 1000  # ms
+        return {
+            "name": self.name,
+            "frames": len(times),
+            "wall_time_s": self.wall_time,
+            "until_s": self.until_time,
+            "frame_ms": (
+                {
+                    "mean": float(times.mean()),
+                    "p50": float(np.percentile(times, 50)),
+                    "p95": float(np.percentile(times, 95)),
+                    "p99": float(np.percentile(times, 99)),
+                    "max": float(times.max()),
+                }
+                if len(times)
+                else None
+            ),
+            "max_rss_mb": self.max_rss,
+            "allocations": self.allocations,
+        }
+
+
+def max_rss() -> float | None:
+    """Memory high-water mark of the process (unit: MB). None if not available."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes on Linux
+    return usage / 2**20 if sys.platform == "darwin" else usage / 2**10
+
+
+def post_click(pos: tuple[int, int]) -> None:
+    """Post a left click at the position"""
+    pg.event.post(pg.event.Event(pg.MOUSEBUTTONDOWN, pos=pos, button=1))
+    pg.event.post(pg.event.Event(pg.MOUSEBUTTONUP, pos=pos, button=1))
+
+
+def post_key(key: int) -> None:
+    """Post a key press"""
+    pg.event.post(pg.event.Event(pg.KEYDOWN, key=key, mod=0, unicode=""))
+    pg.event.post(pg.event.Event(pg.KEYUP, key=key, mod=0, unicode=""))
+
+
+def post_resize(size: tuple[int, int]) -> None:
+    """Post a window resize event"""
+    pg.event.post(pg.event.Event(pg.VIDEORESIZE, w=size[0], h=size[1], size=size))
+
+
+def default_scenario(frames: int = 60) -> list[Step]:
+    """
+    Make the default scenario: open the ork file (by "Browse" in the library), show the briefing,
+    resize the window by a drag, play back the flight and go back to the top.
+
+    Args:
+        frames (int): number of frames of each step.
+
+    Returns:
+        list[Step]: the scenario.
+    """
+
+    def resize_drag(app: AppMain, index: int) -> None:
+        width, height = app.base_width, app.base_height
+        if index < frames // 2:  # drag to 1.5x in the first half of the step
+            ratio = 1 + 0.5 * (index + 1) / (frames // 2)
+            post_resize((int(width * ratio), int(height * ratio)))
+
+    def browse(app: AppMain, index: int) -> None:
+        scene = app.scene
+        if isinstance(scene, LibraryScene) and scene.browse_text.rects is not None:
+            if scene.state == SCENE_STATE.LIBRARY:
+                post_click(scene.browse_text.rects[0].center)
+
+    def is_settled(app: AppMain) -> bool:
+        return isinstance(app.scene, BriefingScene) and app.scene.is_settled()
+
+    return [
+        Step("top", frames=frames),
+        Step(
+            "open",
+            action=lambda app: post_click(app.scene.oepn_file_text.rects[0].center),
+            frame_action=browse,
+            until=lambda app: app.current_state == SCENE_STATE.BRIEFING,
+            frames=0,
+        ),
+        Step("briefing", until=is_settled, frames=frames),
+        Step(
+            "resize",
+            frame_action=resize_drag,
+            until=lambda app: app.pending_size is None,
+            frames=frames,
+        ),
+        Step(
+            "game",
+            action=lambda app: post_key(pg.K_RETURN),
+            frames=frames * 2,
+        ),
+        Step(
+            "back_to_briefing",
+            action=lambda app: post_key(pg.K_BACKSPACE),
+            frames=frames,
+        ),
+        Step(
+            "back_to_top",
+            action=lambda app: post_key(pg.K_BACKSPACE),
+            frames=frames,
+        ),
+    ]
+
+
+def run_step(app: AppMain, step: Step) -> StepResult:
+    """
+    Run a step of the scenario.
+
+    Args:
+        app (AppMain): the application.
+        step (Step): the step.
+
+    Returns:
+        StepResult: measurements of the step.
+    """
+    result = StepResult(step.name)
+    tracker = app.allocation_tracker
+    if tracker is not None:
+        tracker.reset()
+    start = time.perf_counter()
+    if step.action is not None:
+        step.action(app)
+
+    index = 0
+
+    def run_frame() -> None:
+        nonlocal index
+        if step.frame_action is not None:
+            step.frame_action(app, index)
+        frame_start = time.perf_counter()
+        if not app.run_frame():
+            raise RuntimeError(f"The application exited at the step '{step.name}'.")
+        result.frame_times.append(time.perf_counter() - frame_start)
+        index += 1
+
+    if step.until is not None:
+        while True:
+            run_frame()
+            if step.until(app):
+                break
+            if time.perf_counter() - start > step.timeout:
+                raise TimeoutError(f"The step '{step.name}' timed out.")
+        result.until_time = time.perf_counter() - start
+    for _ in range(step.frames):
+        run_frame()
+
+    result.wall_time = time.perf_counter() - start
+    result.max_rss = max_rss()
+    if tracker is not None:
+        result.allocations = tracker.summary()
+    return result
+
+
+def git_revision() -> str | None:
+    """Revision of the working tree to compare the results between releases"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(
+    ork_file: os.PathLike,
+    recording: os.PathLike | None = None,
+    scenario: list[Step] | None = None,
+    window_size: tuple[int, int] | None = None,
+    label: str | None = None,
+    track_allocations: bool = False,
+) -> dict:
+    """
+    Run the application with the scripted scenario and collect the measurements.
+
+    Args:
+        ork_file (os.PathLike): ork file opened instead of the file dialog.
+        recording (os.PathLike | None): recording used instead of the simulation (runs without Java). simulated if None.
+        scenario (list[Step] | None): the scenario. `default_scenario()` if None.
+        window_size (tuple[int, int] | None): initial window size. the default size of the application if None.
+        label (str | None): label of the run (e.g. the release name).
+        track_allocations (bool): whether to track the allocations of each frame phase.
+
+    Returns:
+        dict: machine-readable result.
+    """
+    scenario = scenario or default_scenario()
+    open_ork_file, rocket_class = scene.open_ork_file, scene.Rocket
+    scene.open_ork_file = lambda: str(ork_file)  # no file dialog
+    if recording is not None:
+        scene.Rocket = lambda file_path, settings=None: RecordedRocket(
+            file_path, recording, settings
+        )
+    tracker = AllocationTracker() if track_allocations else None
+    try:
+        start = time.perf_counter()
+        app = AppMain()
+        if window_size is not None:
+            app.base_width, app.base_height = app.adjust_window_size(*window_size)
+        startup_time = time.perf_counter() - start
+        if tracker is not None:
+            app.allocation_tracker = tracker
+            tracker.start()
+        steps = [run_step(app, step) for step in scenario]
+    finally:
+        scene.open_ork_file, scene.Rocket = open_ork_file, rocket_class
+        if tracker is not None:
+            tracker.stop()  # not started if the application failed to start
+
+    results = [step.to_dict() for step in steps]
+    until = {step.name: step.until_time for step in steps}
+    return {
+        "meta": {
+            "label": label,
+            "revision": git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "pygame": pg.version.ver,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "ork_file": str(ork_file),
+            "recording": None if recording is None else str(recording),
+            "window_size": list(pg.display.get_window_size()),
+        },
+        "startup_s": startup_time,
+        "time_to_briefing_s": until.get("open"),
+        "time_to_settled_s": until.get("briefing"),
+        "max_rss_mb": max_rss(),
+        "steps": results,
+    }
+
+
+def record(ork_file: os.PathLike, recording: os.PathLike) -> None:
+    """
+    Simulate the ork file with OpenRocket and save the recording for the benchmark.
+
+    Args:
+        ork_file (os.PathLike): ork file to simulate.
+        recording (os.PathLike): path to the recording file (.npz).
+    """
+    rocket = Rocket(ork_file)
+    rocket.run_simulation()
+    save_recording(rocket, recording)
+    print(f"Recorded: {recording}")
+
+
+def find_ork_files(paths: list[os.PathLike]) -> list[Path]:
+    """
+    Collect the ork files from the paths.
+
+    Args:
+        paths (list[os.PathLike]): ork files or directories searched recursively.
+
+    Returns:
+        list[Path]: the ork files in a stable order (without duplicates).
+    """
+    files = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.rglob("*.ork")) if path.is_dir() else [path])
+    return list(dict.fromkeys(file.resolve() for file in files))
+
+
+def profile_pipeline(ork_file: os.PathLike, settings: Settings) -> dict:
+    """
+    Run the ork file through the simulation pipeline once with the profiler.
+
+    Args:
+        ork_file (os.PathLike): the ork file.
+        settings (Settings): application settings.
+
+    Returns:
+        dict: times and Java call counts of each phase, and the error if failed.
+    """
+    profiler = PipelineProfiler()
+    error = None
+    start = time.perf_counter()
+    try:
+        rocket = Rocket(ork_file, settings)
+        rocket.profiler = profiler
+        rocket.run_simulation()
+    except Exception as e:
+        print(f"Error: {ork_file}: {e}")
+        error = f"{type(e).__name__}: {e}"
+    return {
+        "file": str(ork_file),
+        "total_s": time.perf_counter() - start,
+        "error": error,
+        **profiler.summary(),
+    }
+
+
+def run_pipeline(ork_files: list[os.PathLike], repeats: int) -> list[dict]:
+    """
+    Profile the ork files in this process. The first run starts the JVM if not started yet.
+
+    Args:
+        ork_files (list[os.PathLike]): the ork files.
+        repeats (int): runs of each file.
+
+    Returns:
+        list[dict]: result of each run in the order of the runs.
+    """
+    settings = Settings.load()
+    runs = []
+    for repeat in range(repeats):
+        for ork_file in ork_files:
+            run = profile_pipeline(ork_file, settings)
+            run["repeat"] = repeat
+            run["jvm"] = "warm" if runs else "cold"
+            runs.append(run)
+    return runs
+
+
+def run_pipeline_processes(
+    ork_files: list[os.PathLike], repeats: int, processes: int
+) -> list[dict]:
+    """
+    Profile the ork files in fresh processes, so that each process starts with the cold JVM.
+
+    Args:
+        ork_files (list[os.PathLike]): the ork files.
+        repeats (int): runs of each file in each process.
+        processes (int): number of the processes run one after another.
+
+    Returns:
+        list[dict]: result of each run with the index of the process.
+    """
+    runs = []
+    with tempfile.TemporaryDirectory() as directory:
+        for process in range(processes):
+            output = Path(directory) / f"pipeline{process}.json"
+            command = [sys.executable, "-m", "visualizer.benchmark", "pipeline"]
+            command += [str(file) for file in ork_files]
+            command += ["--repeats", str(repeats), "--processes", "0"]
+            subprocess.run([*command, "--output", str(output)], check=True)
+            for run in json.loads(output.read_text(encoding="utf-8"))["runs"]:
+                run["process"] = process
+                runs.append(run)
+    return runs
+
+
+def describe(values: list[float]) -> dict | None:
+    """Statistics of the measured times (None if there is no value)"""
+    if not values:
+        return None
+    values = np.array(values)
+    return {
+        "n": len(values),
+        "mean": float(values.mean()),
+        "p50": float(np.percentile(values, 50)),
+        "min": float(values.min()),
+        "max": float(values.max()),
+    }
+
+
+def summarize_pipeline(runs: list[dict]) -> dict:
+    """
+    Summarize the runs of the pipeline benchmark by the JVM state and by the file.
+
+    Args:
+        runs (list[dict]): results of `profile_pipeline` with the JVM state.
+
+    Returns:
+        dict: statistics of the total and the phase times, and the Java calls of each file.
+    """
+    succeeded = [run for run in runs if run["error"] is None]
+    summary = {}
+    for jvm in ("cold", "warm"):
+        group = [run for run in succeeded if run["jvm"] == jvm]
+        phases = dict.fromkeys(name for run in group for name in run["phases_s"])
+        summary[jvm] = {
+            "total_s": describe([run["total_s"] for run in group]),
+            "phases_s": {
+                name: describe([run["phases_s"].get(name, 0.0) for run in group])
+                for name in phases
+            },
+        }
+    summary["files"] = {}
+    for file in dict.fromkeys(run["file"] for run in runs):
+        group = [run for run in succeeded if run["file"] == file]
+        summary["files"][file] = {
+            "errors": sum(run["file"] == file for run in runs) - len(group),
+            "warm_total_s": describe(
+                [run["total_s"] for run in group if run["jvm"] == "warm"]
+            ),
+            # the calls do not depend on the JVM state
+            "java_calls": group[0]["java_calls"] if group else None,
+            "counts": group[0]["counts"] if group else None,
+        }
+    return summary
+
+
+def run_pipeline_benchmark(
+    paths: list[os.PathLike],
+    repeats: int = 3,
+    processes: int = 1,
+    label: str | None = None,
+) -> dict:
+    """
+    Run the pipeline benchmark over the ork files.
+
+    Args:
+        paths (list[os.PathLike]): ork files or directories searched recursively.
+        repeats (int): runs of each file in each process.
+        processes (int): number of the fresh processes (cold JVM). runs in this process if 0.
+        label (str | None): label of the run (e.g. the release name).
+
+    Returns:
+        dict: machine-readable result.
+    """
+    ork_files = find_ork_files(paths)
+    if not ork_files:
+        raise FileNotFoundError(f"No ork file is found in {[str(p) for p in paths]}.")
+    if processes > 0:
+        runs = run_pipeline_processes(ork_files, repeats, processes)
+    else:
+        runs = run_pipeline(ork_files, repeats)
+    return {
+        "meta": {
+            "label": label,
+            "revision": git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "repeats": repeats,
+            "processes": processes,
+        },
+        "files": [str(file) for file in ork_files],
+        "summary": summarize_pipeline(runs),
+        "runs": runs,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the scripted scenario")
+    run_parser.add_argument("ork_file", type=Path)
+    run_parser.add_argument("--recording", type=Path, help="replay without Java")
+    run_parser.add_argument("--output", type=Path, help="JSON file (stdout if omitted)")
+    run_parser.add_argument("--frames", type=int, default=60, help="frames per step")
+    run_parser.add_argument("--size", type=int, nargs=2, metavar=("WIDTH", "HEIGHT"))
+    run_parser.add_argument("--label", help="label of the run (e.g. release name)")
+    run_parser.add_argument(
+        "--allocations", action="store_true", help="track allocations per frame phase"
+    )
+
+    record_parser = commands.add_parser("record", help="record a simulation")
+    record_parser.add_argument("ork_file", type=Path)
+    record_parser.add_argument("recording", type=Path)
+
+    pipeline_parser = commands.add_parser(
+        "pipeline", help="time the phases of the simulation pipeline"
+    )
+    pipeline_parser.add_argument("paths", type=Path, nargs="+", help="files or dirs")
+    pipeline_parser.add_argument("--repeats", type=int, default=3, help="runs per file")
+    pipeline_parser.add_argument(
+        "--processes", type=int, default=1, help="fresh processes (0: this process)"
+    )
+    pipeline_parser.add_argument(
+        "--output", type=Path, help="JSON file (stdout if omitted)"
+    )
+    pipeline_parser.add_argument("--label", help="label of the run (e.g. release name)")
+
+    args = parser.parse_args(argv)
+    if args.command == "record":
+        record(args.ork_file, args.recording)
+        return
+
+    if args.command == "pipeline":
+        result = run_pipeline_benchmark(
+            args.paths, args.repeats, args.processes, args.label
+        )
+    else:
+        result = run_benchmark(
+            args.ork_file,
+            args.recording,
+            default_scenario(args.frames),
+            args.size,
+            args.label,
+            args.allocations,
+        )
+    text = json.dumps(result, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        args.output.write_text(text, encoding="utf-8")
+        print(f"Saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
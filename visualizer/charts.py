@@ -0,0 +1,217 @@
+"""
+charts.py
+
+Notes:
+    - Flight charts rendered in the background thread, so that rendering never blocks a frame.
+      The previous render is shown until the new one is ready, and swapped in by `update`.
+    - The series are decimated to the minimum and the maximum of each pixel column before drawing,
+      so that the peaks are kept and the lines have at most two points per pixel.
+    - The renders are cached for the window sizes seen before, and rendered again only when the window
+      is resized to a new size or new data is set. The titles and labels are separate UI elements
+      (the fonts are used only in the main thread).
+"""
+
+import threading
+
+import numpy as np
+import pygame as pg
+
+import visualizer.config as cfg
+from visualizer.layout import Layout, RenderCache
+
+
+def minmax_decimate(
+    x: np.ndarray, y: np.ndarray, bins: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Decimate the series to the minimum and the maximum of each bin of x, in the order they occur.
+
+    Args:
+        x (np.ndarray): x values in ascending order.
+        y (np.ndarray): y values. NaN is dropped.
+        bins (int): number of the bins (e.g. the width of the chart in pixels).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: decimated x and y (at most 2 x bins points).
+    """
+    valid = np.isfinite(x) & np.isfinite(y)
+    x, y = x[valid], y[valid]
+    if len(x) <= 2 * bins:
+        return x, y
+    edges = np.linspace(x[0], x[-1], bins + 1)
+    starts = np.unique(np.searchsorted(x, edges[:-1]))
+    ends = np.append(starts[1:], len(x))
+    low = np.minimum.reduceat(y, starts)
+    high = np.maximum.reduceat(y, starts)
+    falling = y[ends - 1] < y[starts]  # the maximum comes first in a falling bin
+    first = np.where(falling, high, low)
+    second = np.where(falling, low, high)
+    centers = (x[starts] + x[ends - 1]) / 2
+    return np.repeat(centers, 2), np.stack([first, second], axis=1).ravel()
+
+
+def render_chart(
+    size: tuple[int, int],
+    x: np.ndarray,
+    series: list[np.ndarray],
+    colors: list[pg.Color],
+    axis_color: pg.Color,
+    width: int,
+) -> pg.Surface:
+    """
+    Render the axes and the decimated lines (called in the background thread).
+
+    Args:
+        size (tuple[int, int]): size of the chart (unit: px).
+        x (np.ndarray): x values in ascending order.
+        series (list[np.ndarray]): y values of each series.
+        colors (list[pg.Color]): colors of the series.
+        axis_color (pg.Color): color of the axes and the zero line.
+        width (int): width of the lines.
+
+    Returns:
+        pg.Surface: the chart.
+    """
+    image = pg.Surface(size, pg.SRCALPHA)
+    w, h = size
+    pg.draw.lines(image, axis_color, False, [(0, 0), (0, h - 1), (w - 1, h - 1)])
+    lines = [minmax_decimate(x, y, w) for y in series]
+    values = np.concatenate([np.zeros(0)] + [y for _, y in lines])
+    if len(x) < 2 or len(values) == 0:
+        return image
+
+    x_min, x_max = float(x[0]), float(x[-1])
+    y_min, y_max = min(float(values.min()), 0.0), float(values.max())
+    y_max = y_max + max(y_max - y_min, 1e-9) * 0.05  # margin above the peak
+
+    def to_y(y: np.ndarray) -> np.ndarray:
+        return (1 - (y - y_min) / max(y_max - y_min, 1e-9)) * (h - 1)
+
+    if y_min < 0:
+        zero = float(to_y(np.array(0.0)))
+        pg.draw.line(image, axis_color, (0, zero), (w - 1, zero))
+    for (line_x, line_y), color in zip(lines, colors):
+        if len(line_x) < 2:
+            continue
+        px = (line_x - x_min) / max(x_max - x_min, 1e-9) * (w - 1)
+        points = np.stack([px, to_y(line_y)], axis=1)
+        pg.draw.lines(image, color, False, points.tolist(), width)
+    return image
+
+
+class BackgroundChart(pg.sprite.Sprite):
+    """
+    Line chart rendered in the background thread.
+    """
+
+    def __init__(
+        self,
+        area: tuple[float, float, float, float],
+        colors: list[pg.Color],
+        axis_color: pg.Color = cfg.COLOR_GRAY1,
+        width: int = 2,
+    ) -> None:
+        """
+        Initialize the chart.
+
+        Args:
+            area (tuple[float, float, float, float]): left, top, width and height of the chart as percentages of the window size.
+            colors (list[pg.Color]): The colors of the series.
+            axis_color (pg.Color): The color of the axes.
+            width (int): The width of the lines.
+        """
+        super().__init__()
+        self.area: tuple[float, ...] = tuple(value / 100 for value in area)
+        self.colors: list[pg.Color] = colors
+        self.axis_color: pg.Color = axis_color
+        self.width: int = width
+        self.x: np.ndarray = np.zeros(0)
+        self.series: list[np.ndarray] = []
+        # incremented by new data, to drop the renders of the old data
+        self.generation = 0
+        self.renders = 0  # number of the renders started
+        self.window_size: tuple[int, int] = None
+        self.image: pg.Surface = None  # the latest render (may be of the previous size)
+        self.rect: pg.Rect = None
+        self.cache = RenderCache()
+        self.__thread: threading.Thread = None
+        self.__lock = threading.Lock()
+        self.__finished: tuple[int, tuple[int, int], pg.Surface] = None
+
+    def set_series(self, x: np.ndarray, series: list[np.ndarray]) -> None:
+        """Set the x values in ascending order and the y values of each series (NaN is not drawn)"""
+        self.x = np.asarray(x, dtype=float)
+        self.series = [np.asarray(y, dtype=float) for y in series]
+        self.generation += 1
+        self.cache = RenderCache()
+        self.window_size = None  # force re-rendering
+
+    @property
+    def is_rendering(self) -> bool:
+        """Whether a render is running in the background"""
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def update(self) -> None:
+        """Swap in the finished render, and start rendering for the current window size if not cached"""
+        self.__collect()
+        if self.window_size != Layout.get_window_size():
+            self.window_size = Layout.get_window_size()
+            left, top, width, height = self.area
+            self.rect = pg.Rect(
+                int(self.window_size[0] * left),
+                int(self.window_size[1] * top),
+                max(int(self.window_size[0] * width), 2),
+                max(int(self.window_size[1] * height), 2),
+            )
+            cached = self.cache.find(self.rect.size)
+            if cached is not None:
+                self.image = cached
+        if self.cache.find(self.rect.size) is None and not self.is_rendering:
+            with self.__lock:
+                # to be collected at the next update
+                finished = self.__finished is not None
+            if not finished:
+                self.__start()
+
+    def __start(self) -> None:
+        """Start rendering for the current size in the background thread."""
+        self.renders += 1
+        args = (self.generation, self.rect.size, self.x, list(self.series))
+        self.__thread = threading.Thread(target=self.__render, args=args, daemon=True)
+        self.__thread.start()
+
+    def __render(
+        self,
+        generation: int,
+        size: tuple[int, int],
+        x: np.ndarray,
+        series: list[np.ndarray],
+    ) -> None:
+        """Render the chart (in the background thread)."""
+        try:
+            image = render_chart(
+                size, x, series, self.colors, self.axis_color, self.width
+            )
+        except Exception as e:
+            print(f"Error: failed to render the chart: {e}")
+            image = pg.Surface(size, pg.SRCALPHA)  # not to render again
+        with self.__lock:
+            self.__finished = (generation, size, image)
+
+    def __collect(self) -> None:
+        """Cache the finished render, and show it if it is of the current size."""
+        with self.__lock:
+            finished, self.__finished = self.__finished, None
+        if finished is None:
+            return
+        generation, size, image = finished
+        if generation != self.generation:
+            return  # rendered from the old data
+        self.cache.add(size, image)
+        if self.rect is not None and size == self.rect.size:
+            self.image = image
+
+    def draw(self, screen: pg.Surface) -> None:
+        """Draw the latest render on the screen (nothing until the first render is ready)"""
+        if self.image is not None:
+            screen.blit(self.image, self.rect)
@@ -0,0 +1,215 @@
+"""columns.py"""
+
+from typing import Callable
+
+import numpy as np
+from orhelper import FlightDataType
+
+# names of the derived columns
+VERTICAL_VELOCITY = "vertical_velocity"  # m/s
+HORIZONTAL_VELOCITY = "horizontal_velocity"  # m/s
+TOTAL_VELOCITY = "total_velocity"  # m/s
+ACCELERATION = "acceleration"  # m/s^2
+MACH = "mach"  # -
+AIR_DENSITY = "air_density"  # kg/m^3
+DYNAMIC_PRESSURE = "dynamic_pressure"  # Pa
+DISTANCE_FROM_PAD = "distance_from_pad"  # m
+
+GAS_CONSTANT_AIR = 287.053  # specific gas constant of dry air (unit: J/(kg K))
+
+ColumnKey = FlightDataType | str
+
+
+def derivative(values: np.ndarray, time: np.ndarray) -> np.ndarray:
+    """
+    Differentiate the timeseries. Samples with the same time (e.g. at flight events) are handled.
+
+    Args:
+        values (np.ndarray): values to differentiate.
+        time (np.ndarray): time of the samples.
+
+    Returns:
+        np.ndarray: time derivative at each sample (average of the slopes on both sides).
+    """
+    dt = np.diff(time)
+    slope = np.divide(np.diff(values), dt, out=np.full(len(dt), np.nan), where=dt > 0)
+    left = np.concatenate([[np.nan], slope])
+    right = np.concatenate([slope, [np.nan]])
+    both = np.stack([left, right])
+    valid = np.isfinite(both)
+    count = valid.sum(axis=0)
+    total = np.where(valid, both, 0).sum(axis=0)
+    return np.divide(total, count, out=np.full(len(time), np.nan), where=count > 0)
+
+
+class FlightColumns:
+    """
+    Lazy column engine on top of the flight data.
+
+    OpenRocket columns that are not fetched yet are fetched on demand from the retained simulation,
+    and derived columns are computed vectorized from other columns. Every column is memoized once computed,
+    so that HUDs and charts only pay for the columns they actually use.
+    Fetched columns are padded with NaN to the length of the time column, as `get_timeseries` does.
+    """
+
+    # derived columns: name -> (dependencies, function of the dependencies)
+    DERIVED: dict[str, tuple[list[ColumnKey], Callable[..., np.ndarray]]] = {
+        VERTICAL_VELOCITY: (
+            [FlightDataType.TYPE_ALTITUDE, FlightDataType.TYPE_TIME],
+            derivative,
+        ),
+        HORIZONTAL_VELOCITY: (
+            [FlightDataType.TYPE_POSITION_XY, FlightDataType.TYPE_TIME],
+            derivative,
+        ),
+        TOTAL_VELOCITY: (
+            [VERTICAL_VELOCITY, HORIZONTAL_VELOCITY],
+            np.hypot,
+        ),
+        ACCELERATION: (
+            [TOTAL_VELOCITY, FlightDataType.TYPE_TIME],
+            derivative,
+        ),
+        MACH: (
+            [TOTAL_VELOCITY, FlightDataType.TYPE_SPEED_OF_SOUND],
+            np.divide,
+        ),
+        AIR_DENSITY: (
+            [FlightDataType.TYPE_AIR_PRESSURE, FlightDataType.TYPE_AIR_TEMPERATURE],
+            lambda pressure, temperature: pressure / (GAS_CONSTANT_AIR * temperature),
+        ),
+        DYNAMIC_PRESSURE: (
+            [AIR_DENSITY, TOTAL_VELOCITY],
+            lambda density, velocity: 0.5 * density * velocity**2,
+        ),
+        DISTANCE_FROM_PAD: (
+            [FlightDataType.TYPE_POSITION_X, FlightDataType.TYPE_POSITION_Y],
+            np.hypot,
+        ),
+    }
+
+    def __init__(
+        self,
+        columns: dict[ColumnKey, np.ndarray],
+        fetch: (
+            Callable[[list[FlightDataType]], dict[FlightDataType, np.ndarray]] | None
+        ) = None,
+    ) -> None:
+        """
+        Initialize the column engine.
+
+        Args:
+            columns (dict[ColumnKey, np.ndarray]): columns already available (e.g. fetched with the simulation).
+            fetch (Callable | None): function to fetch OpenRocket columns from the retained simulation.
+                only the given columns are available if None.
+        """
+        self.__columns: dict[ColumnKey, np.ndarray] = {
+            key: np.asarray(value, dtype=float) for key, value in columns.items()
+        }
+        self.__fetch = fetch
+
+    def __getitem__(self, key: ColumnKey) -> np.ndarray:
+        return self.get(key)
+
+    def __contains__(self, key: ColumnKey) -> bool:
+        return key in self.__columns
+
+    def __iter__(self):
+        return iter(self.__columns)
+
+    def __len__(self) -> int:
+        return len(self.__columns)
+
+    def keys(self):
+        """Keys of the columns computed so far"""
+        return self.__columns.keys()
+
+    def items(self):
+        """Columns computed so far"""
+        return self.__columns.items()
+
+    def is_available(self, key: ColumnKey) -> bool:
+        """Whether the column can be obtained (already computed, fetchable or derivable)"""
+        if key in self.__columns:
+            return True
+        if isinstance(key, FlightDataType):
+            return self.__fetch is not None
+        if key in self.DERIVED:
+            return all(
+                self.is_available(dependency) for dependency in self.DERIVED[key][0]
+            )
+        return False
+
+    def get(self, key: ColumnKey) -> np.ndarray:
+        """
+        Get the column, fetching or computing it at the first access.
+
+        Args:
+            key (ColumnKey): FlightDataType of OpenRocket or the name of the derived column.
+
+        Returns:
+            np.ndarray: the column.
+        """
+        column = self.__columns.get(key)
+        if column is not None:
+            return column
+
+        if isinstance(key, FlightDataType):
+            self.fetch([key])
+        elif key in self.DERIVED:
+            dependencies, function = self.DERIVED[key]
+            # fetch all missing OpenRocket columns at once
+            self.fetch(
+                [
+                    dependency
+                    for dependency in dependencies
+                    if isinstance(dependency, FlightDataType)
+                    and dependency not in self.__columns
+                ]
+            )
+            with np.errstate(divide="ignore", invalid="ignore"):
+                self.__columns[key] = np.asarray(
+                    function(*[self.get(dependency) for dependency in dependencies]),
+                    dtype=float,
+                )
+        else:
+            raise KeyError(f"Unknown column: {key}")
+        return self.__columns[key]
+
+    def fetch(self, keys: list[FlightDataType]) -> None:
+        """
+        Fetch the OpenRocket columns from the retained simulation (only the missing ones).
+
+        Args:
+            keys (list[FlightDataType]): types of the columns to fetch.
+        """
+        missing = [key for key in keys if key not in self.__columns]
+        if not missing:
+            return
+        if self.__fetch is None:
+            raise KeyError(f"Columns are not available: {missing}")
+        for key, value in self.__fetch(missing).items():
+            self.__columns[key] = self.__fit(key, np.asarray(value, dtype=float))
+
+    def __fit(self, key: FlightDataType, value: np.ndarray) -> np.ndarray:
+        """
+        Pad the fetched column with NaN to the length of the time column.
+
+        Args:
+            key (FlightDataType): type of the column.
+            value (np.ndarray): the fetched column.
+
+        Returns:
+            np.ndarray: the column of the same length as the time column.
+        """
+        time = self.__columns.get(FlightDataType.TYPE_TIME)
+        if time is None or len(value) == len(time):
+            return value
+        if len(value) > len(time):
+            raise ValueError(
+                f"Column {key.name} has {len(value)} samples, "
+                f"more than the {len(time)} samples of the time column"
+            )
+        padded = np.full(len(time), np.nan)
+        padded[: len(value)] = value
+        return padded
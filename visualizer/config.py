@@ -5,5 +5,6 @@ COLOR_PALE_GRAY = pg.Color(0xF0, 0xF0, 0xF0)
 COLOR_GRAY1 = pg.Color(0xC0, 0xC0, 0xC0)
 COLOR_GRAY2 = pg.Color(0x80, 0x80, 0x80)
 COLOR_BLACK = pg.Color(0x20, 0x20, 0x20)
+COLOR_ACCENT = pg.Color(0xE0, 0x60, 0x20)
 
 TEXT_COPYRIGHT = "@2024 From The Earth."
@@ -0,0 +1,92 @@
+"""decimate.py"""
+
+import numpy as np
+
+
+def adaptive_profile(
+    axial: np.ndarray, radius: np.ndarray, n_points: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Resample the profile of a surface of revolution with the points concentrated where the curvature is large.
+
+    Args:
+        axial (np.ndarray): axial position of the densely sampled profile.
+        radius (np.ndarray): radius of the densely sampled profile.
+        n_points (int): number of the points to keep (including both ends).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: axial positions and radii of the resampled profile.
+    """
+    axial = np.asarray(axial, dtype=float)
+    radius = np.asarray(radius, dtype=float)
+    if n_points >= len(axial):
+        return axial, radius
+
+    # turning angle of the profile at each point
+    angle = np.arctan2(np.diff(radius), np.diff(axial))
+    turning = np.abs(np.diff(angle))
+    weight = np.concatenate([[0], turning, [0]])
+    # keep some points on the straight part
+    weight += weight.sum() / len(weight) * 0.25 + 1e-12
+    cumulative = np.cumsum(weight)
+    cumulative = (cumulative - cumulative[0]) / (cumulative[-1] - cumulative[0])
+
+    indices = np.searchsorted(cumulative, np.linspace(0, 1, n_points))
+    indices = np.unique(np.clip(indices, 0, len(axial) - 1))
+    indices[0], indices[-1] = 0, len(axial) - 1
+    return axial[indices], radius[indices]
+
+
+def douglas_peucker(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Simplify the polyline by the Douglas-Peucker algorithm.
+
+    Args:
+        points (np.ndarray): vertices of the polyline (N, 2).
+        tolerance (float): maximum distance between the original and the simplified polyline.
+
+    Returns:
+        np.ndarray: vertices of the simplified polyline.
+    """
+    points = np.asarray(points, dtype=float)
+    return points[douglas_peucker_indices(points, tolerance)]
+
+
+def douglas_peucker_indices(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Simplify the polyline by the Douglas-Peucker algorithm, and return the indices of the kept vertices.
+
+    Args:
+        points (np.ndarray): vertices of the polyline (N, 2).
+        tolerance (float): maximum distance between the original and the simplified polyline.
+
+    Returns:
+        np.ndarray: indices of the kept vertices in ascending order (including both ends).
+    """
+    points = np.asarray(points, dtype=float)
+    if len(points) <= 2:
+        return np.arange(len(points))
+
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        start, end = points[first], points[last]
+        segment = end - start
+        inner = points[first + 1 : last] - start
+        squared_length = segment @ segment
+        if squared_length > 0:
+            # distance to the segment (not to the line, for the paths turning back)
+            ratio = np.clip(inner @ segment / squared_length, 0, 1)
+            inner = inner - ratio[:, None] * segment
+        distance = np.hypot(inner[:, 0], inner[:, 1])
+        index = int(np.argmax(distance))
+        if distance[index] > tolerance:
+            split = first + 1 + index
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return np.flatnonzero(keep)
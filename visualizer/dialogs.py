@@ -19,6 +19,32 @@ def open_ork_file():
     return file_name
 
 
+def open_ork_files():
+    """Open file dialog and return the list of the selected file names"""
+    top = tkinter.Tk()
+    top.withdraw()  # hide window
+    file_names = tkinter.filedialog.askopenfilenames(
+        parent=top, filetypes=[("OpenRocket Files", "*.ork")]
+    )
+    top.destroy()
+    # NOTE: Clear event queue to avoid double file open event occurred(ad hoc). That is why other event (e.g. QUIT) does not work.
+    pg.event.clear()
+    return list(file_names)
+
+
+def open_log_file():
+    """Open file dialog and return the file name of the flight log"""
+    top = tkinter.Tk()
+    top.withdraw()  # hide window
+    file_name = tkinter.filedialog.askopenfilename(
+        parent=top, filetypes=[("Flight Logs", "*.csv")]
+    )
+    top.destroy()
+    # NOTE: Clear event queue to avoid double file open event occurred(ad hoc). That is why other event (e.g. QUIT) does not work.
+    pg.event.clear()
+    return file_name
+
+
 def ask_whether_to_exit():
     """Ask whether to exit the application"""
     top = tkinter.Tk()
@@ -0,0 +1,177 @@
+"""
+events.py
+
+Notes:
+    - The flight events of OpenRocket (launch, rod clearance, burnout, apogee, deployment, ground hit, ...)
+      are indexed once when the simulation result is made: each occurrence is mapped to the nearest sample
+      of the flight data, and the first occurrence of each event is looked up by a dictionary.
+    - Results without the events (e.g. old recordings) get the launch and the apogee from the columns,
+      once when the result is applied, so that the playback never scans the altitude column.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from orhelper import FlightDataType, FlightEvent
+
+# events shown on the timelines and jumped to in the playback, in the order of a nominal flight
+KEY_EVENTS = [
+    FlightEvent.LAUNCH,
+    FlightEvent.LAUNCHROD,
+    FlightEvent.BURNOUT,
+    FlightEvent.APOGEE,
+    FlightEvent.RECOVERY_DEVICE_DEPLOYMENT,
+    FlightEvent.GROUND_HIT,
+]
+
+EVENT_LABELS = {
+    FlightEvent.LAUNCH: ("発射", "Launch"),
+    FlightEvent.LAUNCHROD: ("ランチャー離脱", "Rod Clear"),
+    FlightEvent.BURNOUT: ("燃焼終了", "Burnout"),
+    FlightEvent.APOGEE: ("頂点", "Apogee"),
+    FlightEvent.RECOVERY_DEVICE_DEPLOYMENT: ("パラシュート展開", "Deploy"),
+    FlightEvent.GROUND_HIT: ("着地", "Landing"),
+}
+
+
+def nearest_samples(time: np.ndarray, times: np.ndarray) -> np.ndarray:
+    """
+    Find the nearest sample of each time.
+
+    Args:
+        time (np.ndarray): time column of the flight data (not necessarily sorted).
+        times (np.ndarray): times to find.
+
+    Returns:
+        np.ndarray: index of the nearest sample in the time column for each time.
+    """
+    order = np.argsort(time, kind="stable")
+    sorted_time = time[order]
+    right = np.clip(np.searchsorted(sorted_time, times), 0, len(time) - 1)
+    left = np.clip(right - 1, 0, len(time) - 1)
+    nearer = np.abs(times - sorted_time[left]) <= np.abs(sorted_time[right] - times)
+    return order[np.where(nearer, left, right)]
+
+
+@dataclass(slots=True, eq=False)
+class FlightEventIndex:
+    """
+    Flight events mapped to the samples of the flight data.
+
+    Attributes:
+        names (tuple[str, ...]): FlightEvent name of each occurrence in time order.
+        times (np.ndarray): time of each occurrence (unit: s).
+        indices (np.ndarray): index of the nearest sample of each occurrence in the flight data.
+        first (dict[str, int]): position of the first occurrence of each event in the arrays.
+    """
+
+    names: tuple[str, ...]
+    times: np.ndarray
+    indices: np.ndarray
+    first: dict[str, int]
+
+    @classmethod
+    def build(
+        cls, flight_data, events: dict[FlightEvent, list[float]] | None = None
+    ) -> "FlightEventIndex":
+        """
+        Index the events on the flight data.
+
+        Args:
+            flight_data (FlightColumns): flight data with TYPE_TIME (and TYPE_ALTITUDE for the apogee).
+            events (dict[FlightEvent, list[float]] | None): times of each event (e.g. from `Helper.get_events`).
+                only the launch and the apogee are found from the columns if None.
+
+        Returns:
+            FlightEventIndex: the index.
+        """
+        time = np.asarray(flight_data[FlightDataType.TYPE_TIME], dtype=float)
+        events = dict(events or {})
+        finite = np.isfinite(time)
+        if FlightEvent.LAUNCH not in events and finite.any():
+            events[FlightEvent.LAUNCH] = [float(time[finite].min())]
+        altitude_type = FlightDataType.TYPE_ALTITUDE
+        if FlightEvent.APOGEE not in events and altitude_type in flight_data:
+            altitude = np.asarray(flight_data[altitude_type], dtype=float)
+            if np.isfinite(altitude).any():
+                events[FlightEvent.APOGEE] = [float(time[np.nanargmax(altitude)])]
+
+        items = sorted(
+            (float(t), event.name) for event, times in events.items() for t in times
+        )
+        times = np.array([t for t, _ in items], dtype=float)
+        indices = (
+            nearest_samples(time, times) if len(time) else np.zeros(len(times), int)
+        )
+        first: dict[str, int] = {}
+        for position, (_, name) in enumerate(items):
+            first.setdefault(name, position)
+        return cls(
+            tuple(name for _, name in items),
+            times,
+            indices.astype(np.int64),
+            first,
+        )
+
+    def __contains__(self, event: FlightEvent) -> bool:
+        return event.name in self.first
+
+    def index_of(self, event: FlightEvent) -> int | None:
+        """Sample index of the first occurrence of the event (None if it does not occur)"""
+        position = self.first.get(event.name)
+        return None if position is None else int(self.indices[position])
+
+    def time_of(self, event: FlightEvent) -> float | None:
+        """Time of the first occurrence of the event (None if it does not occur) (unit: s)"""
+        position = self.first.get(event.name)
+        return None if position is None else float(self.times[position])
+
+    def key_events(self) -> list[tuple[FlightEvent, float]]:
+        """First occurrence of each of KEY_EVENTS that occurs, in time order (event, time)"""
+        events = [(event, self.time_of(event)) for event in KEY_EVENTS if event in self]
+        return sorted(events, key=lambda item: item[1])
+
+    def to_dict(self) -> dict:
+        """Convert to the dictionary of plain values (e.g. to record the result)"""
+        return {
+            "names": list(self.names),
+            "times": self.times.tolist(),
+            "indices": self.indices.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FlightEventIndex":
+        """Restore from the dictionary made by `to_dict`"""
+        first: dict[str, int] = {}
+        for position, name in enumerate(data["names"]):
+            first.setdefault(name, position)
+        return cls(
+            tuple(data["names"]),
+            np.array(data["times"], dtype=float),
+            np.array(data["indices"], dtype=np.int64),
+            first,
+        )
+
+
+def event_markers(
+    events: FlightEventIndex, start: float, duration: float, with_time: bool = False
+) -> list[tuple[float, str]]:
+    """
+    Make the markers of the key events on a timeline.
+
+    Args:
+        events (FlightEventIndex): the flight events.
+        start (float): time at the left end of the timeline (unit: s).
+        duration (float): time span of the timeline (unit: s).
+        with_time (bool): whether the labels include the time of the events.
+
+    Returns:
+        list[tuple[float, str]]: position (0 to 1) and label of each event.
+    """
+    return [
+        (
+            (t - start) / max(duration, 1e-6),
+            EVENT_LABELS[event][1] + (f" {t:.1f} s" if with_time else ""),
+        )
+        for event, t in events.key_events()
+    ]
@@ -0,0 +1,332 @@
+"""
+flightlog.py
+
+Notes:
+    - A flight log is a CSV file of an altimeter or an IMU with a header row. Only the time and the altitude
+      columns are read, in chunks of rows, so that a large log does not have to fit in memory as text.
+    - The log is aligned to the simulation by the launch: the first sample exceeding LAUNCH_THRESHOLD
+      above the ground level, detected in the same way in the log and in the simulation.
+"""
+
+import itertools
+import os
+import threading
+import warnings
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+TIME_COLUMNS = ("time", "t", "time_s", "time(s)", "timestamp")
+ALTITUDE_COLUMNS = ("altitude", "alt", "altitude_m", "altitude(m)", "height", "agl")
+LAUNCH_THRESHOLD = 5.0  # altitude above the ground to detect the launch (unit: m)
+LIFTOFF_MARGIN = 0.5  # altitude above the ground at the liftoff (unit: m)
+
+
+def find_column(header: list[str], candidates: tuple[str, ...]) -> int:
+    """
+    Find the column by the candidate names (case-insensitive).
+
+    Args:
+        header (list[str]): column names of the CSV file.
+        candidates (tuple[str, ...]): candidate names of the column.
+
+    Returns:
+        int: index of the column.
+    """
+    names = [name.strip().lower() for name in header]
+    for candidate in candidates:
+        if candidate in names:
+            return names.index(candidate)
+    raise ValueError(f"None of the columns {candidates} is found in {header}.")
+
+
+def read_csv_columns(
+    path: os.PathLike,
+    columns: list[tuple[str, ...]],
+    chunk_rows: int = 65536,
+    progress: Callable[[float], None] | None = None,
+) -> list[np.ndarray]:
+    """
+    Read the columns of the CSV file in chunks of rows.
+
+    Args:
+        path (os.PathLike): path to the CSV file with a header row.
+        columns (list[tuple[str, ...]]): candidate names of each column to read.
+        chunk_rows (int): number of the rows parsed at once.
+        progress (Callable[[float], None] | None): called with the ratio of the read bytes after each chunk.
+
+    Returns:
+        list[np.ndarray]: the columns in the given order.
+    """
+    size = max(os.path.getsize(path), 1)
+    # utf-8-sig drops the byte order mark of the files exported from Excel or Windows loggers
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        line = f.readline()
+        header = line.split(",")
+        usecols = [find_column(header, candidates) for candidates in columns]
+
+        data = np.empty((len(usecols), 0))  # contiguous columns
+        n_rows = 0
+        read = len(line)  # characters read (bytes for ASCII)
+        while True:
+            lines = list(itertools.islice(f, chunk_rows))
+            if not lines:
+                break
+            read += sum(map(len, lines))
+            with warnings.catch_warnings():
+                # a chunk of only the comment lines is empty
+                warnings.filterwarnings("ignore", "loadtxt: input contained no data")
+                chunk = np.loadtxt(
+                    lines, delimiter=",", usecols=usecols, ndmin=2, comments="#"
+                )
+            if n_rows + len(chunk) > data.shape[1]:
+                # estimate the total rows from the read bytes to grow the buffer only a few times
+                estimate = int((n_rows + len(chunk)) * size / read * 1.1)
+                rows = max(estimate, 2 * data.shape[1], n_rows + len(chunk))
+                grown = np.empty((len(usecols), rows))
+                grown[:, :n_rows] = data[:, :n_rows]
+                data = grown
+            data[:, n_rows : n_rows + len(chunk)] = chunk.T
+            n_rows += len(chunk)
+            if progress is not None:
+                progress(min(read / size, 1.0))
+    return list(data[:, :n_rows])  # views of the buffer not to copy the large columns
+
+
+def detect_launch(
+    time: np.ndarray, altitude: np.ndarray, ground: float | None = None
+) -> tuple[float, float]:
+    """
+    Detect the launch in the altitude timeseries.
+
+    Args:
+        time (np.ndarray): time in ascending order (unit: s).
+        altitude (np.ndarray): altitude (unit: m).
+        ground (float | None): ground level (unit: m). estimated from the first samples if None.
+
+    Returns:
+        tuple[float, float]: liftoff time (unit: s) and ground level (unit: m).
+    """
+    if ground is None:
+        ground = float(np.median(altitude[: max(len(altitude) // 100, 1)]))
+    above = np.flatnonzero(altitude > ground + LAUNCH_THRESHOLD)
+    if len(above) == 0:
+        return float(time[0]), ground
+    # the liftoff is the last sample on the ground before the launch is detected
+    on_ground = np.flatnonzero(altitude[: above[0]] <= ground + LIFTOFF_MARGIN)
+    liftoff = on_ground[-1] if len(on_ground) else above[0]
+    return float(time[liftoff]), ground
+
+
+@dataclass
+class LogComparison:
+    """
+    Error statistics of the flight log against the simulation.
+
+    Attributes:
+        apogee (float): apogee of the log (unit: m).
+        apogee_delta (float): apogee of the log minus the simulated one (unit: m).
+        apogee_time_delta (float): time to the apogee of the log minus the simulated one (unit: s).
+        rms_error (float): RMS of the altitude difference over the overlapping time (unit: m).
+    """
+
+    apogee: float
+    apogee_delta: float
+    apogee_time_delta: float
+    rms_error: float
+
+
+class FlightLog:
+    """
+    Altitude log of a real flight, aligned to the launch.
+    """
+
+    def __init__(
+        self, time: np.ndarray, altitude: np.ndarray, path: str = "", copy: bool = True
+    ) -> None:
+        """
+        Initialize the log.
+
+        Args:
+            time (np.ndarray): time of the samples in the log clock (unit: s).
+            altitude (np.ndarray): altitude of the samples (unit: m).
+            path (str): path to the log file.
+            copy (bool): whether to copy the arrays. they are modified in place if False.
+        """
+        time = np.array(time, dtype=float, copy=copy or None)
+        altitude = np.array(altitude, dtype=float, copy=copy or None)
+        if not np.all(time[1:] >= time[:-1]):  # logs are usually sorted already
+            order = np.argsort(time, kind="stable")
+            time, altitude = time[order], altitude[order]
+        self.path = path
+        self.liftoff, ground = detect_launch(time, altitude)
+        # shifted in place not to allocate the large columns again
+        self.time = time
+        self.time -= self.liftoff  # time from the liftoff
+        self.altitude = altitude
+        self.altitude -= ground  # altitude above the ground
+        self.__aligned: OrderedDict = OrderedDict()
+
+    @classmethod
+    def read_csv(
+        cls,
+        path: os.PathLike,
+        progress: Callable[[float], None] | None = None,
+    ) -> "FlightLog":
+        """
+        Read the log from the CSV file.
+
+        Args:
+            path (os.PathLike): path to the CSV file.
+            progress (Callable[[float], None] | None): called with the ratio of the read bytes.
+
+        Returns:
+            FlightLog: the log.
+        """
+        time, altitude = read_csv_columns(
+            path, [TIME_COLUMNS, ALTITUDE_COLUMNS], progress=progress
+        )
+        return cls(time, altitude, str(path), copy=False)
+
+    @property
+    def apogee_index(self) -> int:
+        """Index of the apogee sample"""
+        return int(np.argmax(self.altitude))
+
+    def aligned(self, time: np.ndarray, altitude: np.ndarray) -> np.ndarray:
+        """
+        Resample the log altitude at the simulation samples, with the liftoffs matched.
+
+        Args:
+            time (np.ndarray): time of the simulation samples in ascending order (unit: s).
+            altitude (np.ndarray): simulated altitude above the launch site (unit: m).
+
+        Returns:
+            np.ndarray: altitude of the log at the samples (NaN outside the log).
+        """
+        cached = self.__aligned.get(id(time))
+        if cached is not None and cached[0] is time:
+            return cached[1]
+        liftoff, _ = detect_launch(time, altitude, ground=0.0)
+        aligned = np.interp(
+            time - liftoff, self.time, self.altitude, left=np.nan, right=np.nan
+        )
+        self.__aligned[id(time)] = (time, aligned)  # keep the time not to reuse the id
+        if len(self.__aligned) > 2:
+            self.__aligned.popitem(last=False)
+        return aligned
+
+    def compare(self, time: np.ndarray, altitude: np.ndarray) -> LogComparison:
+        """
+        Compare the log with the simulation.
+
+        Args:
+            time (np.ndarray): time of the simulation samples in ascending order (unit: s).
+            altitude (np.ndarray): simulated altitude above the launch site (unit: m).
+
+        Returns:
+            LogComparison: error statistics.
+        """
+        liftoff, _ = detect_launch(time, altitude, ground=0.0)
+        simulated_apogee = int(np.nanargmax(altitude))
+        difference = self.aligned(time, altitude) - altitude
+        apogee = float(self.altitude[self.apogee_index])
+        return LogComparison(
+            apogee=apogee,
+            apogee_delta=apogee - float(altitude[simulated_apogee]),
+            apogee_time_delta=float(
+                self.time[self.apogee_index] - (time[simulated_apogee] - liftoff)
+            ),
+            rms_error=(
+                float(np.sqrt(np.nanmean(difference**2)))
+                if np.any(np.isfinite(difference))
+                else float("nan")
+            ),
+        )
+
+
+class FlightLogLoader:
+    """
+    Loads the flight log in the background thread, so that the UI is not blocked.
+    The logs are kept in memory by the file path, size and modification time.
+    """
+
+    __cache: OrderedDict = OrderedDict()
+    __cache_lock = threading.Lock()
+    CACHE_SIZE = 2
+
+    def __init__(self, path: os.PathLike) -> None:
+        """
+        Initialize the loader.
+
+        Args:
+            path (os.PathLike): path to the CSV file.
+        """
+        self.path = str(path)
+        self.progress = 0.0  # ratio of the read bytes
+        self.log: FlightLog = None
+        self.error: Exception = None
+        self.__thread: threading.Thread = None
+        self.__lock = threading.Lock()
+        self.__delivered = False
+
+    @classmethod
+    def cache_key(cls, path: str) -> tuple[str, int, int]:
+        """Key of the cached log: the log is read again when the file is changed"""
+        stat = os.stat(path)
+        return (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+    def start(self) -> "FlightLogLoader":
+        """
+        Start loading the log (or take it from the cache).
+
+        Returns:
+            FlightLogLoader: self.
+        """
+        key = self.cache_key(self.path)
+        with self.__cache_lock:
+            log = self.__cache.get(key)
+        if log is not None:
+            self.log, self.progress = log, 1.0
+            return self
+        self.__thread = threading.Thread(target=self.__load, args=(key,), daemon=True)
+        self.__thread.start()
+        return self
+
+    def __load(self, key: tuple[str, int, int]) -> None:
+        """Read the log (in the background thread)."""
+        try:
+            log = FlightLog.read_csv(
+                self.path, progress=lambda ratio: setattr(self, "progress", ratio)
+            )
+        except Exception as e:
+            print(f"Error: failed to load the flight log: {e}")
+            with self.__lock:
+                self.error = e
+            return
+        with self.__cache_lock:
+            self.__cache[key] = log
+            if len(self.__cache) > self.CACHE_SIZE:
+                self.__cache.popitem(last=False)
+        with self.__lock:
+            self.log = log
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the log is being loaded"""
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def poll(self) -> FlightLog | None:
+        """
+        Check whether the log is loaded.
+
+        Returns:
+            FlightLog | None: the log only at the first call after it is loaded, None otherwise.
+        """
+        with self.__lock:
+            if self.log is None or self.__delivered:
+                return None
+            self.__delivered = True
+            return self.log
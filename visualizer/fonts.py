@@ -23,6 +23,7 @@ class Fonts:
     }
 
     __FONT_DIR = "./fonts"
+    __loaded_fonts: dict[tuple[str, int], pg.font.Font] = {}
 
     @classmethod
     def initialize(cls) -> None:
@@ -34,7 +35,8 @@ class Fonts:
     @classmethod
     def get_font(cls, font_name: str, font_size: int = 32) -> pg.font.Font:
         """
-        Get the font object by the font name.
+        Get the font object by the font name. The loaded fonts are cached, since loading a large font file
+        (e.g. the Japanese fonts) is slow.
 
         Args:
             font_name (str): the name of the font.
@@ -43,10 +45,14 @@ class Fonts:
         Returns:
             pg.font.Font: the font object.
         """
+        if (font_name, font_size) in cls.__loaded_fonts:
+            return cls.__loaded_fonts[(font_name, font_size)]
         if os.path.exists(os.path.join(cls.__FONT_DIR, f"{font_name}.ttf")):
-            return pg.font.Font(
+            font = pg.font.Font(
                 os.path.join(cls.__FONT_DIR, f"{font_name}.ttf"), font_size
             )
+            cls.__loaded_fonts[(font_name, font_size)] = font
+            return font
         else:
             print(
                 f"Font {font_name} is not found. Make sure you have downloaded the font via 'download_fonts'."
@@ -0,0 +1,300 @@
+"""
+groundtrack.py
+
+Notes:
+    - Top-down view of the drift: screen right is east (position x), screen up is north (position y).
+    - The geometry is kept in world space (unit: m): the track decimated for each zoom level, and the
+      landing points sorted by east, so that a tile only reads the points in its range.
+    - The view is drawn from the tiles of TILE_SIZE pixels rendered for each zoom level, so that panning
+      only blits the cached tiles. The zoom is quantized to ZOOM_STEPS levels per doubling.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+import pygame as pg
+
+import visualizer.config as cfg
+from visualizer.decimate import douglas_peucker_indices
+from visualizer.layout import Layout
+
+
+class GroundTrack:
+    """
+    Ground-track panel with the pad, the trajectory, the apogee and the landing points.
+    """
+
+    TILE_SIZE = 256  # unit: px
+    MAX_TILES = 64  # cached tiles (unit: tiles of TILE_SIZE)
+    ZOOM_STEPS = 4  # zoom levels per doubling
+    MIN_LEVEL, MAX_LEVEL = -40, 60  # 1/1024 to 32768 px/m
+    RING_SPACING = 60  # minimum spacing of the distance rings (unit: px)
+    TRACK_TOLERANCE = 0.5  # maximum deviation of the drawn track (unit: px)
+    BACKGROUND_COLOR = cfg.COLOR_PALE_WHITE1
+    RING_COLOR = cfg.COLOR_PALE_GRAY
+    TRACK_COLOR = cfg.COLOR_GRAY2
+    LANDINGS_COLOR = pg.Color(0x60, 0x80, 0xC0)
+    MARKER_COLOR = cfg.COLOR_ACCENT
+    BORDER_COLOR = cfg.COLOR_GRAY1
+
+    def __init__(
+        self,
+        area: tuple[float, float, float, float],
+        east: np.ndarray,
+        north: np.ndarray,
+        apogee: tuple[float, float] | None = None,
+    ) -> None:
+        """
+        Initialize the view.
+
+        Args:
+            area (tuple[float, float, float, float]): left, top, width and height of the panel as percentages of the window size.
+            east (np.ndarray): east position of the samples in time order (unit: m).
+            north (np.ndarray): north position of the samples in time order (unit: m).
+            apogee (tuple[float, float] | None): east and north of the apogee (unit: m). not marked if None.
+        """
+        self.area: tuple[float, ...] = tuple(value / 100 for value in area)
+        self.track = np.stack(
+            [np.nan_to_num(east, nan=0.0), np.nan_to_num(north, nan=0.0)], axis=1
+        ).astype(float)
+        self.apogee = None if apogee is None else np.nan_to_num(np.array(apogee, float))
+        self.landing = self.track[-1] if len(self.track) else None
+        self.landings = np.zeros((0, 2))  # sorted by east
+        self.cursor: tuple[float, float] = None  # current position (unit: m)
+
+        self.level = 0
+        self.center = np.zeros(2)  # world position at the center of the panel (unit: m)
+        self.window_size: tuple[int, int] = None
+        self.rect: pg.Rect = None
+        self.dragging = False
+        self.__tiles: OrderedDict = OrderedDict()
+        self.__tracks: dict[int, np.ndarray] = {}  # decimated track of each level
+
+    def set_landings(self, points: np.ndarray) -> None:
+        """
+        Set the landing points (e.g. of Monte Carlo runs).
+
+        Args:
+            points (np.ndarray): east and north of the landing points in rows (unit: m).
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        points = points[np.isfinite(points).all(axis=1)]
+        self.landings = points[np.argsort(points[:, 0], kind="stable")]
+        self.__tiles.clear()
+
+    def set_cursor(self, position: tuple[float, float] | None) -> None:
+        """Set the current position of the rocket (east, north) (hidden if None or not finite)"""
+        if position is not None and not np.isfinite(position).all():
+            position = None
+        self.cursor = position
+
+    @classmethod
+    def pixels_per_meter(cls, level: int) -> float:
+        """Scale of the zoom level (unit: px/m)"""
+        return 2.0 ** (level / cls.ZOOM_STEPS)
+
+    def fit(self) -> None:
+        """Zoom and center the view to show the whole track and the landing points."""
+        points = np.concatenate([self.track, self.landings, np.zeros((1, 2))])
+        low, high = points.min(axis=0), points.max(axis=0)
+        self.center = (low + high) / 2
+        extent = max(float(np.max(high - low)), 1.0) * 1.2
+        size = min(self.rect.size) if self.rect is not None else self.TILE_SIZE
+        level = int(np.floor(np.log2(size / extent) * self.ZOOM_STEPS))
+        self.level = int(np.clip(level, self.MIN_LEVEL, self.MAX_LEVEL))
+
+    def pan(self, dx: float, dy: float) -> None:
+        """
+        Move the view by the pixels on the screen.
+
+        Args:
+            dx (float): rightward move of the content (unit: px).
+            dy (float): downward move of the content (unit: px).
+        """
+        ppm = self.pixels_per_meter(self.level)
+        self.center = self.center + np.array([-dx, dy]) / ppm
+
+    def zoom_at(self, steps: int, pos: tuple[float, float]) -> None:
+        """
+        Zoom by the levels, keeping the world point under the position.
+
+        Args:
+            steps (int): levels to zoom in (negative to zoom out).
+            pos (tuple[float, float]): position on the screen (unit: px).
+        """
+        level = int(np.clip(self.level + steps, self.MIN_LEVEL, self.MAX_LEVEL))
+        anchor = self.to_world(pos)
+        self.level = level
+        offset = np.array(pos, dtype=float) - self.rect.center
+        self.center = anchor - np.array(
+            [offset[0], -offset[1]]
+        ) / self.pixels_per_meter(level)
+
+    def to_world(self, pos: tuple[float, float]) -> np.ndarray:
+        """World position (east, north) of the position on the screen (unit: m)"""
+        offset = np.array(pos, dtype=float) - self.rect.center
+        return self.center + np.array([offset[0], -offset[1]]) / self.pixels_per_meter(
+            self.level
+        )
+
+    def event_handler(self, event) -> bool:
+        """
+        Pan by dragging and zoom by the mouse wheel on the panel.
+
+        Returns:
+            bool: whether the event is consumed by the panel.
+        """
+        if self.rect is None:
+            return False
+        if event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
+            self.dragging = self.rect.collidepoint(event.pos)
+            return self.dragging
+        if event.type == pg.MOUSEBUTTONUP and event.button == 1 and self.dragging:
+            self.dragging = False
+            return True
+        if event.type == pg.MOUSEMOTION and self.dragging:
+            self.pan(*event.rel)
+            return True
+        if event.type == pg.MOUSEWHEEL:
+            pos = pg.mouse.get_pos()
+            if self.rect.collidepoint(pos):
+                self.zoom_at(event.y, pos)
+                return True
+        return False
+
+    def update(self) -> None:
+        """Update the panel size and position based on the current window size"""
+        if self.window_size != Layout.get_window_size():
+            self.window_size = Layout.get_window_size()
+            left, top, width, height = self.area
+            self.rect = pg.Rect(
+                int(self.window_size[0] * left),
+                int(self.window_size[1] * top),
+                max(int(self.window_size[0] * width), 2),
+                max(int(self.window_size[1] * height), 2),
+            )
+            if self.level == 0 and not self.center.any():  # not fitted yet
+                self.fit()
+
+    def track_at(self, level: int) -> np.ndarray:
+        """Track decimated for the zoom level (unit: m)"""
+        track = self.__tracks.get(level)
+        if track is None:
+            tolerance = self.TRACK_TOLERANCE / self.pixels_per_meter(level)
+            track = self.track[douglas_peucker_indices(self.track, tolerance)]
+            self.__tracks[level] = track
+        return track
+
+    def ring_interval(self, level: int) -> float:
+        """Interval of the distance rings around the pad: 1, 2 or 5 x 10^n m (unit: m)"""
+        minimum = self.RING_SPACING / self.pixels_per_meter(level)
+        exponent = 10 ** np.floor(np.log10(minimum))
+        for factor in (1, 2, 5, 10):
+            if factor * exponent >= minimum:
+                return factor * exponent
+        return 10 * exponent
+
+    def get_tile(self, level: int, tx: int, ty: int) -> pg.Surface:
+        """Get the cached tile, or render and cache it."""
+        key = (level, tx, ty)
+        tile = self.__tiles.get(key)
+        if tile is not None:
+            self.__tiles.move_to_end(key)
+            return tile
+        tile = self.render_tile(level, tx, ty)
+        self.__tiles[key] = tile
+        if len(self.__tiles) > self.MAX_TILES:
+            self.__tiles.popitem(last=False)  # drop the least recently used
+        return tile
+
+    def render_tile(self, level: int, tx: int, ty: int) -> pg.Surface:
+        """
+        Render the tile of the zoom level. The pixel (x, y) of the level is at (east, -north) x pixels_per_meter.
+
+        Args:
+            level (int): zoom level.
+            tx (int): column of the tile.
+            ty (int): row of the tile.
+
+        Returns:
+            pg.Surface: the tile.
+        """
+        size = self.TILE_SIZE
+        ppm = self.pixels_per_meter(level)
+        # pixel of the tile corner
+        origin = np.array([tx * size, ty * size], dtype=float)
+        tile = pg.Surface((size, size))
+        tile.fill(self.BACKGROUND_COLOR)
+
+        def to_tile(points: np.ndarray) -> np.ndarray:
+            return np.stack([points[:, 0] * ppm, -points[:, 1] * ppm], axis=1) - origin
+
+        # distance rings around the pad (only the rings crossing the tile)
+        pad = to_tile(np.zeros((1, 2)))[0]
+        corners = np.array([[0, 0], [size, 0], [0, size], [size, size]]) - pad
+        far = float(np.hypot(corners[:, 0], corners[:, 1]).max())
+        near = float(np.hypot(*np.clip(pad, 0, size) - pad))
+        interval = self.ring_interval(level) * ppm
+        for index in range(max(int(near // interval), 1), int(far // interval) + 1):
+            pg.draw.circle(tile, self.RING_COLOR, pad, index * interval, 1)
+
+        # landing points in the range of the tile (with the margin of the dots)
+        if len(self.landings):
+            margin = 2 / ppm
+            west = origin[0] / ppm - margin
+            start, end = np.searchsorted(
+                self.landings[:, 0], [west, west + size / ppm + 2 * margin]
+            )
+            pixels = np.floor(to_tile(self.landings[start:end])).astype(int)
+            pixels = pixels[((pixels >= -1) & (pixels <= size)).all(axis=1)]
+            if len(pixels):
+                array = pg.surfarray.pixels3d(tile)
+                color = tuple(self.LANDINGS_COLOR)[:3]
+                for dx, dy in ((0, 0), (1, 0), (0, 1), (1, 1)):  # 2x2 dots
+                    x, y = pixels[:, 0] + dx, pixels[:, 1] + dy
+                    inside = (x >= 0) & (x < size) & (y >= 0) & (y < size)
+                    array[x[inside], y[inside]] = color
+                del array  # unlock the surface
+
+        # trajectory and the markers
+        track = self.track_at(level)
+        if len(track) >= 2:
+            pg.draw.lines(tile, self.TRACK_COLOR, False, to_tile(track).tolist(), 2)
+        pg.draw.circle(tile, self.TRACK_COLOR, pad, 5, 2)
+        if self.apogee is not None:
+            x, y = to_tile(self.apogee[np.newaxis])[0]
+            pg.draw.polygon(
+                tile, self.MARKER_COLOR, [(x, y - 5), (x - 5, y + 4), (x + 5, y + 4)], 2
+            )
+        if self.landing is not None:
+            x, y = to_tile(self.landing[np.newaxis])[0]
+            pg.draw.line(tile, self.MARKER_COLOR, (x - 4, y - 4), (x + 4, y + 4), 2)
+            pg.draw.line(tile, self.MARKER_COLOR, (x - 4, y + 4), (x + 4, y - 4), 2)
+        return tile
+
+    def draw(self, screen: pg.Surface) -> None:
+        """Draw the visible tiles, the current position and the border on the screen"""
+        size = self.TILE_SIZE
+        ppm = self.pixels_per_meter(self.level)
+        # screen position of the pixel origin of the level
+        ox = round(self.rect.centerx - self.center[0] * ppm)
+        oy = round(self.rect.centery + self.center[1] * ppm)
+        first_x, first_y = (self.rect.left - ox) // size, (self.rect.top - oy) // size
+        last_x, last_y = (self.rect.right - ox) // size, (self.rect.bottom - oy) // size
+
+        clip = screen.get_clip()
+        screen.set_clip(self.rect)
+        screen.blits(
+            [
+                (self.get_tile(self.level, tx, ty), (ox + tx * size, oy + ty * size))
+                for ty in range(first_y, last_y + 1)
+                for tx in range(first_x, last_x + 1)
+            ],
+            doreturn=False,
+        )
+        if self.cursor is not None:
+            x = ox + self.cursor[0] * ppm
+            y = oy - self.cursor[1] * ppm
+            pg.draw.circle(screen, cfg.COLOR_BLACK, (x, y), 4)
+        screen.set_clip(clip)
+        pg.draw.rect(screen, self.BORDER_COLOR, self.rect, 1)
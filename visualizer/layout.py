@@ -0,0 +1,122 @@
+"""layout.py"""
+
+from collections import OrderedDict
+from typing import Any, Callable
+
+import pygame as pg
+
+
+class Layout:
+    """
+    Layout size manager class.
+
+    The UI elements are laid out for the layout size instead of the current window size,
+    so that the layout is recomputed only once when a window resize is settled, not for every resize event.
+    """
+
+    __size: tuple[int, int] = None
+    __render_scale: float = 1.0
+
+    @classmethod
+    def get_window_size(cls) -> tuple[int, int]:
+        """
+        Get the window size for the layout.
+
+        Returns:
+            tuple[int, int]: the applied layout size, or the current window size if it is not set.
+        """
+        if cls.__size is None:
+            return pg.display.get_window_size()
+        return cls.__size
+
+    @classmethod
+    def set_window_size(cls, size: tuple[int, int] | None) -> None:
+        """
+        Set the window size for the layout.
+
+        Args:
+            size (tuple[int, int] | None): the new layout size. follows the current window size if None.
+        """
+        cls.__size = None if size is None else (int(size[0]), int(size[1]))
+
+    @classmethod
+    def get_render_scale(cls) -> float:
+        """
+        Get the scale of the internal render resolution to the window size.
+
+        Returns:
+            float: the render scale (1.0 for the native resolution).
+        """
+        return cls.__render_scale
+
+    @classmethod
+    def set_render_scale(cls, scale: float) -> None:
+        """
+        Set the scale of the internal render resolution to the window size.
+
+        Args:
+            scale (float): the render scale (1.0 for the native resolution).
+        """
+        cls.__render_scale = float(scale)
+
+    @classmethod
+    def get_render_size(cls) -> tuple[int, int]:
+        """
+        Get the size of the off-screen surface the scaled world of the playback is drawn on.
+        The UI elements are laid out for `get_window_size`, and composited at the native resolution.
+
+        Returns:
+            tuple[int, int]: the render size.
+        """
+        width, height = cls.get_window_size()
+        scale = cls.__render_scale
+        return max(int(width * scale), 1), max(int(height * scale), 1)
+
+
+class RenderCache:
+    """
+    Small LRU cache of the renders (e.g. scaled images or rendered texts) at the previously seen sizes,
+    so that resizing back to a known size does not render again.
+    """
+
+    def __init__(self, max_size: int = 4) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_size (int): maximum number of the cached renders.
+        """
+        self.max_size = max_size
+        self.__items: OrderedDict = OrderedDict()
+
+    def get(self, key, render: Callable[[], Any]) -> Any:
+        """
+        Get the cached render, or render and cache it.
+
+        Args:
+            key: key of the render (e.g. the window size).
+            render (Callable[[], Any]): function to render when the key is not cached.
+
+        Returns:
+            Any: the render.
+        """
+        if key in self.__items:
+            self.__items.move_to_end(key)
+            return self.__items[key]
+        value = render()
+        self.add(key, value)
+        return value
+
+    def find(self, key) -> Any:
+        """Get the cached render without rendering (None if not cached)"""
+        if key not in self.__items:
+            return None
+        self.__items.move_to_end(key)
+        return self.__items[key]
+
+    def add(self, key, value: Any) -> None:
+        """Cache the render made elsewhere (e.g. in the background thread)"""
+        self.__items[key] = value
+        self.__items.move_to_end(key)
+        if len(self.__items) > self.max_size:
+            self.__items.popitem(last=False)  # drop the least recently used
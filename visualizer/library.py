@@ -0,0 +1,554 @@
+"""
+library.py
+
+Notes:
+    - The library is an index of the .ork files in the configured directories ([library] in settings.toml),
+      kept in a SQLite file, so that the rockets can be listed without opening OpenRocket.
+    - The files are scanned in the background thread, and only the new or modified files (by the size and
+      the modification time) are read again.
+    - The .ork document (zipped or gzipped XML) is read directly. The length and the diameter are those of
+      the airframe, and the mass is estimated from the component geometry and materials (without the motor),
+      so that it is close to, but not exactly, the dry mass computed by OpenRocket.
+"""
+
+import gzip
+import json
+import math
+import os
+import sqlite3
+import threading
+import xml.etree.ElementTree as ET
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pygame as pg
+
+INDEX_VERSION = 1  # the index is rebuilt when the stored columns are changed
+BATCH_SIZE = 32  # number of the files committed at once while scanning
+SKIPPED_DIRECTORIES = {".git", "__pycache__", ".venv", "venv", "node_modules"}
+BODY_COMPONENTS = ("nosecone", "bodytube", "transition")
+FIN_COMPONENTS = ("trapezoidfinset", "ellipticalfinset", "freeformfinset")
+INNER_COMPONENTS = (
+    "innertube",
+    "centeringring",
+    "bulkhead",
+    "engineblock",
+    "tubecoupler",
+)
+
+
+@dataclass
+class LibraryEntry:
+    """
+    Indexed .ork file.
+
+    Attributes:
+        path (str): absolute path to the file.
+        mtime (int): modification time of the indexed file (unit: ns).
+        name (str): name of the rocket.
+        length (float): length of the airframe (unit: m).
+        diameter (float): maximum diameter of the airframe (unit: m).
+        mass (float): estimated dry mass (unit: kg).
+        motor (str): motor designation of the default configuration ("" if none).
+        profile (str): JSON of the side profile for the thumbnail (see `read_ork_summary`).
+        error (str): error message if the file could not be read ("" if read).
+    """
+
+    path: str
+    mtime: int
+    name: str
+    length: float
+    diameter: float
+    mass: float
+    motor: str
+    profile: str
+    error: str = ""
+
+
+def parse_radius(text: str | None, default: float) -> float:
+    """Parse the radius, which may be "auto" or "auto <value>" (the automatic value)"""
+    if not text:
+        return default
+    value = text.split()[-1]
+    return default if value == "auto" else float(value)
+
+
+def float_of(element: ET.Element, tag: str, default: float = 0.0) -> float:
+    """Parse the float value of the child element"""
+    child = element.find(tag)
+    if child is None or not child.text:
+        return default
+    return parse_radius(child.text, default)
+
+
+def density_of(element: ET.Element) -> float:
+    """Density of the material of the component (unit: kg/m^3, kg/m^2 or kg/m by the material type)"""
+    material = element.find("material")
+    return 0.0 if material is None else float(material.get("density", 0.0))
+
+
+def nose_radius(
+    shape: str, parameter: float, fineness: float, ratio: np.ndarray
+) -> np.ndarray:
+    """
+    Radius of the nose cone shape at the ratio of the length from the tip.
+
+    Args:
+        shape (str): shape of the nose cone in the .ork file.
+        parameter (float): shape parameter.
+        fineness (float): ratio of the length to the aft radius.
+        ratio (np.ndarray): ratio of the length from the tip (0 to 1).
+
+    Returns:
+        np.ndarray: ratio of the radius to the aft radius.
+    """
+    x = np.clip(ratio, 0, 1)
+    if shape == "conical":
+        return x
+    if shape == "ellipsoid":
+        return np.sqrt(np.clip(2 * x - x**2, 0, None))
+    if shape == "power":
+        return x ** max(parameter, 1e-3)
+    if shape == "parabolic":
+        return (2 * x - parameter * x**2) / (2 - parameter)
+    if shape == "haack":
+        theta = np.arccos(1 - 2 * x)
+        value = theta - np.sin(2 * theta) / 2 + parameter * np.sin(theta) ** 3
+        return np.sqrt(np.clip(value, 0, None) / np.pi)
+    # tangent ogive of the unit radius
+    rho = (1 + fineness**2) / 2
+    return np.sqrt(np.clip(rho**2 - (fineness * (1 - x)) ** 2, 0, None)) + 1 - rho
+
+
+def fin_points(element: ET.Element) -> list[tuple[float, float]]:
+    """
+    Outline of a fin from the root leading edge.
+
+    Args:
+        element (ET.Element): fin set element.
+
+    Returns:
+        list[tuple[float, float]]: points (axial, height) of the outline (unit: m).
+    """
+    if element.tag == "freeformfinset":
+        return [
+            (float(point.get("x")), float(point.get("y")))
+            for point in element.iter("point")
+        ]
+    root = float_of(element, "rootchord")
+    height = float_of(element, "height")
+    if element.tag == "ellipticalfinset":
+        angle = np.linspace(np.pi, 0, 9)
+        return list(zip(root / 2 * (1 + np.cos(angle)), height * np.sin(angle)))
+    sweep = float_of(element, "sweeplength")
+    tip = float_of(element, "tipchord")
+    return [(0.0, 0.0), (sweep, height), (sweep + tip, height), (root, 0.0)]
+
+
+def polygon_area(points: list[tuple[float, float]]) -> float:
+    """Area of the polygon by the shoelace formula"""
+    if len(points) < 3:
+        return 0.0
+    x, y = np.array(points).T
+    return float(abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))) / 2)
+
+
+def component_mass(element: ET.Element, radius: float) -> float:
+    """
+    Estimate the mass of the component and its subcomponents.
+
+    Args:
+        element (ET.Element): component element.
+        radius (float): inner radius of the parent body, for the automatic radii (unit: m).
+
+    Returns:
+        float: estimated mass (unit: kg).
+    """
+    tag = element.tag
+    density = density_of(element)
+    length = float_of(element, "length")
+    thickness = float_of(element, "thickness")
+    mass = 0.0
+    if tag == "bodytube":
+        outer = float_of(element, "radius", radius)
+        mass = math.pi * (outer**2 - max(outer - thickness, 0) ** 2) * length * density
+        radius = max(outer - thickness, 0)
+    elif tag in ("nosecone", "transition"):
+        fore = float_of(element, "foreradius", 0.0)
+        aft = float_of(element, "aftradius", radius)
+        slant = math.hypot(aft - fore, length)
+        mass = math.pi * (fore + aft) * slant * thickness * density
+        radius = max(aft - thickness, 0)
+    elif tag in FIN_COMPONENTS:
+        count = float_of(element, "fincount", 1)
+        mass = polygon_area(fin_points(element)) * thickness * density * count
+    elif tag in INNER_COMPONENTS:
+        outer = float_of(element, "outerradius", radius)
+        inner = float_of(element, "innerradius", 0.0)
+        if tag in ("innertube", "tubecoupler"):
+            inner = max(outer - thickness, 0)
+        mass = math.pi * max(outer**2 - inner**2, 0) * length * density
+    elif tag == "masscomponent":
+        mass = float_of(element, "mass")
+    elif tag == "shockcord":
+        mass = float_of(element, "cordlength") * density
+    elif tag == "parachute":
+        mass = math.pi * (float_of(element, "diameter") / 2) ** 2 * density
+    elif tag == "streamer":
+        mass = float_of(element, "striplength") * float_of(element, "stripwidth")
+        mass *= density
+
+    override = element.find("overridemass")
+    if override is not None and override.text:
+        mass = float(override.text)
+        subcomponents = element.findtext("overridesubcomponentsmass") == "true"
+        if subcomponents:
+            return mass
+    for child in element.findall("subcomponents/*"):
+        mass += component_mass(child, radius)
+    return mass
+
+
+def read_document(path: os.PathLike) -> ET.Element:
+    """
+    Read the XML document of the .ork file (zipped, gzipped or plain).
+
+    Args:
+        path (os.PathLike): path to the .ork file.
+
+    Returns:
+        ET.Element: root element of the document.
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            name = next(
+                (name for name in archive.namelist() if name.endswith(".ork")),
+                archive.namelist()[0],
+            )
+            return ET.fromstring(archive.read(name))
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    return ET.fromstring(data)
+
+
+def read_ork_summary(path: os.PathLike) -> dict:
+    """
+    Read the summary of the rocket in the .ork file.
+
+    Args:
+        path (os.PathLike): path to the .ork file.
+
+    Returns:
+        dict: name, length, diameter, mass, motor and profile. The profile has "body" (points (axial, radius)
+            of the outline from the nose tip) and "fins" (outlines of a fin (axial, radius)) (unit: m).
+    """
+    rocket = read_document(path).find("rocket")
+    if rocket is None:
+        raise ValueError("No rocket in the document.")
+
+    body: list[tuple[float, float]] = [(0.0, 0.0)]
+    fins: list[list[tuple[float, float]]] = []
+    mass = 0.0
+    position = 0.0
+    radius = 0.0
+    for stage in rocket.findall("subcomponents/stage"):
+        for component in stage.findall("subcomponents/*"):
+            mass += component_mass(component, radius)
+            if component.tag not in BODY_COMPONENTS:
+                continue
+            length = float_of(component, "length")
+            if component.tag == "bodytube":
+                radius = float_of(component, "radius", radius)
+                fore = aft = radius
+            else:
+                fore = float_of(component, "foreradius", radius)
+                aft = float_of(component, "aftradius", radius)
+            if component.tag == "nosecone":
+                ratio = np.linspace(0, 1, 17)
+                shape_radius = aft * nose_radius(
+                    component.findtext("shape", "ogive"),
+                    float_of(component, "shapeparameter"),
+                    length / max(aft, 1e-9),
+                    ratio,
+                )
+                body.extend(zip(position + ratio * length, shape_radius))
+            else:
+                body.extend([(position, fore), (position + length, aft)])
+            radius = aft
+
+            for fin in component.findall("subcomponents/*"):
+                if fin.tag not in FIN_COMPONENTS:
+                    continue
+                outline = fin_points(fin)
+                chord = outline[-1][0]  # root chord
+                offset = float_of(fin, "axialoffset")
+                method = fin.find("axialoffset")
+                method = "top" if method is None else method.get("method", "top")
+                start = {
+                    "bottom": position + length - chord,
+                    "middle": position + (length - chord) / 2,
+                    "absolute": 0.0,
+                }.get(method, position)
+                fins.append([(start + offset + x, radius + y) for x, y in outline])
+            position += length
+    body.append((position, 0.0))
+
+    configuration = rocket.find("motorconfiguration[@default='true']")
+    config_id = None if configuration is None else configuration.get("configid")
+    motors = list(rocket.iter("motor"))
+    motor = next(
+        (item for item in motors if item.get("configid") == config_id),
+        motors[0] if motors else None,
+    )
+    return {
+        "name": rocket.findtext("name", Path(path).stem),
+        "length": position,
+        "diameter": float(2 * max(r for _, r in body)),
+        "mass": mass,
+        "motor": "" if motor is None else motor.findtext("designation", ""),
+        "profile": {
+            "body": [[round(float(x), 5), round(float(r), 5)] for x, r in body],
+            "fins": [
+                [[round(float(x), 5), round(float(r), 5)] for x, r in fin]
+                for fin in fins
+            ],
+        },
+    }
+
+
+def render_thumbnail(
+    entry: LibraryEntry, size: tuple[int, int], color: pg.Color
+) -> pg.Surface:
+    """
+    Render the side view of the rocket (nose to the right) fitting in the size.
+
+    Args:
+        entry (LibraryEntry): indexed file.
+        size (tuple[int, int]): size of the thumbnail (unit: px).
+        color (pg.Color): color of the rocket.
+
+    Returns:
+        pg.Surface: the thumbnail (transparent background).
+    """
+    image = pg.Surface(size, pg.SRCALPHA)
+    if not entry.profile:
+        return image
+    profile = json.loads(entry.profile)
+    width, height = size
+    span = max(
+        [r for _, r in profile["body"]]
+        + [r for fin in profile["fins"] for _, r in fin],
+        default=0.0,
+    )
+    scale = min(
+        (width - 2) / max(entry.length, 1e-6), (height - 2) / 2 / max(span, 1e-6)
+    )
+    center = height / 2
+
+    def to_screen(points: list[list[float]], sign: int) -> list[tuple[float, float]]:
+        return [(width - 1 - x * scale, center + sign * r * scale) for x, r in points]
+
+    for fin in profile["fins"]:
+        for sign in (1, -1):
+            if len(fin) >= 3:
+                pg.draw.polygon(image, color, to_screen(fin, sign))
+    outline = to_screen(profile["body"], 1) + to_screen(profile["body"][::-1], -1)
+    pg.draw.polygon(image, color, outline)
+    return image
+
+
+class LibraryIndex:
+    """
+    SQLite index of the .ork files.
+    Each thread has to use its own index object, since a connection cannot be shared between threads.
+    """
+
+    def __init__(self, path: os.PathLike) -> None:
+        """
+        Open (or create) the index.
+
+        Args:
+            path (os.PathLike): path to the SQLite file.
+        """
+        self.path = str(path)
+        self.connection = sqlite3.connect(self.path, timeout=10)
+        self.connection.execute("PRAGMA journal_mode=WAL")  # read while scanning
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != INDEX_VERSION:
+            self.connection.execute("DROP TABLE IF EXISTS rockets")
+            self.connection.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS rockets (
+                path TEXT PRIMARY KEY,
+                mtime INTEGER,
+                size INTEGER,
+                name TEXT,
+                length REAL,
+                diameter REAL,
+                mass REAL,
+                motor TEXT,
+                profile TEXT,
+                error TEXT
+            )
+            """)
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def stamps(self) -> dict[str, tuple[int, int]]:
+        """Modification time and size of the indexed files by the path"""
+        rows = self.connection.execute("SELECT path, mtime, size FROM rockets")
+        return {path: (mtime, size) for path, mtime, size in rows}
+
+    def entries(self, query: str = "") -> list[LibraryEntry]:
+        """
+        Get the readable files sorted by the name.
+
+        Args:
+            query (str): filter by the name, motor or file name (case-insensitive).
+
+        Returns:
+            list[LibraryEntry]: the entries.
+        """
+        pattern = f"%{query}%"
+        rows = self.connection.execute(
+            """
+            SELECT path, mtime, name, length, diameter, mass, motor, profile, error
+            FROM rockets
+            WHERE error = '' AND (name LIKE ? OR motor LIKE ? OR path LIKE ?)
+            ORDER BY name COLLATE NOCASE, path
+            """,
+            (pattern, pattern, pattern),
+        )
+        return [LibraryEntry(*row) for row in rows]
+
+    def scan(self, directories: list[os.PathLike], progress=None) -> int:
+        """
+        Index the new or modified .ork files in the directories, and remove the missing ones.
+
+        Args:
+            directories (list[os.PathLike]): directories to scan recursively.
+            progress (Callable[[int], None] | None): called with the number of the read files after each batch.
+
+        Returns:
+            int: number of the read (new or modified) files.
+        """
+        stamps = self.stamps()
+        found = set()
+        batch = []
+        read = 0
+
+        def commit() -> None:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO rockets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                batch,
+            )
+            self.connection.commit()
+            batch.clear()
+            if progress is not None:
+                progress(read)
+
+        for directory in directories:
+            for root, dirs, files in os.walk(directory):
+                dirs[:] = [name for name in dirs if name not in SKIPPED_DIRECTORIES]
+                for file in files:
+                    if not file.lower().endswith(".ork"):
+                        continue
+                    path = os.path.abspath(os.path.join(root, file))
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    found.add(path)
+                    stamp = (stat.st_mtime_ns, stat.st_size)
+                    if stamps.get(path) == stamp:
+                        continue
+                    batch.append((path, *stamp, *self.read_row(path)))
+                    read += 1
+                    if len(batch) >= BATCH_SIZE:
+                        commit()
+        if batch or progress is not None:
+            commit()
+
+        missing = [(path,) for path in stamps if path not in found]
+        if missing:
+            self.connection.executemany("DELETE FROM rockets WHERE path = ?", missing)
+            self.connection.commit()
+        return read
+
+    @staticmethod
+    def read_row(path: str) -> tuple:
+        """Read the columns of the file (name, length, diameter, mass, motor, profile, error)"""
+        try:
+            summary = read_ork_summary(path)
+        except Exception as e:  # broken or unsupported files are indexed with the error
+            return (Path(path).stem, 0.0, 0.0, 0.0, "", "", str(e) or type(e).__name__)
+        return (
+            summary["name"],
+            summary["length"],
+            summary["diameter"],
+            summary["mass"],
+            summary["motor"],
+            json.dumps(summary["profile"]),
+            "",
+        )
+
+
+class LibraryScanner:
+    """
+    Scans the library directories in the background thread.
+    """
+
+    def __init__(self, index_path: os.PathLike, directories: list[os.PathLike]) -> None:
+        """
+        Initialize the scanner.
+
+        Args:
+            index_path (os.PathLike): path to the SQLite index.
+            directories (list[os.PathLike]): directories to scan.
+        """
+        self.index_path = str(index_path)
+        self.directories = [str(directory) for directory in directories]
+        self.read = 0  # number of the read files
+        self.generation = 0  # incremented when the index is changed
+        self.error: Exception = None
+        self.__thread: threading.Thread = None
+
+    def start(self) -> "LibraryScanner":
+        """
+        Start scanning.
+
+        Returns:
+            LibraryScanner: self.
+        """
+        self.__thread = threading.Thread(target=self.__scan, daemon=True)
+        self.__thread.start()
+        return self
+
+    def __scan(self) -> None:
+        """Scan the directories (in the background thread)."""
+
+        def progress(read: int) -> None:
+            self.read = read
+            self.generation += 1
+
+        try:
+            index = LibraryIndex(self.index_path)
+            try:
+                index.scan(self.directories, progress)
+            finally:
+                index.close()
+        except Exception as e:
+            print(f"Error: failed to scan the library: {e}")
+            self.error = e
+        self.generation += 1
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the directories are being scanned"""
+        return self.__thread is not None and self.__thread.is_alive()
@@ -0,0 +1,394 @@
+"""
+mesh.py
+
+Notes:
+    - The longitudinal axis of the rocket is y-axis (nose cone tip is negative), same as the drawing coordinate.
+    - z-axis points away from the viewer. The camera is placed at z = -camera_distance.
+"""
+
+import numpy as np
+import pygame as pg
+
+LIGHT_DIRECTION = np.array([-0.4, -0.5, 0.75]) / np.linalg.norm([-0.4, -0.5, 0.75])
+AMBIENT = 0.45  # ambient light intensity
+SHADES = 64  # number of the pre-computed shading levels of each face
+
+
+def rotation_matrix(roll: float, pitch: float, yaw: float) -> np.ndarray:
+    """
+    Make the rotation matrix of the rocket.
+
+    Args:
+        roll (float): roll angle around the longitudinal axis (radians).
+        pitch (float): pitch angle in the screen plane (radians).
+        yaw (float): yaw angle toward the viewer (radians).
+
+    Returns:
+        np.ndarray: 3x3 rotation matrix.
+    """
+    cr, sr = np.cos(roll), np.sin(roll)
+    cp, sp = np.cos(pitch), np.sin(pitch)
+    cy, sy = np.cos(yaw), np.sin(yaw)
+    roll_matrix = np.array([[cr, 0, sr], [0, 1, 0], [-sr, 0, cr]])
+    yaw_matrix = np.array([[1, 0, 0], [0, cy, -sy], [0, sy, cy]])
+    pitch_matrix = np.array([[cp, -sp, 0], [sp, cp, 0], [0, 0, 1]])
+    return pitch_matrix @ yaw_matrix @ roll_matrix
+
+
+class RocketMesh:
+    """
+    3D polygon mesh of the rocket.
+
+    The mesh is built once from the component geometry, and projected each frame by a single batched rotation
+    and perspective transform. Faces are padded to the same number of vertices (by repeating the last one)
+    so that all of them can be gathered as one array.
+    """
+
+    def __init__(
+        self, segments: int = 24, camera_distance: float = 3.0, outline: bool = True
+    ) -> None:
+        """
+        Initialize the mesh.
+
+        Args:
+            segments (int): number of segments around the longitudinal axis of the revolved surfaces.
+            camera_distance (float): distance from the camera to the center of the rocket in the rocket length.
+            outline (bool): whether to draw the outlines of the faces marked to be outlined (e.g. fins).
+        """
+        self.segments = segments
+        self.camera_distance = camera_distance
+        self.outline = outline
+
+        self.__vertices: list[np.ndarray] = []
+        self.__faces: list[list[int]] = []
+        self.__hints: list[np.ndarray] = []  # outward direction to orient the normals
+        self.__colors: list[tuple[int, int, int]] = []
+        self.__outlines: list[bool] = []
+        self.__n_vertices = 0
+
+        self.vertices: np.ndarray = None  # (N, 3)
+        self.faces: np.ndarray = None  # (F, K) vertex indices
+        self.face_lists: list[list[int]] = None  # vertex indices without padding
+        self.normals: np.ndarray = None  # (F, 3)
+        self.centroids: np.ndarray = None  # (F, 3)
+        self.colors: np.ndarray = None  # (F, 3)
+        self.outlines: np.ndarray = None  # (F,)
+
+        self.polygons: list = []  # projected polygons in the painter's order
+        self.polygon_colors: list = []
+        self.polygon_outlines: list = []
+
+    def __add_vertices(self, vertices: np.ndarray) -> int:
+        start = self.__n_vertices
+        self.__vertices.append(np.asarray(vertices, dtype=float))
+        self.__n_vertices += len(vertices)
+        return start
+
+    def __add_face(self, face, hint: np.ndarray, color, outline: bool) -> None:
+        self.__faces.append(list(face))
+        self.__hints.append(hint)
+        self.__colors.append(tuple(color[:3]))
+        self.__outlines.append(outline)
+
+    def add_revolution(
+        self,
+        radius: np.ndarray,
+        axial: np.ndarray,
+        color: pg.Color,
+        cap_front: bool = False,
+        cap_back: bool = False,
+    ) -> None:
+        """
+        Add the surface of revolution (nose cone, body tube).
+
+        Args:
+            radius (np.ndarray): radius of the profile (unit: m).
+            axial (np.ndarray): axial position of the profile (unit: m). must be increasing.
+            color (pg.Color): color of the surface.
+            cap_front (bool): whether to close the front end.
+            cap_back (bool): whether to close the back end.
+        """
+        angles = np.linspace(0, 2 * np.pi, self.segments, endpoint=False)
+        radius = np.asarray(radius, dtype=float)
+        axial = np.asarray(axial, dtype=float)
+        rings = np.stack(
+            [
+                radius[:, None] * np.cos(angles)[None, :],
+                np.broadcast_to(axial[:, None], (len(axial), self.segments)),
+                radius[:, None] * np.sin(angles)[None, :],
+            ],
+            axis=-1,
+        )  # (rings, segments, 3)
+        start = self.__add_vertices(rings.reshape(-1, 3))
+
+        def index(ring: int, segment: int) -> int:
+            return start + ring * self.segments + segment % self.segments
+
+        for i in range(len(axial) - 1):
+            if radius[i] == 0 and radius[i + 1] == 0:
+                continue
+            for j in range(self.segments):
+                face = [
+                    index(i, j),
+                    index(i, j + 1),
+                    index(i + 1, j + 1),
+                    index(i + 1, j),
+                ]
+                center_angle = angles[j] + np.pi / self.segments
+                hint = np.array([np.cos(center_angle), 0, np.sin(center_angle)])
+                self.__add_face(face, hint, color, False)
+
+        if cap_front and radius[0] > 0:
+            face = [index(0, j) for j in range(self.segments)]
+            self.__add_face(face, np.array([0, -1.0, 0]), color, False)
+        if cap_back and radius[-1] > 0:
+            face = [index(len(axial) - 1, j) for j in range(self.segments)]
+            self.__add_face(face, np.array([0, 1.0, 0]), color, False)
+
+    def add_fin(
+        self, points: np.ndarray, angle: float, thickness: float, color: pg.Color
+    ) -> None:
+        """
+        Add the extruded fin.
+
+        Args:
+            points (np.ndarray): outline of the fin (radial, axial) (unit: m).
+            angle (float): angle of the fin around the longitudinal axis (radians).
+            thickness (float): thickness of the fin (unit: m).
+            color (pg.Color): color of the fin.
+        """
+        points = np.asarray(points, dtype=float)
+        radial = np.array([np.cos(angle), 0, np.sin(angle)])
+        normal = np.array([-np.sin(angle), 0, np.cos(angle)])
+        axis = np.array([0, 1.0, 0])
+        outline = points[:, :1] * radial + points[:, 1:2] * axis  # (K, 3)
+
+        n = len(points)
+        start = self.__add_vertices(
+            np.concatenate(
+                [outline + normal * thickness / 2, outline - normal * thickness / 2]
+            )
+        )
+        self.__add_face(range(start, start + n), normal, color, True)
+        self.__add_face(range(start + n, start + 2 * n), -normal, color, True)
+        for i in range(n):
+            j = (i + 1) % n
+            edge = outline[j] - outline[i]
+            hint = np.cross(edge, normal)
+            if np.dot(hint, outline[i] - outline.mean(axis=0)) < 0:
+                hint = -hint
+            face = [start + i, start + j, start + n + j, start + n + i]
+            self.__add_face(face, hint, color, True)
+
+    def finalize(self) -> None:
+        """
+        Convert the added geometry to arrays. Must be called after all components are added.
+        """
+        self.vertices = np.concatenate(self.__vertices)
+        self.face_lists = self.__faces
+        k = max(len(face) for face in self.__faces)
+        self.faces = np.array(
+            [face + [face[-1]] * (k - len(face)) for face in self.__faces], dtype=int
+        )  # pad by repeating the last vertex
+        polygons = self.vertices[self.faces]  # (F, K, 3)
+        self.centroids = np.array(
+            [self.vertices[face].mean(axis=0) for face in self.__faces]
+        )
+
+        # Newell's method (the padded vertices do not contribute)
+        current = polygons
+        following = np.roll(polygons, -1, axis=1)
+        normals = np.stack(
+            [
+                np.sum(
+                    (current[:, :, 1] - following[:, :, 1])
+                    * (current[:, :, 2] + following[:, :, 2]),
+                    axis=1,
+                ),
+                np.sum(
+                    (current[:, :, 2] - following[:, :, 2])
+                    * (current[:, :, 0] + following[:, :, 0]),
+                    axis=1,
+                ),
+                np.sum(
+                    (current[:, :, 0] - following[:, :, 0])
+                    * (current[:, :, 1] + following[:, :, 1]),
+                    axis=1,
+                ),
+            ],
+            axis=1,
+        )
+        hints = np.array(self.__hints)
+        degenerate = np.linalg.norm(normals, axis=1) < 1e-15
+        normals[degenerate] = hints[degenerate]
+        normals[np.einsum("ij,ij->i", normals, hints) < 0] *= -1  # orient outward
+        self.normals = normals / np.linalg.norm(normals, axis=1, keepdims=True)
+
+        self.colors = np.array(self.__colors, dtype=float)
+        self.outlines = np.array(self.__outlines, dtype=bool)
+        self._build_shades()
+
+    def _build_shades(self) -> None:
+        """
+        Pre-compute the shaded colors of each face for the quantized light intensities,
+        so that no color object is allocated for every frame.
+        """
+        levels = AMBIENT + (1 - AMBIENT) * np.linspace(0, 1, SHADES)
+        shaded = (self.colors[:, None, :] * levels[None, :, None]).astype(int)
+        self.shaded_colors = [
+            [tuple(color) for color in face] for face in shaded.tolist()
+        ]  # (F, SHADES) color tuples
+
+    def project(
+        self, rotation: np.ndarray, scale: float, offset: np.ndarray, length: float
+    ) -> None:
+        """
+        Project the mesh onto the screen.
+
+        Args:
+            rotation (np.ndarray): 3x3 rotation matrix.
+            scale (float): scale factor from meter to pixel.
+            offset (np.ndarray): position of the center of the rocket in pixel.
+            length (float): total length of the rocket (unit: m), used for the camera distance.
+        """
+        distance = self.camera_distance * length
+        self._project_rotated(
+            self.vertices @ rotation.T,
+            self.normals @ rotation.T,
+            self.centroids @ rotation.T,
+            distance,
+            distance,
+            scale,
+            offset,
+        )
+
+    def _project_rotated(
+        self,
+        vertices: np.ndarray,
+        normals: np.ndarray,
+        centroids: np.ndarray,
+        vertex_distance: float | np.ndarray,
+        face_distance: float | np.ndarray,
+        scale: float | np.ndarray,
+        offset: np.ndarray,
+    ) -> None:
+        """
+        Apply the perspective transform, the back-face culling and the painter's sort to the rotated mesh.
+        The camera parameters can be either scalars or arrays per vertex/face (for batched meshes).
+
+        Args:
+            vertices (np.ndarray): rotated vertices (N, 3).
+            normals (np.ndarray): rotated normals (F, 3).
+            centroids (np.ndarray): rotated centroids (F, 3).
+            vertex_distance (float | np.ndarray): camera distance for each vertex.
+            face_distance (float | np.ndarray): camera distance for each face.
+            scale (float | np.ndarray): scale factor from meter to pixel for each vertex.
+            offset (np.ndarray): position of the center in pixel, (2,) or (N, 2).
+        """
+        perspective = vertex_distance / (vertex_distance + vertices[:, 2])
+        projected = vertices[:, :2] * (perspective * scale)[:, None] + offset
+
+        # from the camera (at z = -distance) to the face
+        facing = (
+            np.einsum("ij,ij->i", normals, centroids) + normals[:, 2] * face_distance
+        )
+        visible = np.flatnonzero(facing < 0)
+
+        order = visible[np.argsort(-centroids[visible, 2], kind="stable")]  # far first
+
+        levels = np.rint(
+            np.clip(-(normals[order] @ LIGHT_DIRECTION), 0, 1) * (SHADES - 1)
+        ).astype(int)
+
+        points = (
+            projected.tolist()
+        )  # gather without padding (cheaper than converting the padded array)
+        face_lists = self.face_lists
+        shaded_colors = self.shaded_colors
+        faces = order.tolist()
+        self.polygons = [[points[i] for i in face_lists[f]] for f in faces]
+        self.polygon_colors = [
+            shaded_colors[f][level] for f, level in zip(faces, levels.tolist())
+        ]
+        self.polygon_outlines = self.outlines[order].tolist()
+
+    def draw(self, screen: pg.Surface) -> None:
+        """
+        Draw the projected mesh in the painter's order.
+
+        Args:
+            screen (pg.Surface): screen to draw the mesh.
+        """
+        for polygon, color, outline in zip(
+            self.polygons, self.polygon_colors, self.polygon_outlines
+        ):
+            pg.draw.polygon(screen, color, polygon)
+            if outline and self.outline:
+                pg.draw.polygon(screen, (0, 0, 0), polygon, width=1)
+
+
+class MeshBatch(RocketMesh):
+    """
+    Several rocket meshes merged into one, so that all of them are projected by one batched array operation.
+    """
+
+    def __init__(self, meshes: list[RocketMesh]) -> None:
+        """
+        Initialize the batch.
+
+        Args:
+            meshes (list[RocketMesh]): finalized meshes to merge.
+        """
+        super().__init__(
+            meshes[0].segments,
+            meshes[0].camera_distance,
+            all(mesh.outline for mesh in meshes),
+        )
+        self.n_meshes = len(meshes)
+        self.vertices = np.concatenate([mesh.vertices for mesh in meshes])
+        self.normals = np.concatenate([mesh.normals for mesh in meshes])
+        self.centroids = np.concatenate([mesh.centroids for mesh in meshes])
+        self.colors = np.concatenate([mesh.colors for mesh in meshes])
+        self.outlines = np.concatenate([mesh.outlines for mesh in meshes])
+        self.shaded_colors = [color for mesh in meshes for color in mesh.shaded_colors]
+
+        n_vertices = [len(mesh.vertices) for mesh in meshes]
+        starts = np.cumsum([0] + n_vertices[:-1])
+        self.face_lists = [
+            [start + i for i in face]
+            for start, mesh in zip(starts.tolist(), meshes)
+            for face in mesh.face_lists
+        ]
+        self.vertex_owner = np.repeat(np.arange(len(meshes)), n_vertices)
+        self.face_owner = np.repeat(
+            np.arange(len(meshes)), [len(mesh.face_lists) for mesh in meshes]
+        )
+
+    def project(
+        self,
+        rotations: np.ndarray,
+        scales: np.ndarray,
+        offsets: np.ndarray,
+        lengths: np.ndarray,
+    ) -> None:
+        """
+        Project all meshes onto the screen.
+
+        Args:
+            rotations (np.ndarray): rotation matrices of each mesh (M, 3, 3).
+            scales (np.ndarray): scale factors from meter to pixel of each mesh (M,).
+            offsets (np.ndarray): positions of the center of each mesh in pixel (M, 2).
+            lengths (np.ndarray): total lengths of each rocket (M,), used for the camera distance.
+        """
+        distances = self.camera_distance * np.asarray(lengths, dtype=float)
+        vertex_rotations = rotations[self.vertex_owner]
+        face_rotations = rotations[self.face_owner]
+        self._project_rotated(
+            np.einsum("nij,nj->ni", vertex_rotations, self.vertices),
+            np.einsum("nij,nj->ni", face_rotations, self.normals),
+            np.einsum("nij,nj->ni", face_rotations, self.centroids),
+            distances[self.vertex_owner],
+            distances[self.face_owner],
+            np.asarray(scales, dtype=float)[self.vertex_owner],
+            np.asarray(offsets, dtype=float)[self.vertex_owner],
+        )
@@ -0,0 +1,223 @@
+"""
+model.py
+
+Notes:
+    - Compact data model of a simulated rocket, separated from the OpenRocket objects and the drawing
+      classes, to ship the structure and the result between processes (workers, caches).
+    - Each kind of data is one contiguous array: the fin outlines of all the fin sets are concatenated
+      with the offsets of each fin set, and the timeseries columns are the rows of one 2-D array
+      (padded with NaN). Pickling copies each array once, and the rehydrated columns are views of the
+      unpickled array.
+    - The classes have `__slots__`, so that the pickles hold only the values.
+"""
+
+from dataclasses import dataclass
+from typing import Iterator
+
+import numpy as np
+from orhelper import FlightDataType
+
+from visualizer.columns import FlightColumns
+from visualizer.events import FlightEventIndex
+from visualizer.simulation import SimulationResult
+
+
+@dataclass(slots=True, eq=False)
+class RocketGeometry:
+    """
+    Rocket structure for drawing (unit: m, the origin is the center of the rocket).
+
+    Attributes:
+        length (float): total length of the rocket.
+        radius (float): radius of the last body tube.
+        dry_mass (float): dry mass of the rocket (unit: kg).
+        nose_axial (np.ndarray): axial position of the nose cone profile (N,).
+        nose_radius (np.ndarray): radius of the nose cone profile (N,).
+        body_axial (np.ndarray): axial position of both ends of each body tube (B, 2).
+        body_radius (np.ndarray): radius of each body tube (B,).
+        fin_body (np.ndarray): index of the body tube of each fin set (F,).
+        fin_count (np.ndarray): number of the fins of each fin set (F,).
+        fin_thickness (np.ndarray): thickness of the fins of each fin set (F,).
+        fin_offsets (np.ndarray): start of the outline of each fin set in fin_points, and the end (F + 1,).
+        fin_points (np.ndarray): outlines of all the fin sets in the drawing coordinate (P, 2).
+        fin_shapes (np.ndarray): outlines of all the fin sets in the OpenRocket coordinate (P, 2).
+    """
+
+    length: float
+    radius: float
+    dry_mass: float
+    nose_axial: np.ndarray
+    nose_radius: np.ndarray
+    body_axial: np.ndarray
+    body_radius: np.ndarray
+    fin_body: np.ndarray
+    fin_count: np.ndarray
+    fin_thickness: np.ndarray
+    fin_offsets: np.ndarray
+    fin_points: np.ndarray
+    fin_shapes: np.ndarray
+
+    @classmethod
+    def from_parts(
+        cls, length: float, radius: float, dry_mass: float, nose, bodys: list
+    ) -> "RocketGeometry":
+        """
+        Pack the structure of the drawing classes.
+
+        Args:
+            length (float): total length of the rocket.
+            radius (float): radius of the last body tube.
+            dry_mass (float): dry mass of the rocket (unit: kg).
+            nose (Nose): the nose cone.
+            bodys (list[Body]): the body tubes with their fin sets.
+
+        Returns:
+            RocketGeometry: the packed structure.
+        """
+        fins = [(i, fin) for i, body in enumerate(bodys) for fin in body.fins]
+        sizes = [len(fin.points) for _, fin in fins]
+        return cls(
+            float(length),
+            float(radius),
+            float(dry_mass),
+            np.array(nose.axial, dtype=float),
+            np.array(nose.radius, dtype=float),
+            np.array([body.axial for body in bodys], dtype=float).reshape(-1, 2),
+            np.array([body.radius for body in bodys], dtype=float),
+            np.array([i for i, _ in fins], dtype=np.int64),
+            np.array([fin.n_fin for _, fin in fins], dtype=np.int64),
+            np.array([fin.thickness for _, fin in fins], dtype=float),
+            np.concatenate([[0], np.cumsum(sizes, dtype=np.int64)]),
+            np.array([p for _, fin in fins for p in fin.points], dtype=float).reshape(
+                -1, 2
+            ),
+            np.array([p for _, fin in fins for p in fin.shape], dtype=float).reshape(
+                -1, 2
+            ),
+        )
+
+    def fins(self) -> Iterator[tuple[int, np.ndarray, np.ndarray, int, float]]:
+        """
+        Iterate the fin sets.
+
+        Returns:
+            Iterator: body tube index, outline (drawing coordinate), outline (OpenRocket coordinate),
+                number of the fins and thickness of each fin set. the outlines are views of the packed arrays.
+        """
+        for i in range(len(self.fin_count)):
+            start, end = self.fin_offsets[i], self.fin_offsets[i + 1]
+            yield (
+                int(self.fin_body[i]),
+                self.fin_points[start:end],
+                self.fin_shapes[start:end],
+                int(self.fin_count[i]),
+                float(self.fin_thickness[i]),
+            )
+
+
+@dataclass(slots=True, eq=False)
+class FlightRecord:
+    """
+    Simulation result with the timeseries in one contiguous array.
+
+    Attributes:
+        names (tuple[str, ...]): FlightDataType name of each column.
+        lengths (np.ndarray): number of the samples of each column.
+        columns (np.ndarray): columns in rows, padded with NaN to the longest one (C, N).
+        max_altitude (float): apogee (unit: m).
+        max_velocity (float): maximum velocity (unit: m/s).
+        flight_time (float): flight time (unit: s).
+        launch_clear_velocity (float): velocity at the launch rod clearance (unit: m/s).
+        time_step (float): time step used for the simulation (unit: s).
+        elapsed (float): wall-clock time of the simulation (unit: s).
+        events (FlightEventIndex | None): flight events mapped to the samples.
+    """
+
+    names: tuple[str, ...]
+    lengths: np.ndarray
+    columns: np.ndarray
+    max_altitude: float
+    max_velocity: float
+    flight_time: float
+    launch_clear_velocity: float
+    time_step: float
+    elapsed: float
+    events: FlightEventIndex | None = None
+
+    @classmethod
+    def from_result(cls, result: SimulationResult) -> "FlightRecord":
+        """
+        Pack the OpenRocket columns of the result (derived columns are computed again when used).
+
+        Args:
+            result (SimulationResult): the simulation result.
+
+        Returns:
+            FlightRecord: the packed result.
+        """
+        items = [
+            (key.name, np.asarray(value, dtype=float).ravel())
+            for key, value in result.flight_data.items()
+            if isinstance(key, FlightDataType)
+        ]
+        lengths = np.array([len(value) for _, value in items], dtype=np.int64)
+        columns = np.full((len(items), int(lengths.max(initial=0))), np.nan)
+        for row, (_, value) in zip(columns, items):
+            row[: len(value)] = value
+        return cls(
+            tuple(name for name, _ in items),
+            lengths,
+            columns,
+            float(result.max_altitude),
+            float(result.max_velocity),
+            float(result.flight_time),
+            float(result.launch_clear_velocity),
+            float(result.time_step),
+            float(result.elapsed),
+            result.events,
+        )
+
+    def to_result(self) -> SimulationResult:
+        """
+        Rehydrate the simulation result. The columns are views of the packed array (not copied).
+
+        Returns:
+            SimulationResult: the result without the simulation object (no more columns can be fetched).
+        """
+        return SimulationResult(
+            FlightColumns(
+                {
+                    FlightDataType[name]: row[:length]
+                    for name, length, row in zip(self.names, self.lengths, self.columns)
+                }
+            ),
+            self.max_altitude,
+            self.max_velocity,
+            self.flight_time,
+            self.launch_clear_velocity,
+            self.time_step,
+            self.elapsed,
+            events=self.events,
+        )
+
+
+@dataclass(slots=True, eq=False)
+class RocketData:
+    """
+    Structure and simulation result of a rocket (see `Rocket.to_data` and `Rocket.apply_data`).
+
+    Attributes:
+        geometry (RocketGeometry): rocket structure.
+        flight (FlightRecord | None): simulation result. None if not simulated.
+    """
+
+    geometry: RocketGeometry
+    flight: FlightRecord | None = None
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the arrays (unit: bytes)"""
+        arrays = [getattr(self.geometry, name) for name in RocketGeometry.__slots__]
+        if self.flight is not None:
+            arrays += [self.flight.lengths, self.flight.columns]
+        return sum(array.nbytes for array in arrays if isinstance(array, np.ndarray))
@@ -0,0 +1,91 @@
+"""openrocket.py"""
+
+import atexit
+import glob
+import os
+import threading
+from pathlib import Path
+
+import jpype
+import orhelper
+import requests
+
+
+class OpenRocket:
+    """
+    OpenRocket session manager.
+
+    The JVM can be started only once per process, so that the OpenRocket instance is shared by all rockets
+    and kept alive until the application exits. This allows re-running simulations on the loaded documents.
+    """
+
+    __instance: orhelper.OpenRocketInstance = None
+    __helper: orhelper.Helper = None
+    __lock = threading.Lock()
+
+    @classmethod
+    def find_jar(cls, url: str) -> str:
+        """
+        Find or download the jar file for OpenRocket.
+
+        Args:
+            url (str): download URL used if the jar file is not found.
+
+        Returns:
+            str: path to the jar file.
+        """
+        jar_path = os.environ.get("CLASSPATH")
+        if jar_path is not None and Path(jar_path).exists():
+            return jar_path
+
+        jar_files = glob.glob("*.jar")
+        if jar_files:
+            return jar_files[0]
+
+        print("OpenRocket jar file not found. Downloading...")
+        response = requests.get(url)
+        jar_path = url[url.rfind("/") + 1 :]
+        with open(jar_path, "wb") as f:
+            f.write(response.content)
+        print("Done.")
+        return jar_path
+
+    @classmethod
+    def get_helper(cls, url: str) -> orhelper.Helper:
+        """
+        Get the OpenRocket helper. The JVM is started at the first call.
+
+        Args:
+            url (str): download URL used if the jar file is not found.
+
+        Returns:
+            orhelper.Helper: the helper object.
+        """
+        with cls.__lock:
+            if cls.__helper is None:
+                cls.__instance = orhelper.OpenRocketInstance(cls.find_jar(url))
+                cls.__instance.__enter__()  # start JVM
+                cls.__helper = orhelper.Helper(cls.__instance)
+            return cls.__helper
+
+    @classmethod
+    def attach_thread(cls) -> None:
+        """
+        Attach the current (worker) thread to the JVM as a daemon, not to block the JVM shutdown.
+        Must be called after the JVM is started.
+        """
+        jpype.java.lang.Thread.attachAsDaemon()
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """
+        Shutdown the JVM. Once shut down, the JVM cannot be started again in the same process.
+        """
+        with cls.__lock:
+            if cls.__instance is not None and jpype.isJVMStarted():
+                cls.__instance.__exit__(None, None, None)
+            cls.__instance = None
+            cls.__helper = None
+
+
+atexit.register(OpenRocket.shutdown)  # shutdown the JVM when the application exits
@@ -0,0 +1,447 @@
+"""
+optimizer.py
+
+Search of the launch rod angle and length for a target apogee.
+
+Usage:
+    python -m visualizer.optimizer simple.ork --apogee 100 --max-distance 50 --wind 0 2 4 --cache optimizer.json
+
+Notes:
+    - The search is a parallel multi-section bracket search: a grid of the candidates in the bracket is
+      evaluated at once, and the bracket is narrowed to the neighbors of the best candidate, until the
+      apogee is within the tolerance or the bracket is as narrow as the resolution.
+    - A candidate is evaluated in all the wind scenarios. Its apogee is the mean over the scenarios,
+      and its landing distance is the worst one.
+    - Every evaluated point is memoized by its simulation settings, which are rounded to the resolution,
+      so that the narrowed grids and the repeated queries reuse the simulations. The memo can be saved
+      to a JSON file for the ork file (invalidated when the file is modified).
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from visualizer.columns import DISTANCE_FROM_PAD
+from visualizer.openrocket import OpenRocket
+from visualizer.rocket import Rocket
+from visualizer.settings import Settings, SimulationSettings
+
+ANGLE_RESOLUTION = 0.01  # unit: degrees
+LENGTH_RESOLUTION = 0.001  # unit: m
+CACHE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Evaluation:
+    """
+    Result of a simulation evaluated by the optimizer.
+
+    Attributes:
+        apogee (float): apogee (unit: m).
+        landing_distance (float): distance of the landing point from the pad (unit: m).
+        flight_time (float): flight time (unit: s).
+    """
+
+    apogee: float
+    landing_distance: float
+    flight_time: float
+
+
+@dataclass(frozen=True)
+class Objective:
+    """
+    Objective of the search.
+
+    Attributes:
+        apogee (float | None): target apogee (unit: m). the apogee is maximized if None.
+        max_distance (float | None): maximum landing distance from the pad (unit: m). not constrained if None.
+        tolerance (float): acceptable difference from the target apogee (unit: m).
+        penalty (float): cost of the landing distance over the maximum (unit: m of apogee per m).
+    """
+
+    apogee: float | None = None
+    max_distance: float | None = None
+    tolerance: float = 0.5
+    penalty: float = 10.0
+
+    def cost(self, apogee: float, landing_distance: float) -> float:
+        """Cost of a candidate (lower is better)"""
+        cost = -apogee if self.apogee is None else abs(apogee - self.apogee)
+        if self.max_distance is not None and landing_distance > self.max_distance:
+            cost += self.penalty * (landing_distance - self.max_distance)
+        return cost
+
+    def is_satisfied(self, apogee: float, landing_distance: float) -> bool:
+        """Whether a candidate meets the target (if any) and the constraint"""
+        if self.max_distance is not None and landing_distance > self.max_distance:
+            return False
+        return self.apogee is None or abs(apogee - self.apogee) <= self.tolerance
+
+
+@dataclass
+class Candidate:
+    """
+    Launch rod setting evaluated in all the wind scenarios.
+
+    Attributes:
+        angle (float): launch rod angle (unit: degrees, the value of `SimulationSettings.launch_rod_angle`).
+        length (float): launch rod length (unit: m).
+        apogee (float): mean apogee over the wind scenarios (unit: m).
+        landing_distance (float): maximum landing distance over the wind scenarios (unit: m).
+        cost (float): cost by the objective.
+    """
+
+    angle: float
+    length: float
+    apogee: float
+    landing_distance: float
+    cost: float
+
+
+@dataclass
+class Iteration:
+    """
+    Step of the convergence history.
+
+    Attributes:
+        angle_range (tuple[float, float]): bracket of the angle (unit: degrees).
+        length_range (tuple[float, float]): bracket of the length (unit: m).
+        best (Candidate): best candidate so far.
+        simulations (int): simulations run in the iteration.
+        cache_hits (int): evaluations taken from the memo in the iteration.
+        elapsed (float): wall-clock time of the iteration (unit: s).
+    """
+
+    angle_range: tuple[float, float]
+    length_range: tuple[float, float]
+    best: Candidate
+    simulations: int
+    cache_hits: int
+    elapsed: float
+
+
+@dataclass
+class OptimizationResult:
+    """
+    Result of the search.
+
+    Attributes:
+        best (Candidate): best candidate.
+        settings (SimulationSettings): simulation settings of the best candidate (with the base wind).
+        satisfied (bool): whether the best candidate meets the objective.
+        history (list[Iteration]): convergence history.
+    """
+
+    best: Candidate
+    settings: SimulationSettings
+    satisfied: bool
+    history: list[Iteration] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """Convert to the machine-readable result"""
+        return {
+            "best": asdict(self.best),
+            "settings": asdict(self.settings),
+            "satisfied": self.satisfied,
+            "history": [asdict(iteration) for iteration in self.history],
+        }
+
+
+def grid(low: float, high: float, points: int, resolution: float) -> list[float]:
+    """
+    Make the grid of the bracket, rounded to the resolution.
+
+    Args:
+        low (float): lower end of the bracket.
+        high (float): upper end of the bracket.
+        points (int): number of the points (fewer if the bracket is narrow).
+        resolution (float): resolution of the values.
+
+    Returns:
+        list[float]: the values in ascending order without duplicates.
+    """
+    values = np.round(np.linspace(low, high, max(points, 1)) / resolution) * resolution
+    return sorted(set(np.round(values, 6).tolist()))
+
+
+def narrow(values: list[float], index: int) -> tuple[float, float]:
+    """Bracket of the neighbors of the value at the index"""
+    return values[max(index - 1, 0)], values[min(index + 1, len(values) - 1)]
+
+
+class LaunchOptimizer:
+    """
+    Optimizer of the launch rod angle and length with memoized parallel evaluations.
+    """
+
+    def __init__(
+        self,
+        evaluate: Callable[[SimulationSettings], Evaluation],
+        max_workers: int | None = None,
+        initializer: Callable[[], None] | None = None,
+    ) -> None:
+        """
+        Initialize the optimizer.
+
+        Args:
+            evaluate (Callable[[SimulationSettings], Evaluation]): runs a simulation (called concurrently).
+            max_workers (int | None): number of the concurrent simulations. the number of the CPUs if None.
+            initializer (Callable[[], None] | None): called in each worker thread (e.g. to attach it to the JVM).
+        """
+        self.evaluate = evaluate
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.initializer = initializer
+        self.cache: dict[SimulationSettings, Evaluation] = {}
+        self.simulations = 0  # simulations run (not from the memo)
+        self.cache_hits = 0
+
+    def evaluate_many(self, settings: list[SimulationSettings]) -> list[Evaluation]:
+        """
+        Evaluate the settings, running the ones not in the memo concurrently.
+
+        Args:
+            settings (list[SimulationSettings]): settings to evaluate.
+
+        Returns:
+            list[Evaluation]: evaluation of each settings.
+        """
+        missing = list(dict.fromkeys(s for s in settings if s not in self.cache))
+        self.cache_hits += len(settings) - len(missing)
+        if missing:
+            with ThreadPoolExecutor(
+                max_workers=min(len(missing), self.max_workers),
+                initializer=self.initializer,
+            ) as executor:
+                evaluations = executor.map(self.evaluate, missing)
+                self.cache.update(zip(missing, evaluations))
+            self.simulations += len(missing)
+        return [self.cache[s] for s in settings]
+
+    def optimize(
+        self,
+        objective: Objective,
+        base: SimulationSettings,
+        angle_range: tuple[float, float] = (60.0, 90.0),
+        length_range: tuple[float, float] | None = None,
+        winds: list[float] | None = None,
+        points: int = 5,
+        max_iterations: int = 20,
+    ) -> OptimizationResult:
+        """
+        Search the launch rod angle and length for the objective.
+
+        Args:
+            objective (Objective): target apogee and landing distance constraint.
+            base (SimulationSettings): settings of the other parameters.
+            angle_range (tuple[float, float]): initial bracket of the angle (unit: degrees).
+            length_range (tuple[float, float] | None): initial bracket of the length (unit: m). fixed to the base if None.
+            winds (list[float] | None): wind speeds of the scenarios (unit: m/s). the base wind only if None.
+            points (int): grid points of each parameter in an iteration.
+            max_iterations (int): maximum number of the iterations.
+
+        Returns:
+            OptimizationResult: the best candidate and the convergence history.
+        """
+        if length_range is None:
+            length_range = (base.launch_rod_length, base.launch_rod_length)
+        winds = [base.wind_speed] if not winds else list(winds)
+        points = max(points, 3)  # the bracket must narrow around the best point
+        best: Candidate = None
+        history: list[Iteration] = []
+
+        for _ in range(max_iterations):
+            start = time.perf_counter()
+            simulations, cache_hits = self.simulations, self.cache_hits
+            angles = grid(*angle_range, points, ANGLE_RESOLUTION)
+            lengths = grid(*length_range, points, LENGTH_RESOLUTION)
+            pairs = [(angle, length) for angle in angles for length in lengths]
+            evaluations = self.evaluate_many(
+                [
+                    replace(
+                        base,
+                        launch_rod_angle=angle,
+                        launch_rod_length=length,
+                        wind_speed=wind,
+                    )
+                    for angle, length in pairs
+                    for wind in winds
+                ]
+            )
+
+            candidates = []
+            for i, (angle, length) in enumerate(pairs):
+                scenarios = evaluations[i * len(winds) : (i + 1) * len(winds)]
+                apogee = float(np.mean([e.apogee for e in scenarios]))
+                distance = max(e.landing_distance for e in scenarios)
+                cost = objective.cost(apogee, distance)
+                candidates.append(Candidate(angle, length, apogee, distance, cost))
+            index = min(range(len(candidates)), key=lambda i: candidates[i].cost)
+            if best is None or candidates[index].cost < best.cost:
+                best = candidates[index]
+
+            history.append(
+                Iteration(
+                    angle_range,
+                    length_range,
+                    best,
+                    self.simulations - simulations,
+                    self.cache_hits - cache_hits,
+                    time.perf_counter() - start,
+                )
+            )
+            if objective.apogee is not None and objective.is_satisfied(
+                best.apogee, best.landing_distance
+            ):
+                break
+            bracket = (angle_range, length_range)
+            angle_range = narrow(angles, index // len(lengths))
+            length_range = narrow(lengths, index % len(lengths))
+            if (angle_range, length_range) == bracket:
+                break  # narrowed down to the resolution
+
+        return OptimizationResult(
+            best,
+            replace(base, launch_rod_angle=best.angle, launch_rod_length=best.length),
+            objective.is_satisfied(best.apogee, best.landing_distance),
+            history,
+        )
+
+    @classmethod
+    def cache_stamp(cls, ork_file: os.PathLike) -> list:
+        """Stamp of the ork file: the saved memo is discarded when the file is changed"""
+        stat = os.stat(ork_file)
+        return [os.path.abspath(ork_file), stat.st_size, stat.st_mtime_ns]
+
+    def load_cache(self, path: os.PathLike, ork_file: os.PathLike) -> None:
+        """
+        Load the memo saved for the ork file (if any).
+
+        Args:
+            path (os.PathLike): path to the JSON file.
+            ork_file (os.PathLike): the ork file of the evaluations.
+        """
+        if not Path(path).exists():
+            return
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if data.get("version") != CACHE_VERSION:
+            return
+        evaluations = data.get("files", {}).get(str(Path(ork_file).resolve()))
+        if evaluations is None or evaluations["stamp"] != self.cache_stamp(ork_file):
+            return
+        for item in evaluations["evaluations"]:
+            self.cache[SimulationSettings(**item["settings"])] = Evaluation(
+                **item["evaluation"]
+            )
+
+    def save_cache(self, path: os.PathLike, ork_file: os.PathLike) -> None:
+        """
+        Save the memo for the ork file, keeping the ones of the other files in the JSON file.
+
+        Args:
+            path (os.PathLike): path to the JSON file.
+            ork_file (os.PathLike): the ork file of the evaluations.
+        """
+        data = {"version": CACHE_VERSION, "files": {}}
+        if Path(path).exists():
+            saved = json.loads(Path(path).read_text(encoding="utf-8"))
+            if saved.get("version") == CACHE_VERSION:
+                data = saved
+        data["files"][str(Path(ork_file).resolve())] = {
+            "stamp": self.cache_stamp(ork_file),
+            "evaluations": [
+                {"settings": asdict(settings), "evaluation": asdict(evaluation)}
+                for settings, evaluation in self.cache.items()
+            ],
+        }
+        Path(path).write_text(json.dumps(data), encoding="utf-8")
+
+
+def rocket_evaluator(rocket: Rocket) -> Callable[[SimulationSettings], Evaluation]:
+    """
+    Make the evaluation function of the loaded rocket.
+
+    Args:
+        rocket (Rocket): the rocket with the ork file loaded.
+
+    Returns:
+        Callable[[SimulationSettings], Evaluation]: runs a simulation of the rocket (thread-safe).
+    """
+
+    def evaluate(settings: SimulationSettings) -> Evaluation:
+        result = rocket.evaluate(settings)
+        distance = np.nan_to_num(result.flight_data[DISTANCE_FROM_PAD])
+        return Evaluation(result.max_altitude, float(distance[-1]), result.flight_time)
+
+    return evaluate
+
+
+def print_report(result: OptimizationResult) -> None:
+    """
+    Print the convergence history and the best settings.
+
+    Args:
+        result (OptimizationResult): result of the search.
+    """
+    print("iter  angle[deg]       length[m]      sims  hits  apogee[m]  landing[m]")
+    for i, step in enumerate(result.history):
+        print(
+            f"{i:4d}  {step.angle_range[0]:6.2f}-{step.angle_range[1]:6.2f}  "
+            f"{step.length_range[0]:5.3f}-{step.length_range[1]:5.3f}  "
+            f"{step.simulations:4d}  {step.cache_hits:4d}  "
+            f"{step.best.apogee:9.2f}  {step.best.landing_distance:10.2f}"
+        )
+    status = "satisfied" if result.satisfied else "best effort"
+    print(f"Best ({status}):")
+    print("[simulation]")
+    print(f"launchRod.angle={result.settings.launch_rod_angle:g}")
+    print(f"launchRod.length={result.settings.launch_rod_length:g}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("ork_file", type=Path)
+    parser.add_argument("--apogee", type=float, help="target apogee (max if omitted)")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="of the apogee")
+    parser.add_argument("--max-distance", type=float, help="maximum landing distance")
+    parser.add_argument("--angle", type=float, nargs=2, default=(60.0, 90.0))
+    parser.add_argument("--length", type=float, nargs=2, help="fixed if omitted")
+    parser.add_argument("--wind", type=float, nargs="+", help="wind speed scenarios")
+    parser.add_argument("--points", type=int, default=5, help="grid points per axis")
+    parser.add_argument("--workers", type=int, help="concurrent simulations")
+    parser.add_argument("--cache", type=Path, help="JSON file of the memo")
+    parser.add_argument("--output", type=Path, help="JSON file of the result")
+    args = parser.parse_args(argv)
+
+    settings = Settings.load()
+    rocket = Rocket(args.ork_file, settings)
+    rocket.load()
+    optimizer = LaunchOptimizer(
+        rocket_evaluator(rocket), args.workers, OpenRocket.attach_thread
+    )
+    if args.cache is not None:
+        optimizer.load_cache(args.cache, args.ork_file)
+    result = optimizer.optimize(
+        Objective(args.apogee, args.max_distance, args.tolerance),
+        settings.simulation,
+        tuple(args.angle),
+        None if args.length is None else tuple(args.length),
+        args.wind,
+        args.points,
+    )
+    if args.cache is not None:
+        optimizer.save_cache(args.cache, args.ork_file)
+    print_report(result)
+    if args.output is not None:
+        args.output.write_text(json.dumps(result.to_dict(), indent=2), encoding="utf-8")
+        print(f"Saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
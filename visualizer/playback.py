@@ -0,0 +1,141 @@
+"""
+playback.py
+
+Notes:
+    - The flight is viewed from the south: screen right is east (position x), screen up is altitude,
+      and north (position y) points away from the viewer.
+"""
+
+import numpy as np
+from orhelper import FlightDataType
+
+from visualizer.mesh import rotation_matrix
+
+
+def attitude(theta: np.ndarray, phi: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Convert the orientation of OpenRocket to the drawing angles.
+
+    Args:
+        theta (np.ndarray): vertical orientation (zenith) of OpenRocket, elevation from the horizon (radians).
+        phi (np.ndarray): lateral orientation (azimuth) of OpenRocket (radians).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: pitch (tilt in the screen plane) and yaw (tilt toward the viewer) in degrees.
+    """
+    east = np.cos(theta) * np.cos(phi)
+    north = np.cos(theta) * np.sin(phi)
+    up = np.sin(theta)
+    pitch = np.degrees(np.arctan2(east, up))
+    yaw = -np.degrees(np.arcsin(np.clip(north, -1, 1)))
+    return pitch, yaw
+
+
+class Timeline:
+    """
+    Time index of the flight with keyframes of the derived render state.
+
+    The keyframes (position, attitude angles and view scale) are computed at load at a fixed interval,
+    so that a seek is a binary search plus one interpolation regardless of the number of samples.
+    The rotation matrix is rebuilt from the interpolated angles, so that it stays orthonormal.
+    """
+
+    def __init__(
+        self,
+        flight_data: dict[FlightDataType, np.ndarray],
+        interval: float = 1 / 60,
+        roll: float = 30.0,
+        min_view_height: float = 5.0,
+        view_margin: float = 1.5,
+    ) -> None:
+        """
+        Initialize the timeline.
+
+        Args:
+            flight_data (dict[FlightDataType, np.ndarray]): timeseries data including TYPE_TIME, TYPE_ALTITUDE,
+                TYPE_POSITION_X, TYPE_ORIENTATION_THETA and TYPE_ORIENTATION_PHI.
+            interval (float): interval of the keyframes (unit: s).
+            roll (float): roll angle of the rocket (degrees), since the roll angle is not in the flight data.
+            min_view_height (float): minimum height of the view around the rocket (unit: m).
+            view_margin (float): ratio of the view height to the altitude.
+        """
+        time = np.asarray(flight_data[FlightDataType.TYPE_TIME], dtype=float)
+        self.sample_order = np.argsort(time, kind="stable")  # sorted time index
+        self.time = time[self.sample_order]
+        self.start = float(self.time[0])
+        self.end = float(self.time[-1])
+
+        n_keyframes = max(int(np.ceil((self.end - self.start) / interval)) + 1, 2)
+        self.keyframe_time = np.linspace(self.start, self.end, n_keyframes)
+
+        def resample(data_type: FlightDataType) -> np.ndarray:
+            values = np.nan_to_num(np.asarray(flight_data[data_type], dtype=float))
+            return np.interp(self.keyframe_time, self.time, values[self.sample_order])
+
+        altitude = resample(FlightDataType.TYPE_ALTITUDE)
+        pitch, yaw = attitude(
+            resample(FlightDataType.TYPE_ORIENTATION_THETA),
+            resample(FlightDataType.TYPE_ORIENTATION_PHI),
+        )
+        self.positions = np.stack(
+            [resample(FlightDataType.TYPE_POSITION_X), altitude], axis=1
+        )  # (east, altitude)
+        self.roll = np.radians(roll)
+        # (pitch, yaw), pitch unwrapped not to spin around at +-180 degrees
+        self.angles = np.stack([np.unwrap(np.radians(pitch)), np.radians(yaw)], 1)
+        self.scales = 1 / np.maximum(
+            min_view_height, altitude * view_margin
+        )  # 1 / height of the view
+
+    @property
+    def duration(self) -> float:
+        """Duration of the flight (unit: s)"""
+        return self.end - self.start
+
+    def sample_index(self, t: float) -> int:
+        """
+        Get the index of the last sample of the flight data at or before the given time.
+
+        Args:
+            t (float): time (unit: s).
+
+        Returns:
+            int: index of the sample in the original flight data.
+        """
+        index = np.searchsorted(self.time, t, side="right") - 1
+        return int(self.sample_order[np.clip(index, 0, len(self.time) - 1)])
+
+    def state_at(self, t: float) -> tuple[np.ndarray, np.ndarray, float]:
+        """
+        Get the render state at the given time.
+
+        Args:
+            t (float): time (unit: s).
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, float]: position (east, altitude)[m], 3x3 rotation matrix and the view scale[1/m].
+        """
+        keyframe_time = self.keyframe_time
+        index = int(
+            np.clip(
+                np.searchsorted(keyframe_time, t, side="right") - 1,
+                0,
+                len(keyframe_time) - 2,
+            )
+        )
+        ratio = (t - keyframe_time[index]) / (
+            keyframe_time[index + 1] - keyframe_time[index]
+        )
+        ratio = min(max(ratio, 0.0), 1.0)
+        position = (
+            self.positions[index]
+            + (self.positions[index + 1] - self.positions[index]) * ratio
+        )
+        pitch, yaw = (
+            self.angles[index] + (self.angles[index + 1] - self.angles[index]) * ratio
+        )
+        rotation = rotation_matrix(self.roll, pitch, yaw)
+        scale = (
+            self.scales[index] + (self.scales[index + 1] - self.scales[index]) * ratio
+        )
+        return position, rotation, float(scale)
@@ -0,0 +1,185 @@
+"""
+profiler.py
+
+Notes:
+    - Instrumentation mode of the simulation pipeline (JVM start, ork loading, structure extraction,
+      simulation and timeseries transfer). Not used in the normal run.
+    - Calls into Java are counted by wrapping the Java objects in `CallCountingProxy`: every method call
+      and field access on a wrapped object (and on the Java objects it returns) is one call.
+      Only the objects handed to `PipelineProfiler.wrap` are counted, e.g. the rocket in the structure extraction.
+      Proxies must not be passed back to Java.
+"""
+
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable
+
+import jpype
+
+# values returned as is (incl. boxed Java numbers)
+PLAIN_TYPES = (bool, int, float, str, bytes)
+
+
+def is_java_object(value: Any) -> bool:
+    """Whether the value is a Java object to be wrapped (not a number or a string)"""
+    return isinstance(value, jpype.JObject) and not isinstance(value, PLAIN_TYPES)
+
+
+class CallCountingProxy:
+    """
+    Proxy of a Java object counting the calls through it. The proxy class has the name of the wrapped type,
+    so that the checks by the type name (e.g. "FinSet") work as on the wrapped object.
+    """
+
+    __slots__ = ("_target", "_profiler")
+    __classes: dict[type, type] = {}
+
+    def __new__(cls, target: Any, profiler: "PipelineProfiler"):
+        proxy_class = cls.__classes.get(type(target))
+        if proxy_class is None:
+            proxy_class = type(type(target).__name__, (cls,), {"__slots__": ()})
+            cls.__classes[type(target)] = proxy_class
+        proxy = object.__new__(proxy_class)
+        object.__setattr__(proxy, "_target", target)
+        object.__setattr__(proxy, "_profiler", profiler)
+        return proxy
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._target, name)
+        if not callable(value):
+            return self._profiler.returned(name, value)  # field access
+
+        def call(*args, **kwargs):
+            return self._profiler.returned(name, value(*args, **kwargs))
+
+        return call
+
+    def __iter__(self):
+        for item in self._target:
+            yield self._profiler.returned("__iter__", item)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._profiler.returned("__getitem__", self._target[key])
+
+    def __len__(self) -> int:
+        return self._profiler.returned("__len__", len(self._target))
+
+    def __str__(self) -> str:
+        return str(self._target)
+
+    def __repr__(self) -> str:
+        return f"CallCountingProxy({self._target!r})"
+
+
+class PipelineProfiler:
+    """
+    Phase timer and Java call counter of the simulation pipeline.
+    Wrap each phase with `phase`, e.g. `with profiler.phase("load_doc"): orh.load_doc(path)`.
+    Nested phases are timed separately (the outer phase includes the inner ones).
+    """
+
+    def __init__(self, is_java: Callable[[Any], bool] = is_java_object) -> None:
+        """
+        Initialize the profiler.
+
+        Args:
+            is_java (Callable[[Any], bool]): whether a returned value is a Java object to be wrapped.
+        """
+        self.is_java = is_java
+        self.times: dict[str, float] = {}  # total time of each phase (unit: s)
+        self.calls: Counter = Counter()  # Java calls of each phase
+        self.methods: Counter = Counter()  # Java calls of each method name
+        self.counts: Counter = Counter()  # other counts (e.g. transferred values)
+        self.__stack: list[str] = []
+
+    @property
+    def current(self) -> str:
+        """Name of the innermost phase ("" outside the phases)"""
+        return self.__stack[-1] if self.__stack else ""
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Time the phase and attribute the Java calls in it.
+
+        Args:
+            name (str): name of the phase.
+        """
+        self.__stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.times[name] = self.times.get(name, 0.0) + time.perf_counter() - start
+            self.__stack.pop()
+
+    def wrap(self, value: Any) -> Any:
+        """
+        Wrap the Java object to count the calls through it.
+
+        Args:
+            value (Any): the Java object.
+
+        Returns:
+            Any: the proxy of the object.
+        """
+        return CallCountingProxy(value, self)
+
+    def returned(self, name: str, value: Any) -> Any:
+        """
+        Count a Java call and wrap its result if it is a Java object (called by the proxies).
+
+        Args:
+            name (str): name of the called method or field.
+            value (Any): result of the call.
+
+        Returns:
+            Any: the result, wrapped if it is a Java object.
+        """
+        self.calls[self.current] += 1
+        self.methods[name] += 1
+        if isinstance(value, CallCountingProxy) or not self.is_java(value):
+            return value
+        return self.wrap(value)
+
+    def count(self, name: str, n: int = 1) -> None:
+        """
+        Add to a count which is not a call through the proxies (e.g. the transferred values).
+
+        Args:
+            name (str): name of the count.
+            n (int): number to add.
+        """
+        self.counts[name] += n
+
+    def summary(self, top: int = 10) -> dict:
+        """
+        Make the machine-readable summary.
+
+        Args:
+            top (int): number of the most called methods to report.
+
+        Returns:
+            dict: times and counts of each phase.
+        """
+        return {
+            "phases_s": dict(self.times),
+            "java_calls": {name: count for name, count in self.calls.items() if name},
+            "top_methods": dict(self.methods.most_common(top)),
+            "counts": dict(self.counts),
+        }
+
+
+def profile_phase(profiler: PipelineProfiler | None, name: str):
+    """
+    Time the phase with the profiler, or do nothing if the profiler is None.
+
+    Args:
+        profiler (PipelineProfiler | None): the profiler.
+        name (str): name of the phase.
+
+    Returns:
+        context manager of the phase.
+    """
+    return nullcontext() if profiler is None else profiler.phase(name)
@@ -0,0 +1,165 @@
+"""
+recording.py
+
+Notes:
+    - A recording keeps the extracted rocket structure and the simulation result of an ork file,
+      so that the rocket can be replayed without Java (e.g. for the benchmarks).
+    - The file is a numpy .npz archive: the structure and the summary are stored as JSON,
+      and each flight data column as an array named "flight_data.<FlightDataType name>".
+"""
+
+import json
+import os
+from dataclasses import asdict
+
+import numpy as np
+from orhelper import FlightDataType
+
+from visualizer.columns import FlightColumns
+from visualizer.events import FlightEventIndex
+from visualizer.rocket import Body, Nose, Rocket
+from visualizer.settings import Settings, SimulationSettings
+from visualizer.simulation import SimulationResult
+
+FLIGHT_DATA_PREFIX = "flight_data."
+
+
+def save_recording(rocket: Rocket, path: os.PathLike) -> None:
+    """
+    Save the structure and the simulation result of the simulated rocket.
+
+    Args:
+        rocket (Rocket): loaded and simulated rocket.
+        path (os.PathLike): path to the recording file (.npz).
+    """
+    if rocket.result is None:
+        raise RuntimeError("The rocket is not simulated. Call run_simulation() first.")
+    structure = {
+        "length": rocket.length,
+        "radius": rocket.radius,
+        "dry_mass": rocket.dry_mass,
+        "nose": rocket.nose.to_dict(),
+        "bodys": [body.to_dict() for body in rocket.bodys],
+    }
+    result = rocket.result
+    summary = {
+        "max_altitude": result.max_altitude,
+        "max_velocity": result.max_velocity,
+        "flight_time": result.flight_time,
+        "launch_clear_velocity": result.launch_clear_velocity,
+        "time_step": result.time_step,
+        "elapsed": result.elapsed,
+        "simulation_settings": asdict(rocket.settings.simulation),
+        "events": None if result.events is None else result.events.to_dict(),
+    }
+    columns = {
+        FLIGHT_DATA_PREFIX + key.name: value
+        for key, value in result.flight_data.items()
+        if isinstance(key, FlightDataType)  # derived columns are computed again
+    }
+    with open(path, "wb") as f:
+        np.savez_compressed(
+            f,
+            structure=np.array(json.dumps(structure)),
+            summary=np.array(json.dumps(summary)),
+            **columns,
+        )
+
+
+class RecordedRocket(Rocket):
+    """
+    Rocket replayed from a recording instead of OpenRocket.
+    The recorded result is applied whatever the simulation settings are.
+    """
+
+    def __init__(
+        self,
+        file_path: os.PathLike,
+        recording_path: os.PathLike,
+        settings: Settings | None = None,
+    ):
+        """
+        Initialize the RecordedRocket object.
+
+        Args:
+            file_path (os.PathLike): path to the recorded ork file.
+            recording_path (os.PathLike): path to the recording file (.npz).
+            settings (Settings | None): application settings. loaded from settings.toml if None.
+        """
+        super().__init__(file_path, settings)
+        self.recording_path = str(recording_path)
+        self.recorded_result: SimulationResult = None
+        self.recorded_settings: SimulationSettings = None
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the recording is loaded"""
+        return self.recorded_result is not None
+
+    def load(self):
+        """
+        Load the recording and build the meshes from the recorded structure.
+        """
+        with np.load(self.recording_path) as recording:
+            structure = json.loads(str(recording["structure"]))
+            summary = json.loads(str(recording["summary"]))
+            columns = {
+                FlightDataType[name[len(FLIGHT_DATA_PREFIX) :]]: recording[name]
+                for name in recording.files
+                if name.startswith(FLIGHT_DATA_PREFIX)
+            }
+
+        self.length = structure["length"]
+        self.radius = structure["radius"]
+        self.dry_mass = structure["dry_mass"]
+        self.nose = Nose.from_dict(structure["nose"])
+        self.bodys = [Body.from_dict(body) for body in structure["bodys"]]
+        self.build_meshes()
+
+        self.recorded_settings = SimulationSettings(**summary["simulation_settings"])
+        events = summary.get("events")  # None if recorded before the events were kept
+        self.recorded_result = SimulationResult(
+            FlightColumns(columns),  # no more columns can be fetched without Java
+            summary["max_altitude"],
+            summary["max_velocity"],
+            summary["flight_time"],
+            summary["launch_clear_velocity"],
+            summary["time_step"],
+            summary["elapsed"],
+            events=None if events is None else FlightEventIndex.from_dict(events),
+        )
+
+    def simulate(
+        self,
+        settings: SimulationSettings | None = None,
+        time_step: float | None = None,
+    ) -> SimulationResult:
+        """
+        Apply the recorded result instead of running the simulation.
+
+        Args:
+            settings (SimulationSettings | None): simulation settings. only compared with the recorded ones.
+            time_step (float | None): ignored.
+
+        Returns:
+            SimulationResult: the recorded result.
+        """
+        if not self.is_loaded:
+            raise RuntimeError("The recording is not loaded. Call load() first.")
+        if (settings or self.settings.simulation) != self.recorded_settings:
+            print("WARNING: the simulation settings differ from the recorded ones.")
+        self.apply_result(self.recorded_result)
+        return self.recorded_result
+
+    def simulate_progressive(self, settings: SimulationSettings | None = None) -> None:
+        """
+        Apply the recorded result. The recorded result is final, so that nothing is refined.
+
+        Args:
+            settings (SimulationSettings | None): simulation settings. only compared with the recorded ones.
+
+        Returns:
+            None: no refinement is running.
+        """
+        self.simulate(settings)
+        return None
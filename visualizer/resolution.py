@@ -0,0 +1,117 @@
+"""
+resolution.py
+
+Notes:
+    - The world of the playback (the sky, the trajectory and the rocket) can be drawn at a lower internal
+      resolution, and upscaled to the window once per frame (nearest-neighbor). The UI elements are drawn
+      after that at the native resolution, so that the texts stay crisp.
+    - Only the scenes whose world covers the whole window (`Scene.SCALED_WORLD`) are scaled: compositing
+      a transparent layer over the window costs more than drawing the rockets at the native resolution.
+    - In the dynamic mode, the scale is lowered when the average frame time exceeds the budget,
+      and raised again when there is headroom. The scale is changed in steps and not more often than
+      COOLDOWN_FRAMES, so that the caches of the renders at each size are reused.
+"""
+
+import pygame as pg
+
+from visualizer.layout import Layout
+from visualizer.settings import RenderSettings
+
+
+class RenderScaler:
+    """
+    Manager of the internal render resolution.
+    """
+
+    STEP = 0.125  # change of the scale at once
+    SMOOTHING = 0.1  # weight of the latest frame time in the average
+    HEADROOM = 0.6  # the scale is raised when the average frame time is below this ratio of the budget
+    COOLDOWN_FRAMES = 30  # minimum frames between the scale changes
+
+    def __init__(self, settings: RenderSettings) -> None:
+        """
+        Initialize the scaler.
+
+        Args:
+            settings (RenderSettings): settings of the render resolution.
+        """
+        self.settings = settings
+        self.scale = self.clamp(settings.scale)
+        self.frame_time = 0.0  # average frame time (unit: ms)
+        self.__cooldown = 0
+        self.__surface: pg.Surface = None
+        Layout.set_render_scale(self.scale)
+
+    def clamp(self, scale: float) -> float:
+        """Clamp the scale between the minimum scale and the native resolution"""
+        return min(max(scale, self.settings.min_scale, 0.1), 1.0)
+
+    def apply_settings(self, settings: RenderSettings) -> None:
+        """
+        Apply the reloaded settings.
+
+        Args:
+            settings (RenderSettings): settings of the render resolution.
+        """
+        self.settings = settings
+        self.scale = self.clamp(settings.scale)
+        self.__cooldown = self.COOLDOWN_FRAMES
+        Layout.set_render_scale(self.scale)
+
+    def record(self, frame_time: float) -> None:
+        """
+        Record the work time of a frame, and adjust the scale in the dynamic mode.
+
+        Args:
+            frame_time (float): work time of the frame without waiting for the frame rate (unit: ms).
+        """
+        if self.frame_time == 0.0:
+            self.frame_time = frame_time
+        self.frame_time += (frame_time - self.frame_time) * self.SMOOTHING
+        if not self.settings.dynamic:
+            return
+        if self.__cooldown > 0:
+            self.__cooldown -= 1
+            return
+
+        budget = self.settings.frame_budget
+        if self.frame_time > budget:
+            scale = self.clamp(self.scale - self.STEP)
+        elif self.frame_time < budget * self.HEADROOM:
+            scale = self.clamp(self.scale + self.STEP)
+        else:
+            return
+        if scale != self.scale:
+            print(f"Render scale: {self.scale:.3f} -> {scale:.3f}")
+            self.scale = scale
+            self.__cooldown = self.COOLDOWN_FRAMES
+            Layout.set_render_scale(scale)
+
+    def begin(self, screen: pg.Surface) -> pg.Surface:
+        """
+        Get the surface to draw the scaled scene elements on.
+
+        Args:
+            screen (pg.Surface): the screen (at the layout size).
+
+        Returns:
+            pg.Surface: the screen itself at the native resolution, or the off-screen surface.
+        """
+        if self.scale >= 1.0:
+            return screen
+        size = Layout.get_render_size()
+        if self.__surface is None or self.__surface.get_size() != size:
+            self.__surface = pg.Surface(size)
+        return self.__surface
+
+    def end(self, screen: pg.Surface, surface: pg.Surface) -> None:
+        """
+        Upscale the off-screen surface to the screen.
+
+        Args:
+            screen (pg.Surface): the screen (at the layout size).
+            surface (pg.Surface): the surface from `begin`.
+        """
+        if surface is not screen:
+            # nearest-neighbor: smoothscale of a large window costs more than drawing at the native resolution
+            pg.transform.scale(surface, screen.get_size(), screen)
@@ -6,24 +6,31 @@ Notes:
     - The unit is meter (but normalized and adjusted when drawing).
 """
 
-import glob
-import jpype
-import numpy as np
 import os
-import tomllib
 from pathlib import Path
 
-import matplotlib.pyplot as plt
-
 import numpy as np
-import orhelper
 import pygame as pg
-import requests
 from orhelper import FlightDataType, OrLogLevel
 
 # from orhelper._orhelper import or_logger
 from jpype import java
 
+from visualizer.columns import FlightColumns
+from visualizer.decimate import adaptive_profile, douglas_peucker
+from visualizer.events import FlightEventIndex
+from visualizer.layout import Layout
+from visualizer.mesh import RocketMesh, rotation_matrix
+from visualizer.model import FlightRecord, RocketData, RocketGeometry
+from visualizer.openrocket import OpenRocket
+from visualizer.profiler import PipelineProfiler, profile_phase
+from visualizer.settings import Settings, SimulationSettings
+from visualizer.simulation import (
+    ProgressiveSimulation,
+    SimulationResult,
+    run_simulation,
+)
+
 # java.util.logging.Logger
 # .getLogger("ch").setLevel(java.util.logging.Level.OFF)
 
@@ -32,7 +39,22 @@ from jpype import java
 
 
 class Rocket:
-    NOSE_CONE_DETAIL = 10  # number of points to draw the nose cone
+    NOSE_CONE_SAMPLES = 100  # number of points to sample the nose cone shape
+    COARSE_TIME_STEP_FACTOR = 5  # ratio of the time step for the preview simulation
+
+    # level of detail, selected by the length of the rocket on the screen.
+    # (minimum length[px], nose cone points, segments around the axis, fin simplification[ratio to the length], outline)
+    LOD_LEVELS = [
+        (300, 32, 32, 0.0, True),
+        (120, 16, 16, 0.0, True),
+        (40, 8, 8, 0.01, False),
+    ]
+    SPRITE_SIZE = 64  # length of the rocket in the cached sprite (used below the smallest level)[px]
+    SPRITE_ANGLE_STEP = 5  # quantization step of the sprite rotation[degrees]
+
+    NOSE_COLOR = pg.Color("orange")
+    BODY_COLOR = pg.Color("white")
+    FIN_COLOR = pg.Color("blue")
 
     FLIGHT_DATA = [
         FlightDataType.TYPE_TIME,
@@ -45,40 +67,37 @@ class Rocket:
         FlightDataType.TYPE_AOA,
     ]
 
-    def __init__(self, file_path: os.PathLike):
+    def __init__(self, file_path: os.PathLike, settings: Settings | None = None):
         """
         Initialize the Rocket object.
         Args:
             file_path (os.PathLike): path to the ork file.
+            settings (Settings | None): application settings. loaded from settings.toml if None.
         """
 
         if not Path(file_path).exists():
             raise FileNotFoundError(f"File not found: {file_path}")
         self.file_path = str(file_path)
+        self.settings = settings or Settings.load()
+        # instrumentation of the pipeline (benchmark only)
+        self.profiler: PipelineProfiler = None
 
-        # find or download jar file for OpenRocket
-        self.__jar_path = os.environ.get("CLASSPATH")
-
-        if self.__jar_path is None or not Path(self.__jar_path).exists():
-            self.__jar_path = glob.glob("*.jar")
-
-            if self.__jar_path:
-                self.__jar_path = self.__jar_path[0]
-            else:
-                print("OpenRocket jar file not found. Downloading...")
-                with open("settings.toml", "rb") as f:
-                    settings = tomllib.load(f)
-                    url = settings["openrocket"]["url"]
-                    response = requests.get(url)
-                    self.__jar_path = url[url.rfind("/") + 1 :]
-                    with open(self.__jar_path, "wb") as f:
-                        f.write(response.content)
-                print("Done.")
-                self.__jar_path = os.environ.get("CLASSPATH")
-
-        self.flight_data: dict[FlightDataType, float] = None
+        # OpenRocket objects (kept to re-run the simulation without re-loading the ork file)
+        self.__doc = None
+        self.__sim = None
+
+        self.result: SimulationResult = None
+        self.flight_data: FlightColumns = None
+        self.events: FlightEventIndex = None  # flight events mapped to the samples
         self.nose: Nose = None
         self.bodys: list[Body] = []
+        self.meshes: list[tuple[float, RocketMesh]] = []  # (minimum length[px], mesh)
+        self.mesh: RocketMesh = None  # mesh selected for the current frame
+        self.__sprite: pg.Surface = None
+        self.__sprite_cache: dict[tuple[int, int], pg.Surface] = {}
+        self.sprite: pg.Surface = None  # sprite selected for the current frame
+        self.sprite_rect: pg.Rect = None
+        self.pixel_length = 0  # length of the rocket on the screen[px]
 
         self.drawing_positon = [0.5, 0.5]  # position of the rocket(percentage)
         self.drawing_size = 0.8  # size of the rocket vs. window height(percentage)
@@ -89,120 +108,352 @@ class Rocket:
         self.launch_clear_velocity = 0
         self.dry_mass = 0
 
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the ork file is loaded"""
+        return self.__sim is not None
+
     def run_simulation(self):
         """
-        Run the simulation.
+        Load the ork file (only at the first call) and run the simulation.
         """
-        with orhelper.OpenRocketInstance(self.__jar_path) as instance:
-            orh = orhelper.Helper(instance)
-            doc = orh.load_doc(self.file_path)
+        if not self.is_loaded:
+            self.load()
+        self.simulate()
 
-            try:
-                sim = doc.getSimulation(0)
-            except:
-                print("Error: Simulation Data is not available.")
-                print(
-                    "INFO: Please check the simulation data is attached or\n the OpenRocket version is the latest."
-                )
+    def load(self):
+        """
+        Load the ork file and extract the rocket structure.
+        """
+        profiler = self.profiler
+        with profile_phase(profiler, "start_jvm"):
+            orh = OpenRocket.get_helper(self.settings.openrocket.url)
+        with profile_phase(profiler, "load_doc"):
+            self.__doc = orh.load_doc(self.file_path)
+
+        try:
+            self.__sim = self.__doc.getSimulation(0)
+        except Exception:
+            print("Error: Simulation Data is not available.")
+            print(
+                "INFO: Please check the simulation data is attached or\n the OpenRocket version is the latest."
+            )
+            raise
+
+        with profile_phase(profiler, "extract_structure"):
+            rocket = self.__sim.getRocket()
+            if profiler is not None:
+                rocket = profiler.wrap(rocket)  # count the calls per component
+            self.__extract_structure(rocket)
+        with profile_phase(profiler, "build_meshes"):
+            self.build_meshes()
+
+    def simulate(
+        self,
+        settings: SimulationSettings | None = None,
+        time_step: float | None = None,
+    ) -> SimulationResult:
+        """
+        Run the simulation on the loaded document.
+        The rocket structure is not re-extracted, so that this can be called repeatedly (e.g. after the settings are changed).
+
+        Args:
+            settings (SimulationSettings | None): simulation settings. the current settings are used if None.
+            time_step (float | None): time step of the simulation (unit: s). the document default is used if None.
+
+        Returns:
+            SimulationResult: result of the simulation.
+        """
+        self.__update_simulation_settings(settings)
+        result = run_simulation(
+            OpenRocket.get_helper(self.settings.openrocket.url),
+            self.__sim,
+            self.settings.simulation,
+            self.FLIGHT_DATA,
+            time_step,
+            self.profiler,
+        )
+        self.apply_result(result)
+        return result
+
+    def evaluate(self, settings: SimulationSettings) -> SimulationResult:
+        """
+        Run the simulation with the settings without applying the result, so that this can be called
+        concurrently (e.g. by the optimizer).
+
+        Args:
+            settings (SimulationSettings): simulation settings of the run.
+
+        Returns:
+            SimulationResult: result of the simulation.
+        """
+        if not self.is_loaded:
+            raise RuntimeError("The ork file is not loaded. Call load() first.")
+        return run_simulation(
+            OpenRocket.get_helper(self.settings.openrocket.url),
+            self.__sim,
+            settings,
+            self.FLIGHT_DATA,
+        )
+
+    def evaluate_design(
+        self,
+        modify,
+        settings: SimulationSettings,
+        flight_data_types: list[FlightDataType] | None = None,
+    ) -> SimulationResult:
+        """
+        Run the simulation of a modified copy of the rocket without applying the result.
+        The loaded document is not changed, so that this can be called concurrently (e.g. by the design sweep).
+
+        Args:
+            modify (Callable): modifies the copied rocket object of OpenRocket.
+            settings (SimulationSettings): simulation settings of the run.
+            flight_data_types (list[FlightDataType] | None): types of the timeseries data. FLIGHT_DATA if None.
+
+        Returns:
+            SimulationResult: result of the simulation of the modified copy.
+        """
+        if not self.is_loaded:
+            raise RuntimeError("The ork file is not loaded. Call load() first.")
+        rocket = self.__sim.getRocket().copyWithOriginalID()
+        modify(rocket)
+        return run_simulation(
+            OpenRocket.get_helper(self.settings.openrocket.url),
+            self.__sim.duplicateSimulation(rocket),  # same options on the copy
+            settings,
+            flight_data_types or self.FLIGHT_DATA,
+        )
+
+    def simulate_progressive(
+        self, settings: SimulationSettings | None = None
+    ) -> ProgressiveSimulation:
+        """
+        Run the coarse simulation for preview, and start the full-fidelity simulation in the background.
+        The preview result is applied immediately. The refined result should be applied by `apply_result`
+        when `ProgressiveSimulation.poll` returns it.
 
-            opts = sim.getOptions()
-            rocket = sim.getRocket()
-            # set simulation specifications from settings.toml
-            with open("settings.toml", "rb") as f:
-                settings = tomllib.load(f)
-                opts.setLaunchRodAngle(
-                    np.radians(90 - settings["simulation"]["launchRod"]["angle"])
-                )  # convert to radians
-                opts.setLaunchRodLength(
-                    settings["simulation"]["launchRod"]["length"]
-                )  # must be in meters
-                opts.setWindSpeedAverage(settings["simulation"]["wind"]["speed"])
-                opts.setWindSpeedDeviation(settings["simulation"]["wind"]["deviation"])
-                opts.setWindTurbulenceIntensity(
-                    settings["simulation"]["wind"]["turbulenceIntensity"]
+        Args:
+            settings (SimulationSettings | None): simulation settings. the current settings are used if None.
+
+        Returns:
+            ProgressiveSimulation: the progressive simulation running in the background.
+        """
+        self.__update_simulation_settings(settings)
+        progressive = ProgressiveSimulation(
+            OpenRocket.get_helper(self.settings.openrocket.url),
+            self.__sim,
+            self.settings.simulation,
+            self.FLIGHT_DATA,
+            self.COARSE_TIME_STEP_FACTOR,
+        )
+        self.apply_result(progressive.start())
+        return progressive
+
+    def __update_simulation_settings(self, settings: SimulationSettings | None):
+        if not self.is_loaded:
+            raise RuntimeError("The ork file is not loaded. Call load() first.")
+        if settings is not None:
+            self.settings = Settings(
+                self.settings.game, settings, self.settings.openrocket
+            )
+
+    def apply_result(self, result: SimulationResult):
+        """
+        Apply the simulation result. The events are indexed from the columns (only once) if the result has none.
+
+        Args:
+            result (SimulationResult): result of the simulation.
+        """
+        if result.events is None:
+            result.events = FlightEventIndex.build(result.flight_data)
+        self.result = result
+        self.max_altitude = result.max_altitude
+        self.max_velocity = result.max_velocity
+        self.flight_time = result.flight_time
+        self.launch_clear_velocity = result.launch_clear_velocity
+        self.flight_data = result.flight_data
+        self.events = result.events
+
+    def to_data(self) -> RocketData:
+        """
+        Pack the extracted structure and the simulation result (e.g. to send them from a worker process).
+
+        Returns:
+            RocketData: the packed structure and result.
+        """
+        if self.nose is None:
+            raise RuntimeError(
+                "The rocket structure is not extracted. Call load() first."
+            )
+        return RocketData(
+            RocketGeometry.from_parts(
+                self.length, self.radius, self.dry_mass, self.nose, self.bodys
+            ),
+            None if self.result is None else FlightRecord.from_result(self.result),
+        )
+
+    def apply_data(self, data: RocketData):
+        """
+        Rehydrate the structure and the simulation result packed by `to_data`, and build the meshes.
+
+        Args:
+            data (RocketData): the packed structure and result.
+        """
+        geometry = data.geometry
+        self.length = geometry.length
+        self.radius = geometry.radius
+        self.dry_mass = geometry.dry_mass
+        self.nose = Nose.from_arrays(
+            geometry.nose_radius, geometry.nose_axial, geometry.length
+        )
+        self.bodys = [
+            Body.from_arrays(radius, axial)
+            for axial, radius in zip(geometry.body_axial, geometry.body_radius)
+        ]
+        for body, points, shape, n_fins, thickness in geometry.fins():
+            self.bodys[body].fins.append(
+                Fin.from_arrays(shape, points, n_fins, thickness)
+            )
+        self.build_meshes()
+        if data.flight is not None:
+            self.apply_result(data.flight.to_result())
+
+    def __extract_structure(self, rocket):
+        """
+        Extract the rocket structure (nose cone, body tubes and fins) for drawing.
+
+        Args:
+            rocket: rocket object of OpenRocket.
+        """
+        self.dry_mass = 0  # dry mass of the rocket
+        self.bodys = []
+
+        self.length = rocket.getLength()  # total length of the rocket
+
+        # sim_config = sim.getActiveConfiguration()
+
+        sustainer = rocket.getChild(0)
+
+        if sustainer.getChildCount() == 0:
+            raise ValueError("No sustainer stage found.")
+
+        # only available for the single rocket, not for the multi-stage rocket
+        sustainer = rocket.getChild(0)
+
+        # in the most of the cases, the first child is the nose cone
+        nose = sustainer.getChild(0)
+        nose_cone_length = nose.getLength()
+        self.dry_mass += nose.getMass()  # add nose cone mass
+        radius = [
+            nose.getRadius(nose_cone_length / self.NOSE_CONE_SAMPLES * i)
+            for i in range(0, self.NOSE_CONE_SAMPLES + 1)
+        ]  # shape of the nose cone (resampled for each level of detail)
+        self.nose = Nose(radius, nose_cone_length, self.length)
+
+        # verify all of the body tubes
+        for i in range(1, sustainer.getChildCount()):
+            body = sustainer.getChild(i)
+            body_positon = np.array([body.getPosition().x, body.getPosition().y])
+            self.bodys.append(
+                Body(
+                    body_positon[0],  # only need x-axis position
+                    body.getLength(),
+                    body.getOuterRadius(),
+                    self.length,
                 )
-                # opts.setWindDirection(
-                #     np.radians(settings["simulation"]["wind"]["direction"])
-                # ) # omit
-
-            orh.run_simulation(sim)  # run simulation
-            sim_data = sim.getSimulatedData()
-            self.max_altitude = sim_data.getMaxAltitude()
-            self.max_velocity = sim_data.getMaxVelocity()
-            self.flight_time = sim_data.getFlightTime()
-            self.launch_clear_velocity = sim_data.getLaunchRodVelocity()
-
-            self.flight_data = orh.get_timeseries(
-                sim, self.FLIGHT_DATA
-            )  # get timeseries data
-
-            ### get rocket structure ###
-            self.dry_mass = 0  # dry mass of the rocket
-
-            self.length = rocket.getLength()  # total length of the rocket
-
-            # sim_config = sim.getActiveConfiguration()
-
-            sustainer = rocket.getChild(0)
-
-            if sustainer.getChildCount() == 0:
-                raise ValueError("No sustainer stage found.")
-
-            # only available for the single rocket, not for the multi-stage rocket
-            sustainer = rocket.getChild(0)
-
-            # in the most of the cases, the first child is the nose cone
-            nose = sustainer.getChild(0)
-            nose_cone_length = nose.getLength()
-            self.dry_mass += nose.getMass()  # add nose cone mass
-            radius = [
-                nose.getRadius(nose_cone_length / self.NOSE_CONE_DETAIL * i)
-                for i in range(0, self.NOSE_CONE_DETAIL + 1)
-            ]  # shape of the nose cone
-            self.nose = Nose(radius, nose_cone_length, self.length)
-
-            # verify all of the body tubes
-            for i in range(1, sustainer.getChildCount()):
-                body = sustainer.getChild(i)
-                body_positon = np.array([body.getPosition().x, body.getPosition().y])
-                self.bodys.append(
-                    Body(
-                        body_positon[0],  # only need x-axis position
-                        body.getLength(),
-                        body.getOuterRadius(),
+            )
+            self.radius = body.getOuterRadius()
+            self.dry_mass += body.getMass()
+            print("body mass: ", body.getMass())
+            for component in body.getChildren():
+                self.dry_mass += component.getMass()
+                for temp in component.getChildren():
+                    self.dry_mass += (
+                        temp.getMass()
+                    )  # if there are more than 2 levels of components
+                if not "FinSet" in type(component).__name__:  # not a fin
+                    continue
+
+                # start point of the fin shape
+                start_point = component.getLocations()[0]
+                self.bodys[-1].fins.append(
+                    Fin(
+                        body_positon,
+                        np.array([start_point.x, start_point.y]),
+                        [
+                            np.array([point.x, point.y])
+                            for point in component.getFinPoints()
+                        ],
+                        component.getFinCount(),
                         self.length,
+                        component.getThickness(),
                     )
                 )
-                self.radius = body.getOuterRadius()
-                self.dry_mass += body.getMass()
-                print("body mass: ", body.getMass())
-                for component in body.getChildren():
-                    self.dry_mass += component.getMass()
-                    for temp in component.getChildren():
-                        self.dry_mass += (
-                            temp.getMass()
-                        )  # if there are more than 2 levels of components
-                    if not "FinSet" in type(component).__name__:  # not a fin
-                        continue
-
-                    # start point of the fin shape
-                    start_point = component.getLocations()[0]
-                    self.bodys[-1].fins.append(
-                        Fin(
-                            body_positon,
-                            np.array([start_point.x, start_point.y]),
-                            [
-                                np.array([point.x, point.y])
-                                for point in component.getFinPoints()
-                            ],
-                            component.getFinCount(),
-                            self.length,
-                        )
-                    )
-        jpype.shutdownJVM()
         print(self.dry_mass)
 
-    def update(self, pos: np.ndarray, roll: float, pitch: float, yaw: float):
+    def build_meshes(self):
+        """
+        Build the 3D meshes of each level of detail from the extracted rocket structure,
+        and the sprite for the smallest size.
+        """
+        self.meshes = []
+        for min_size, nose_points, segments, fin_tolerance, outline in self.LOD_LEVELS:
+            mesh = RocketMesh(segments, outline=outline)
+            axial, radius = adaptive_profile(
+                self.nose.axial, self.nose.radius, nose_points
+            )
+            mesh.add_revolution(radius, axial, self.NOSE_COLOR)
+            for body in self.bodys:
+                body.add_to_mesh(mesh, self.BODY_COLOR)
+                for fin in body.fins:
+                    fin.add_to_mesh(mesh, self.FIN_COLOR, fin_tolerance * self.length)
+            mesh.finalize()
+            self.meshes.append((min_size, mesh))
+        self.mesh = self.meshes[0][1]
+
+        # render the smallest mesh once to use it as the sprite
+        mesh = self.meshes[-1][1]
+        scale_factor = self.SPRITE_SIZE / self.length
+        width = 2 * np.abs(mesh.vertices[:, [0, 2]]).max() * scale_factor
+        size = (int(np.ceil(max(width, self.SPRITE_SIZE))) + 4,) * 2
+        self.__sprite = pg.Surface(size, pg.SRCALPHA)
+        mesh.project(np.eye(3), scale_factor, np.array(size) / 2, self.length)
+        mesh.draw(self.__sprite)
+        self.__sprite_cache = {}
+
+    def __get_sprite(self, pitch: float) -> pg.Surface:
+        """
+        Get the sprite rotated and scaled for the current frame (cached by the quantized angle and size).
+
+        Args:
+            pitch (float): pitch angle(degrees).
+
+        Returns:
+            pg.Surface: the sprite.
+        """
+        angle = (
+            int(round(pitch / self.SPRITE_ANGLE_STEP)) * self.SPRITE_ANGLE_STEP % 360
+        )
+        key = (angle, max(int(self.pixel_length), 1))
+        sprite = self.__sprite_cache.get(key)
+        if sprite is None:
+            if len(self.__sprite_cache) > 256:
+                self.__sprite_cache.clear()
+            sprite = pg.transform.rotozoom(
+                self.__sprite, -angle, key[1] / self.SPRITE_SIZE
+            )
+            self.__sprite_cache[key] = sprite
+        return sprite
+
+    def update(
+        self,
+        pos: np.ndarray,
+        roll: float,
+        pitch: float,
+        yaw: float,
+        scale_factor: float | None = None,
+    ):
         """
         Update the rocket for drawing.
 
@@ -211,27 +462,39 @@ class Rocket:
             roll (float): roll angle(degrees).
             pitch (float): pitch angle(degrees).
             yaw (float): yaw angle(degrees).
+            scale_factor (float | None): scale factor from meter to pixel. fitted to the window height with `drawing_size` if None.
         """
-        roll = np.radians(roll)
-        pitch = np.radians(pitch)
-        yaw = np.radians(yaw)
+        window_size = Layout.get_window_size()
+        if scale_factor is None:
+            scale_factor = window_size[1] / self.length * self.drawing_size
+        pos = np.array(window_size) * pos  # convert to pixcel
+        rotation = rotation_matrix(np.radians(roll), np.radians(pitch), np.radians(yaw))
+        self.update_pose(pos, rotation, scale_factor)
 
-        window_size = pg.display.get_window_size()
-        scale_factor = (
-            window_size[1] / self.length * self.drawing_size * np.cos(yaw)
-        )  # scale factor
+    def update_pose(self, pos: np.ndarray, rotation: np.ndarray, scale_factor: float):
+        """
+        Update the rocket for drawing with the precomputed rotation matrix (e.g. from the keyframes of the timeline).
 
-        rotation_matrix = np.array(
-            [
-                [np.cos(pitch), -np.sin(pitch)],
-                [np.sin(pitch), np.cos(pitch)],
-            ]
-        )
-        pos = np.array(window_size) * pos  # convert to pixcel
-        self.nose.update(pos, scale_factor, rotation_matrix)
-        for body in self.bodys:
-            # body.update()
-            body.update(pos, scale_factor, rotation_matrix, roll)
+        Args:
+            pos (np.ndarray): position of the center of the whole rocket in pixcel.
+            rotation (np.ndarray): 3x3 rotation matrix.
+            scale_factor (float): scale factor from meter to pixel.
+        """
+        self.pixel_length = scale_factor * self.length
+
+        # select the level of detail by the length on the screen
+        for min_size, mesh in self.meshes:
+            if self.pixel_length >= min_size:
+                mesh.project(rotation, scale_factor, pos, self.length)
+                self.mesh = mesh
+                self.sprite = None
+                return
+
+        self.mesh = None
+        # tilt of the axis on the screen
+        pitch = np.degrees(np.arctan2(-rotation[0, 1], rotation[1, 1]))
+        self.sprite = self.__get_sprite(pitch)
+        self.sprite_rect = self.sprite.get_rect(center=(int(pos[0]), int(pos[1])))
 
     def draw(self, screen: pg.surface):
         """
@@ -240,29 +503,15 @@ class Rocket:
         Args:
             screen (pg.surface): screen to draw the rocket.
         """
-        # Returns:
-        #     pg.Rect: bounding box of the rocket.
-
-        self.nose.draw(screen)
-        for body in self.bodys:
-            body.draw(screen)
-
-        # x_points = [point[0] for body in self.bodys for point in body.polygons] + [
-        #     point[0] for point in self.nose.polygon
-        # ]
-        # y_points = [point[1] for body in self.bodys for point in body.polygons] + [
-        #     point[1] for point in self.nose.polygon
-        # ]
-
-        # x_min = min(x_points)
-        # x_max = max(x_points)
-        # y_min = min(y_points)
-        # y_max = max(y_points)
-
-        # return pg.Rect(x_min, y_min, x_max - x_min, y_max - y_min)
+        if self.mesh is not None:
+            self.mesh.draw(screen)
+        else:
+            screen.blit(self.sprite, self.sprite_rect)
 
 
 class Nose:
+    __slots__ = ("total_length", "radius", "axial")
+
     def __init__(
         self, radius_arr: list[float], nose_length: float, total_length: float
     ):
@@ -275,49 +524,36 @@ class Nose:
         """
         self.total_length = total_length
         half_length = total_length / 2
-        axial_points = np.linspace(0, nose_length, len(radius_arr))[1:] - half_length
-        radius_arr = radius_arr[1:]  # exclude the first point
-
-        self.nose_points = (
-            [np.array([0, -half_length])]
-            + [
-                np.array([radius, axial_point])
-                for radius, axial_point in zip(radius_arr, axial_points)
-            ]
-            + [
-                np.array([-radius, axial_point])
-                for radius, axial_point in zip(radius_arr[::-1], axial_points[::-1])
-            ]
-        )
-
-        self.polygon = []  # polygon to draw the nose cone
-
-    def update(self, pos: float, scale_factor: float, rotateion_matrix: np.ndarray):
-        """
-        Update the nose cone for drawing.
-
-        Args:
-            pos (float): position of the center of the whole rocket in pixcel.
-            scale_factor (float): scale factor as the ratio of the window height to the total length of the rocket.
-            rotateion_matrix (np.ndarray): rotation matrix for the nose cone. must be 2x2 matrix.
-        """
-        points = [np.dot(rotateion_matrix, point) for point in self.nose_points]
-
-        self.polygon = [point * scale_factor + pos for point in points]
-        self.polygon = [point for point in self.polygon]
-
-    def draw(self, screen: pg.surface):
-        """
-        Draw the nose cone on the screen.
-
-        Args:
-            screen (pg.surface): screen to draw the nose cone.
-        """
-        pg.draw.polygon(screen, pg.Color("orange"), self.polygon)
-        pg.draw.polygon(screen, pg.Color("black"), self.polygon, width=1)
+        self.radius = np.array(radius_arr, dtype=float)
+        self.radius[0] = 0  # tip of the nose cone
+        self.axial = np.linspace(0, nose_length, len(radius_arr)) - half_length
+
+    def to_dict(self) -> dict:
+        """Convert to the dictionary of plain values (e.g. to record the structure)"""
+        return {
+            "total_length": self.total_length,
+            "radius": self.radius.tolist(),
+            "axial": self.axial.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Nose":
+        """Restore from the dictionary made by `to_dict`"""
+        return cls.from_arrays(data["radius"], data["axial"], data["total_length"])
+
+    @classmethod
+    def from_arrays(cls, radius, axial, total_length: float) -> "Nose":
+        """Restore from the profile in the drawing coordinate (e.g. of `RocketGeometry`)"""
+        nose = cls.__new__(cls)
+        nose.total_length = float(total_length)
+        nose.radius = np.asarray(radius, dtype=float)
+        nose.axial = np.asarray(axial, dtype=float)
+        return nose
 
 
 class Body:
+    __slots__ = ("radius", "axial", "fins")
+
     def __init__(
         self, position: np.ndarray, length: float, radius: float, total_length: float
     ):
@@ -333,54 +569,50 @@ class Body:
         print("position: ", position)
         print("length: ", length)
         half_length = total_length / 2
-        self.points = [
-            np.array([radius, position - half_length]),
-            np.array([radius, position + length - half_length]),
-            np.array([-radius, position + length - half_length]),
-            np.array([-radius, position - half_length]),
-        ]
+        self.radius = radius
+        self.axial = np.array([position, position + length]) - half_length
         self.fins: list[Fin] = []
-        self.polygons = []
-
-    def update(
-        self,
-        pos: np.ndarray,
-        scale_factor: float,
-        rotation_matrix: np.ndarray,
-        beta: float,
-    ):
-        """
-        Update the body tube for drawing.
 
-        Args:
-            pos (np.ndarray): position of the center of the whole rocket in pixcel.
-            scale_factor (float): scale factor as the ratio of the window height to the total length of the rocket.
-            rotateion_matrix (np.ndarray): rotation matrix for the body tube. must be 2x2 matrix.
-            beta (float): roll angle for the body tube(degrees).
+    def to_dict(self) -> dict:
+        """Convert to the dictionary of plain values (e.g. to record the structure)"""
+        return {
+            "radius": self.radius,
+            "axial": self.axial.tolist(),
+            "fins": [fin.to_dict() for fin in self.fins],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Body":
+        """Restore from the dictionary made by `to_dict`"""
+        body = cls.from_arrays(data["radius"], data["axial"])
+        body.fins = [Fin.from_dict(fin) for fin in data["fins"]]
+        return body
+
+    @classmethod
+    def from_arrays(cls, radius: float, axial) -> "Body":
+        """Restore the body tube without fins from the drawing coordinate (e.g. of `RocketGeometry`)"""
+        body = cls.__new__(cls)
+        body.radius = float(radius)
+        body.axial = np.asarray(axial, dtype=float)
+        body.fins = []
+        return body
+
+    def add_to_mesh(self, mesh: RocketMesh, color: pg.Color):
         """
-        points = [np.dot(rotation_matrix, point) for point in self.points]
-
-        self.polygons = [point * scale_factor + pos for point in points]
-
-        for fin in self.fins:
-            fin.update(pos, scale_factor, rotation_matrix, beta)
-
-    def draw(self, screen: pg.surface):
-        """
-        Draw the body tube on the screen.
+        Add the body tube to the mesh.
 
         Args:
-            screen (pg.surface): screen to draw the body tube.
+            mesh (RocketMesh): mesh of the rocket.
+            color (pg.Color): color of the body tube.
         """
-        for fin in self.fins:
-            fin.draw_backward(screen)
-        pg.draw.polygon(screen, pg.Color("white"), self.polygons)
-        pg.draw.polygon(screen, pg.Color("black"), self.polygons, width=1)
-        for fin in self.fins:
-            fin.draw_forward(screen)
+        mesh.add_revolution(
+            [self.radius, self.radius], self.axial, color, cap_front=True, cap_back=True
+        )
 
 
 class Fin:
+    __slots__ = ("shape", "n_fin", "thickness", "points")
+
     def __init__(
         self,
         parents_position: np.ndarray,
@@ -388,6 +620,7 @@ class Fin:
         shape: list[np.ndarray],
         n_fins: int,
         total_length: float,
+        thickness: float = 0.0,
     ):
         """
         Initialize the Fin object.
@@ -397,80 +630,59 @@ class Fin:
             points (list[np.ndarray]): list of fin shape points(x, y)[m] (inherit OpenRocket original coordinate).
             n_fins (int): number of fins.
             total_length (float): total length of the rocket
+            thickness (float): thickness of the fin[m].
         """
         start_point = start_point[::-1]  # convert as longitudinal axis is y-axis
         parents_position = parents_position[::-1]
         offset = start_point - np.array([0, total_length / 2])
 
-        self.shape = shape
+        self.shape = np.array(shape, dtype=float).reshape(-1, 2)
         self.n_fin = n_fins
+        self.thickness = thickness
+
+        self.points = self.shape[:, ::-1] + offset
+
+    def to_dict(self) -> dict:
+        """Convert to the dictionary of plain values (e.g. to record the structure)"""
+        return {
+            "shape": self.shape.tolist(),
+            "n_fin": self.n_fin,
+            "thickness": self.thickness,
+            "points": self.points.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Fin":
+        """Restore from the dictionary made by `to_dict`"""
+        return cls.from_arrays(
+            data["shape"], data["points"], data["n_fin"], data["thickness"]
+        )
 
-        self.points = [point[::-1] + offset for point in shape]
-
-        self.polygons = []
-        self.z_order = []
-
-    def update(
-        self,
-        pos: np.ndarray,
-        scale_factor: float,
-        rotation_matrix: np.ndarray,
-        beta: float,
-    ):
+    @classmethod
+    def from_arrays(cls, shape, points, n_fins: int, thickness: float) -> "Fin":
+        """Restore from the outlines in both coordinates (e.g. of `RocketGeometry`)"""
+        fin = cls.__new__(cls)
+        fin.shape = np.asarray(shape, dtype=float).reshape(-1, 2)
+        fin.n_fin = int(n_fins)
+        fin.thickness = float(thickness)
+        fin.points = np.asarray(points, dtype=float).reshape(-1, 2)
+        return fin
+
+    def add_to_mesh(self, mesh: RocketMesh, color: pg.Color, tolerance: float = 0.0):
         """
-        Update the fin for drawing.
+        Add all fins of the fin set to the mesh.
 
         Args:
-            pos (np.ndarray): position of the center of the whole rocket in pixcel.
-            scale_factor (float): scale factor as the ratio of the window height to the total length of the rocket.
-            rotateion_matrix (np.ndarray): rotation matrix for the fin. must be 2x2 matrix.
-            beta (float): roll angle for the fin(degrees).
+            mesh (RocketMesh): mesh of the rocket.
+            color (pg.Color): color of the fins.
+            tolerance (float): tolerance to simplify the fin shape[m]. not simplified if 0.
         """
-        # points = [np.dot(rotation_matrix, point) for point in self.points]
-
-        # polygon = [point * scale_factor + pos for point in points]
-
+        points = self.points
+        if tolerance > 0:
+            points = douglas_peucker(points, tolerance)
         diff = 2 * np.pi / self.n_fin
-        beta = np.radians(beta)
-
-        self.polygons = [
-            [
-                np.dot(rotation_matrix, point * np.array([np.cos(diff * i + beta), 1]))
-                * scale_factor
-                + pos
-                for point in self.points
-            ]
-            for i in range(self.n_fin)
-        ]
-        self.z_order = [
-            (diff * i + beta) % (2 * np.pi) <= np.pi for i in range(self.n_fin)
-        ]  # True: forward, False: backward
-
-    def draw_backward(self, screen: pg.surface):
-        """
-        Draw the fin on the screen.
-        Only for the backward fin.
-
-        Args:
-            screen (pg.surface): screen to draw the fin.
-        """
-        for polygon, z_order in zip(self.polygons, self.z_order):
-            if not z_order:
-                pg.draw.polygon(screen, pg.Color("blue"), polygon)
-                pg.draw.polygon(screen, pg.Color("black"), polygon, width=1)
-
-    def draw_forward(self, screen: pg.surface):
-        """
-        Draw the fin on the screen.
-        Only for the forward fin.
-
-        Args:
-            screen (pg.surface): screen to draw the fin.
-        """
-        for polygon, z_order in zip(self.polygons, self.z_order):
-            if z_order:
-                pg.draw.polygon(screen, pg.Color("blue"), polygon)
-                pg.draw.polygon(screen, pg.Color("black"), polygon, width=1)
+        for i in range(self.n_fin):
+            mesh.add_fin(points, diff * i, self.thickness, color)
 
 
 if __name__ == "__main__":
@@ -2,16 +2,46 @@
 
 import abc
 import enum
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import numpy as np
 import pygame as pg
+from orhelper import FlightEvent
 
 import visualizer.config as cfg
 import visualizer.ui_elements as ui_elements
-from visualizer.dialogs import ask_whether_to_exit, open_ork_file
+from visualizer.allocations import AllocationTracker, allocation_phase
+from visualizer.background import SkyBackground
+from visualizer.charts import BackgroundChart
+from visualizer.columns import TOTAL_VELOCITY
+from visualizer.dialogs import (
+    ask_whether_to_exit,
+    open_log_file,
+    open_ork_file,
+    open_ork_files,
+)
+from visualizer.events import KEY_EVENTS, FlightEventIndex, event_markers
+from visualizer.flightlog import FlightLog, FlightLogLoader
 from visualizer.fonts import Fonts
+from visualizer.groundtrack import GroundTrack
+from visualizer.layout import Layout
+from visualizer.library import (
+    LibraryEntry,
+    LibraryIndex,
+    LibraryScanner,
+    render_thumbnail,
+)
 from visualizer.rocket import *
+from visualizer.mesh import MeshBatch
+from visualizer.openrocket import OpenRocket
+from visualizer.playback import Timeline
+from visualizer.resolution import RenderScaler
+from visualizer.settings import Settings, SettingsWatcher
+from visualizer.simulation import ProgressiveSimulation
+from visualizer.trajectory import Trajectory
 
 pg.init()
 
@@ -26,6 +56,8 @@ class SCENE_STATE(enum.Enum):
     GAME = 2
     EXIT = 3
     QUIT = 4
+    COMPARISON = 5
+    LIBRARY = 6
 
 
 class Scene(abc.ABC):
@@ -33,14 +65,47 @@ class Scene(abc.ABC):
     Base class for all scenes. All scenes should inherit from this class.
     """
 
-    def __init__(self) -> None:
+    SCALED_WORLD = False  # whether draw_world covers the screen and is drawn at the render resolution
+
+    def __init__(self, settings: Settings) -> None:
         """
         Initialize the scene with default values.
+
+        Args:
+            settings: Application settings
         """
         # Common elements for all scenes
         self.state = (
             SCENE_STATE.TOP
         )  # Default state (to be overridden by derived classes)
+        self.settings = settings
+
+    def apply_settings(self, settings: Settings) -> None:
+        """
+        Apply the reloaded settings. Derived classes can override this to react to the changed sections.
+
+        Args:
+            settings: New application settings
+        """
+        self.settings = settings
+
+    def suspend(self) -> None:
+        """
+        Called when the scene is left. The scene is kept in the pool of AppMain to be resumed later.
+        """
+        pass
+
+    def resume(self) -> None:
+        """
+        Called when the pooled scene is entered again. Derived classes can override this to restart timers.
+        """
+        pass
+
+    def prewarm(self) -> None:
+        """
+        Prepare the resources before the scene is shown, so that the transition takes a single frame.
+        """
+        pass
 
     @abc.abstractmethod
     def handle_event(self, event) -> SCENE_STATE:
@@ -67,42 +132,68 @@ class Scene(abc.ABC):
         """
         pass
 
+    def draw_world(self, surface: pg.Surface) -> None:
+        """
+        Draw the world under the other elements. With SCALED_WORLD, the world is drawn at the render size
+        (`Layout.get_render_size`) and must cover the whole surface.
+
+        Args:
+            surface: Pygame surface to draw on, upscaled to the screen if the render scale is not 1
+        """
+        pass
+
     @abc.abstractmethod
     def draw(self, screen: pg.Surface) -> None:
         """
-        Draw the scene elements to the screen.
+        Draw the scene elements (e.g. the UI elements) to the screen over the world.
 
         Args:
             screen: Pygame surface to draw on
         """
         pass
 
-    def exec(self, screen: pg.Surface) -> SCENE_STATE:
+    def exec(
+        self,
+        screen: pg.Surface,
+        tracker: AllocationTracker | None = None,
+        scaler: RenderScaler | None = None,
+    ) -> SCENE_STATE:
         """
-        Execute the scene logic, updating and drawing.
+        Execute the scene logic, updating and drawing. The display is updated by the caller.
 
         Args:
             screen: Pygame surface to draw on
+            tracker: Allocation tracker of the update and draw phases (instrumentation mode), or None
+            scaler: Manager of the render resolution of the world, or None to draw at the native resolution
 
         Returns:
             SCENE_STATE: Current scene state
         """
-        # Clear the screen
-        screen.fill(cfg.COLOR_PALE_WHITE1)
+        # Clear the screen (covered by the world otherwise)
+        if not self.SCALED_WORLD:
+            screen.fill(cfg.COLOR_PALE_WHITE1)
 
         # Update state
-        self.update()
-
-        # Draw elements
-        self.draw(screen)
+        with allocation_phase(tracker, "update"):
+            self.update()
 
-        # Update display
-        pg.display.update()
+        # Draw elements (the world at the render resolution, the others at the native one)
+        with allocation_phase(tracker, "draw"):
+            if scaler is None or not self.SCALED_WORLD:
+                self.draw_world(screen)
+            else:
+                surface = scaler.begin(screen)
+                self.draw_world(surface)
+                scaler.end(screen, surface)
+            self.draw(screen)
 
         return self.state
 
 
 class AppMain:
+    # time without resize events to apply the new window size (unit: ms)
+    RESIZE_SETTLE_TIME = 200
+
     def __init__(self) -> None:
         """
         Initialize the main application.
@@ -118,12 +209,24 @@ class AppMain:
         self.screen = pg.display.set_mode(
             (self.base_width, self.base_height), pg.RESIZABLE
         )
+        Layout.set_window_size((self.base_width, self.base_height))
+        self.pending_size: tuple[int, int] = None  # requested size during a resize drag
+        self.resize_ticks = 0  # time of the last resize event
+        self.canvas: pg.Surface = None  # offscreen surface for the resize preview
         pg.display.set_caption("F.T.E. OpenRocket Visualizer")
         pg.display.set_icon(pg.image.load("img/ろけにゃん_ロケット.png"))
 
+        # Load settings (parsed once, and reloaded only when the file is modified)
+        self.settings_watcher = SettingsWatcher()
+        self.settings = self.settings_watcher.settings
+        self.render_scaler = RenderScaler(self.settings.render)
+
         # Set initial scene
-        self.scene = TopScene()
+        self.scene = TopScene(self.settings)
         self.current_state = SCENE_STATE.TOP
+        self.scenes: dict[SCENE_STATE, Scene] = {}  # suspended or pre-warmed scenes
+        # set to track the allocations
+        self.allocation_tracker: AllocationTracker = None
 
     def adjust_window_size(self, width, height):
         """
@@ -149,8 +252,48 @@ class AppMain:
             new_height = int(width / target_ratio)
 
         self.screen = pg.display.set_mode((new_width, new_height), pg.RESIZABLE)
+        Layout.set_window_size((new_width, new_height))  # relayout the UI elements
         return new_width, new_height
 
+    def apply_pending_resize(self) -> None:
+        """
+        Apply the requested window size once the resize drag is settled.
+        """
+        if self.pending_size is None:
+            return
+        if pg.time.get_ticks() - self.resize_ticks < self.RESIZE_SETTLE_TIME:
+            return
+        self.adjust_window_size(*self.pending_size)
+        self.pending_size = None
+        self.canvas = None
+
+    def get_canvas(self) -> pg.Surface:
+        """
+        Get the offscreen surface of the current layout size, to draw the scene during a resize drag.
+
+        Returns:
+            pg.Surface: Offscreen surface
+        """
+        size = Layout.get_window_size()
+        if self.canvas is None or self.canvas.get_size() != size:
+            self.canvas = pg.Surface(size)
+        return self.canvas
+
+    def draw_resize_preview(self) -> None:
+        """
+        Draw the scene drawn on the canvas scaled to the window, as a cheap preview during a resize drag.
+        """
+        window = pg.display.get_surface()
+        width, height = window.get_size()
+        canvas_width, canvas_height = self.canvas.get_size()
+        scale = min(width / canvas_width, height / canvas_height)
+        size = (max(int(canvas_width * scale), 1), max(int(canvas_height * scale), 1))
+        window.fill(cfg.COLOR_PALE_GRAY)
+        window.blit(
+            pg.transform.scale(self.canvas, size),
+            ((width - size[0]) // 2, (height - size[1]) // 2),
+        )
+
     def handle_common_events(self):
         """
         Process events common to all scenes.
@@ -163,8 +306,12 @@ class AppMain:
                 if ask_whether_to_exit():
                     return SCENE_STATE.EXIT
             elif event.type == pg.VIDEORESIZE:
-                # Maintain aspect ratio when window is resized
-                self.adjust_window_size(event.w, event.h)
+                # Coalesce the resize events during a drag, and apply the last one when it is settled.
+                # (the aspect ratio is maintained when it is applied)
+                size = (event.w, event.h)
+                if self.pending_size is not None or size != Layout.get_window_size():
+                    self.pending_size = size
+                    self.resize_ticks = pg.time.get_ticks()
 
             # Pass event to current scene for scene-specific handling
             result = self.scene.handle_event(event)
@@ -183,23 +330,82 @@ class AppMain:
         if new_state == self.current_state:
             return
 
-        # Store old scene for data transfer if needed
+        # Store old scene for data transfer if needed, and keep it in the pool
         old_scene = self.scene
+        old_scene.suspend()
+        self.scenes[self.current_state] = old_scene
+        pooled = self.scenes.get(new_state)
+        scene = None
 
-        # Create new scene based on state
+        # Resume the pooled scene if it shows the same data, or create new scene based on state
         if new_state == SCENE_STATE.TOP:
-            self.scene = TopScene()
+            scene = pooled or TopScene(self.settings)
         elif new_state == SCENE_STATE.BRIEFING:
             # When transitioning to Briefing, get ork file from previous scene
-            if isinstance(old_scene, TopScene) and hasattr(old_scene, "ork_file"):
-                self.scene = BriefingScene(old_scene.ork_file)
+            if isinstance(old_scene, LibraryScene):
+                ork_file = old_scene.ork_file
+            elif isinstance(old_scene, GameScene) and old_scene.rocket:
+                ork_file = Path(old_scene.rocket.file_path)
+            else:
+                ork_file = None
+            if ork_file and pooled and pooled.is_for(ork_file):
+                scene = pooled
             else:
-                self.scene = BriefingScene()
+                scene = BriefingScene(self.settings, ork_file)
         elif new_state == SCENE_STATE.GAME:
-            self.scene = GameScene()
-
+            # When transitioning to Game, play back the rocket simulated in the briefing
+            rocket = old_scene.rocket if isinstance(old_scene, BriefingScene) else None
+            if rocket and pooled and pooled.is_for(rocket):
+                scene = pooled  # pre-warmed while the briefing is shown
+            else:
+                scene = GameScene(self.settings, rocket)
+        elif new_state == SCENE_STATE.COMPARISON:
+            # When transitioning to Comparison, get ork files from previous scene
+            ork_files = old_scene.ork_files if isinstance(old_scene, TopScene) else []
+            if ork_files and pooled and pooled.is_for(ork_files):
+                scene = pooled
+            else:
+                scene = ComparisonScene(self.settings, ork_files)
+        elif new_state == SCENE_STATE.LIBRARY:
+            scene = pooled or LibraryScene(self.settings)
+
+        if scene is pooled:
+            # the scene requested the transition when it was left
+            scene.state = new_state
+            if scene.settings != self.settings:
+                scene.apply_settings(self.settings)
+            scene.resume()
+        self.scene = scene
+        self.scenes[new_state] = scene
         self.current_state = new_state
 
+    def prewarm_next_scene(self) -> None:
+        """
+        Pre-warm the likely next scene while the current scene is shown.
+        The game scene is prepared once the simulation result in the briefing is final.
+        """
+        if not isinstance(self.scene, BriefingScene) or not self.scene.is_settled():
+            return
+        game = self.scenes.get(SCENE_STATE.GAME)
+        if isinstance(game, GameScene) and game.is_for(self.scene.rocket):
+            return
+        game = GameScene(self.settings, self.scene.rocket)
+        game.prewarm()
+        self.scenes[SCENE_STATE.GAME] = game
+
+    def reload_settings(self) -> None:
+        """
+        Reload the settings if settings.toml is modified, and apply them to the current scene.
+        """
+        settings = self.settings_watcher.poll()
+        if settings is None:
+            return
+        print("Settings reloaded.")
+        if settings.render != self.settings.render:
+            self.render_scaler.apply_settings(settings.render)
+        self.settings = settings
+        self.scene.apply_settings(settings)
+
     def run(self) -> None:
         """
         Run the main application loop.
@@ -209,22 +415,51 @@ class AppMain:
 
         while True:
             clock.tick(fps)
+            if not self.run_frame():
+                break
+
+        pg.quit()
+
+    def run_frame(self) -> bool:
+        """
+        Run one frame of the main loop (also used to drive the application from the benchmark).
+
+        Returns:
+            bool: False if the application should exit, True otherwise
+        """
+        tracker = self.allocation_tracker
+        start = time.perf_counter()
+        with allocation_phase(tracker, "events"):
+            # Apply the modified settings without restarting
+            self.reload_settings()
 
             # Process common events
             result = self.handle_common_events()
             if result:
                 if result == SCENE_STATE.EXIT or result == SCENE_STATE.QUIT:
-                    break
+                    return False
                 # Handle scene transition
                 self.switch_scene(result)
 
-            # Execute current scene
-            new_state = self.scene.exec(self.screen)
+            # Apply the window size when the resize drag is settled
+            self.apply_pending_resize()
+
+        # Execute current scene (scaled preview during a resize drag)
+        if self.pending_size is None:
+            new_state = self.scene.exec(self.screen, tracker, self.render_scaler)
+        else:
+            new_state = self.scene.exec(self.get_canvas(), tracker, self.render_scaler)
+            self.draw_resize_preview()
+
+        with allocation_phase(tracker, "display"):
+            pg.display.update()
             if new_state != self.current_state:
                 # Handle scene transition requested by scene
                 self.switch_scene(new_state)
-
-        pg.quit()
+            else:
+                self.prewarm_next_scene()
+        self.render_scaler.record((time.perf_counter() - start) * 1000)
+        return True
 
 
 class TopScene(Scene):
@@ -232,13 +467,16 @@ class TopScene(Scene):
     Initial scene of the application.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, settings: Settings) -> None:
         """
         Initialize the top scene.
+
+        Args:
+            settings: Application settings
         """
-        super().__init__()
+        super().__init__(settings)
         self.state = SCENE_STATE.TOP
-        self.ork_file: Path = Path("")
+        self.ork_files: list[Path] = []
 
         self.FTE_icon = ui_elements.BackgruondLogo()
         self.settings_button = ui_elements.Button(
@@ -246,7 +484,7 @@ class TopScene(Scene):
             (0, 0),
             4,
         )
-        self.settings_button.set_callback(lambda: self.set_ork_file())
+        self.settings_button.set_callback(lambda: self.open_library())
 
         self.oepn_file_text = ui_elements.UI_Text(
             "  orkファイルを開く | Open ork File  ",
@@ -257,7 +495,17 @@ class TopScene(Scene):
             True,
             underline=True,
         )
-        self.oepn_file_text.set_callback(lambda: self.set_ork_file())
+        self.oepn_file_text.set_callback(lambda: self.open_library())
+        self.compare_text = ui_elements.UI_Text(
+            "  複数比較 | Compare Rockets  ",
+            "r_Mplus_medium",
+            2.5,
+            cfg.COLOR_GRAY2,
+            (50, 85),
+            True,
+            underline=True,
+        )
+        self.compare_text.set_callback(lambda: self.set_ork_files())
         self.title = ui_elements.UI_Text(
             "From The Earth\nOpenRocket Visualizer",
             "oswald",
@@ -272,14 +520,24 @@ class TopScene(Scene):
             cfg.TEXT_COPYRIGHT, "oswald", 1.25, cfg.COLOR_GRAY1, (87.5, 97)
         )
 
-    def set_ork_file(self):
+    def open_library(self):
         """
-        Open an ORK file dialog and set the file path.
+        Open the library to pick an ORK file.
         """
-        self.ork_file = Path(open_ork_file())
-        if self.ork_file.exists() and self.ork_file.suffix == ".ork":
-            print(f"Open file: {self.ork_file}")
-            self.state = SCENE_STATE.BRIEFING  # next scene
+        self.state = SCENE_STATE.LIBRARY  # next scene
+
+    def set_ork_files(self):
+        """
+        Open an ORK file dialog to select several files for the comparison.
+        """
+        self.ork_files = [
+            Path(file)
+            for file in open_ork_files()
+            if Path(file).exists() and Path(file).suffix == ".ork"
+        ]
+        if self.ork_files:
+            print(f"Compare files: {[str(file) for file in self.ork_files]}")
+            self.state = SCENE_STATE.COMPARISON  # next scene
 
     def handle_event(self, event) -> SCENE_STATE:
         """
@@ -299,6 +557,8 @@ class TopScene(Scene):
             self.settings_button.event_handler(event=event)
         if hasattr(self.oepn_file_text, "event_handler"):
             self.oepn_file_text.event_handler(event)
+        if hasattr(self.compare_text, "event_handler"):
+            self.compare_text.event_handler(event)
         return None
 
     def update(self) -> None:
@@ -309,6 +569,7 @@ class TopScene(Scene):
         self.settings_button.update()
         self.title.update()
         self.oepn_file_text.update()
+        self.compare_text.update()
         self.copyright.update()
 
     def draw(self, screen: pg.Surface) -> None:
@@ -321,24 +582,340 @@ class TopScene(Scene):
         self.FTE_icon.draw(screen)
         self.settings_button.draw(screen)
         self.oepn_file_text.draw(screen)
+        self.compare_text.draw(screen)
         self.title.draw(screen)
         self.copyright.draw(screen)
 
 
+class LibraryScene(Scene):
+    """
+    Library scene that lists the indexed ork files to pick a rocket, instead of the file dialog.
+    """
+
+    LIST_AREA = (5, 16, 90, 72)  # left, top, width and height of the list (percentage)
+    ROWS = 8  # number of the rows in the list area
+    THUMBNAIL_WIDTH = 0.22  # width of the thumbnail vs. row width
+
+    def __init__(self, settings: Settings) -> None:
+        """
+        Initialize the library scene and start scanning the library directories.
+
+        Args:
+            settings: Application settings
+        """
+        super().__init__(settings)
+        self.state = SCENE_STATE.LIBRARY
+        self.ork_file: Path = Path("")
+        self.query = ""  # search text
+        self.entries: list[LibraryEntry] = []
+        self.scroll = 0  # index of the first shown row
+        self.selected = 0  # index of the selected row
+        self.window_size: tuple[int, int] = None
+        self.row_images: dict[tuple[str, int], pg.Surface] = {}  # rendered rows
+        self.index = LibraryIndex(settings.library.index_file)
+        self.scanner: LibraryScanner = None
+        self.generation = -1  # generation of the index shown in the list
+
+        self.back_icon = ui_elements.Button(
+            ui_elements.load_transparent_img("img/back.png", cfg.COLOR_GRAY1),
+            (0, 0),
+            4,
+        )
+        self.back_icon.set_callback(lambda: self.back_to_top())
+        self.back_icon_text = ui_elements.UI_Text(
+            "戻る | Back", "r_Mplus_regular", 3, cfg.COLOR_GRAY1, (4, 0)
+        )
+        self.back_icon_text.set_callback(lambda: self.back_to_top())
+        self.title = ui_elements.UI_Text(
+            "ライブラリ | Library", "r_Mplus_medium", 3, cfg.COLOR_BLACK, (50, 2), True
+        )
+        self.search_text = ui_elements.UI_Text(
+            "", "r_Mplus_regular", 2, cfg.COLOR_BLACK, (5, 10)
+        )
+        self.status_text = ui_elements.UI_Text(
+            "", "r_Mplus_regular", 1.5, cfg.COLOR_GRAY2, (70, 10.5)
+        )
+        self.browse_text = ui_elements.UI_Text(
+            "  ファイルを参照 | Browse...  ",
+            "r_Mplus_medium",
+            2,
+            cfg.COLOR_GRAY2,
+            (50, 92),
+            True,
+            underline=True,
+        )
+        self.browse_text.set_callback(lambda: self.browse())
+        self.set_search_text()
+        self.start_scan()
+
+    def start_scan(self) -> None:
+        """
+        Start scanning the library directories in the background.
+        """
+        self.scanner = LibraryScanner(
+            self.settings.library.index_file, self.settings.library.directories
+        ).start()
+
+    def apply_settings(self, settings: Settings) -> None:
+        """
+        Apply the reloaded settings. The library is scanned again if the [library] section is changed.
+
+        Args:
+            settings: New application settings
+        """
+        library_changed = settings.library != self.settings.library
+        super().apply_settings(settings)
+        if library_changed:
+            self.index.close()
+            self.index = LibraryIndex(settings.library.index_file)
+            self.generation = -1
+            self.start_scan()
+
+    def resume(self) -> None:
+        """
+        Scan the library again, since the files may have been modified while suspended.
+        """
+        self.ork_file = Path("")
+        if not self.scanner.is_running:
+            self.start_scan()
+
+    def back_to_top(self):
+        """
+        Return to the top scene.
+        """
+        self.state = SCENE_STATE.TOP
+
+    def browse(self):
+        """
+        Open an ORK file dialog for the file outside of the library.
+        """
+        self.pick(Path(open_ork_file()))
+
+    def pick(self, ork_file: Path) -> None:
+        """
+        Open the ork file in the briefing scene.
+
+        Args:
+            ork_file: Path to the ork file
+        """
+        if ork_file.exists() and ork_file.suffix == ".ork":
+            print(f"Open file: {ork_file}")
+            self.ork_file = ork_file
+            self.state = SCENE_STATE.BRIEFING  # next scene
+
+    def set_search_text(self) -> None:
+        """
+        Show the search text.
+        """
+        self.search_text.set_text(f"検索 | Search:  {self.query}_")
+
+    def refresh(self) -> None:
+        """
+        Query the index with the search text.
+        """
+        self.entries = self.index.entries(self.query)
+        self.selected = min(self.selected, max(len(self.entries) - 1, 0))
+        self.scroll = min(self.scroll, max(len(self.entries) - self.ROWS, 0))
+        if self.scanner.is_running:
+            status = f"スキャン中 | Scanning:  {self.scanner.read} files"
+        else:
+            status = f"{len(self.entries)} rockets"
+        self.status_text.set_text(status)
+
+    def row_rect(self, row: int) -> pg.Rect:
+        """
+        Get the rect of the row in the list area.
+
+        Args:
+            row: Index of the row in the list area
+
+        Returns:
+            pg.Rect: Rect of the row
+        """
+        width, height = Layout.get_window_size()
+        left, top, area_width, area_height = self.LIST_AREA
+        row_height = height * area_height / 100 / self.ROWS
+        return pg.Rect(
+            int(width * left / 100),
+            int(height * top / 100 + row * row_height),
+            int(width * area_width / 100),
+            int(row_height),
+        )
+
+    def render_row(self, entry: LibraryEntry, size: tuple[int, int]) -> pg.Surface:
+        """
+        Render the row of the entry with the thumbnail.
+
+        Args:
+            entry: Indexed ork file
+            size: Size of the row
+
+        Returns:
+            pg.Surface: Rendered row
+        """
+        width, height = size
+        image = pg.Surface(size, pg.SRCALPHA)
+        thumbnail_width = int(width * self.THUMBNAIL_WIDTH)
+        image.blit(
+            render_thumbnail(
+                entry, (thumbnail_width, int(height * 0.8)), cfg.COLOR_GRAY2
+            ),
+            (0, int(height * 0.1)),
+        )
+        name_font = Fonts.get_font("r_Mplus_medium", int(height * 0.36))
+        detail_font = Fonts.get_font("r_Mplus_regular", int(height * 0.26))
+        x = thumbnail_width + int(width * 0.02)
+        image.blit(name_font.render(entry.name, True, cfg.COLOR_BLACK), (x, 0))
+        detail = (
+            f"L {entry.length * 1000:.0f} mm   Φ {entry.diameter * 1000:.0f} mm   "
+            f"~{entry.mass * 1000:.0f} g   {entry.motor or '-'}   "
+            f"{Path(entry.path).name}"
+        )
+        image.blit(
+            detail_font.render(detail, True, cfg.COLOR_GRAY2),
+            (x, int(height * 0.55)),
+        )
+        return image
+
+    def row_at(self, pos: tuple[int, int]) -> int | None:
+        """
+        Get the index of the entry at the position.
+
+        Args:
+            pos: Position on the screen
+
+        Returns:
+            int | None: Index of the entry, or None if no entry is at the position
+        """
+        for row in range(self.ROWS):
+            index = self.scroll + row
+            if index < len(self.entries) and self.row_rect(row).collidepoint(pos):
+                return index
+        return None
+
+    def select(self, index: int) -> None:
+        """
+        Select the entry and scroll to show it.
+
+        Args:
+            index: Index of the entry
+        """
+        if not self.entries:
+            return
+        self.selected = min(max(index, 0), len(self.entries) - 1)
+        self.scroll = min(
+            max(self.scroll, self.selected - self.ROWS + 1), self.selected
+        )
+
+    def handle_event(self, event) -> SCENE_STATE:
+        """
+        Process events for the library scene.
+
+        Args:
+            event: Pygame event to process
+
+        Returns:
+            SCENE_STATE: New scene state if transition is needed, None otherwise
+        """
+        if event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE:
+            return SCENE_STATE.TOP  # instead of asking whether to exit
+        result = super().handle_event(event)
+        if result:
+            return result
+
+        self.back_icon.event_handler(event)
+        self.back_icon_text.event_handler(event)
+        self.browse_text.event_handler(event)
+
+        if event.type == pg.MOUSEWHEEL:
+            limit = max(len(self.entries) - self.ROWS, 0)
+            self.scroll = min(max(self.scroll - event.y, 0), limit)
+        elif event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
+            index = self.row_at(event.pos)
+            if index is not None:
+                self.pick(Path(self.entries[index].path))
+        elif event.type == pg.KEYDOWN:
+            if event.key == pg.K_UP:
+                self.select(self.selected - 1)
+            elif event.key == pg.K_DOWN:
+                self.select(self.selected + 1)
+            elif event.key == pg.K_RETURN:
+                if self.entries:
+                    self.pick(Path(self.entries[self.selected].path))
+            elif event.key == pg.K_BACKSPACE:
+                self.query = self.query[:-1]
+                self.set_search_text()
+                self.refresh()
+            elif event.unicode and event.unicode.isprintable():
+                self.query += event.unicode
+                self.set_search_text()
+                self.refresh()
+        return None
+
+    def update(self) -> None:
+        """
+        Update the list when the index is updated by the scanner.
+        """
+        self.back_icon.update()
+        self.back_icon_text.update()
+        self.title.update()
+        self.search_text.update()
+        self.status_text.update()
+        self.browse_text.update()
+
+        if self.generation != self.scanner.generation:
+            self.generation = self.scanner.generation
+            self.refresh()
+        if self.window_size != Layout.get_window_size():
+            self.window_size = Layout.get_window_size()
+            self.row_images = {}  # rendered again at the new size
+
+    def draw(self, screen: pg.Surface) -> None:
+        """
+        Draw the scene elements. Only the shown rows are rendered (once for each window size).
+
+        Args:
+            screen: Pygame surface to draw on
+        """
+        mouse = pg.mouse.get_pos()
+        for row in range(self.ROWS):
+            index = self.scroll + row
+            if index >= len(self.entries):
+                break
+            entry = self.entries[index]
+            rect = self.row_rect(row)
+            if index == self.selected or rect.collidepoint(mouse):
+                pg.draw.rect(screen, cfg.COLOR_PALE_GRAY, rect)
+            key = (entry.path, entry.mtime)
+            if key not in self.row_images:
+                self.row_images[key] = self.render_row(entry, rect.size)
+            screen.blit(self.row_images[key], rect)
+        self.back_icon.draw(screen)
+        self.back_icon_text.draw(screen)
+        self.title.draw(screen)
+        self.search_text.draw(screen)
+        self.status_text.draw(screen)
+        self.browse_text.draw(screen)
+
+
 class BriefingScene(Scene):
     """
     Briefing scene that displays rocket information.
     """
 
-    def __init__(self, ork_file: Path = None) -> None:
+    def __init__(self, settings: Settings, ork_file: Path = None) -> None:
         """
         Initialize the briefing scene.
 
         Args:
+            settings: Application settings
             ork_file: Path to ORK file, or None if not available
         """
-        super().__init__()
+        super().__init__(settings)
         self.state = SCENE_STATE.BRIEFING
+        self.refinement: ProgressiveSimulation = None
+        self.ork_file: Path = ork_file
+        self.ork_mtime: float = None  # to detect the modified file when resumed
 
         if ork_file and ork_file.exists() and ork_file.suffix == ".ork":
             self.run_simulation(ork_file)
@@ -371,8 +948,11 @@ class BriefingScene(Scene):
         Args:
             ork_file: Path to the ORK file
         """
-        self.rocket = Rocket(ork_file)
-        self.rocket.run_simulation()
+        self.ork_mtime = Path(ork_file).stat().st_mtime
+        self.rocket = Rocket(ork_file, self.settings)
+        self.rocket.load()
+        # show the coarse preview first, and refine it in the background
+        self.refinement = self.rocket.simulate_progressive()
         self.rocket.drawing_size = 0.75
         self.specification = ui_elements.UI_Text(
             " 諸元 | Specification                          ",
@@ -403,18 +983,33 @@ class BriefingScene(Scene):
             (40, 50),
             underline=True,
         )
-        flight_profile_text = f"""
-飛行時間 | Flight Time:  {self.rocket.flight_time:.1f} s
-最高高度 | Max Altitude:  {self.rocket.max_altitude:.1f} m
-最高速度 | Max Velocity:  {self.rocket.max_velocity:.1f} m/s
-"""
         self.flight_profile_detail = ui_elements.UI_Text(
-            flight_profile_text,
+            self.flight_profile_text(),
             "r_Mplus_regular",
             3.5,
             cfg.COLOR_BLACK,
             (42.5, 52.5),
         )
+        self.event_timeline = ui_elements.TimelineBar(42.5, 85, 93, cursor_color=None)
+
+        # charts shown instead of the texts by the C key (rendered in the background)
+        self.show_charts = False
+        self.charts_hint = ui_elements.UI_Text(
+            "C: グラフ | Charts", "r_Mplus_regular", 1.5, cfg.COLOR_GRAY2, (85, 2)
+        )
+        self.chart_titles = [
+            ui_elements.UI_Text(title, "r_Mplus_medium", 2, cfg.COLOR_BLACK, (42.5, y))
+            for title, y in [
+                ("高度 | Altitude [m]", 8),
+                ("速度 | Velocity [m/s]", 35),
+                ("迎角 | Angle of Attack [deg]", 62),
+            ]
+        ]
+        self.charts = [
+            BackgroundChart((42.5, y, 52.5, 19), [cfg.COLOR_ACCENT])
+            for y in (12, 39, 66)
+        ]
+        self.show_result()
 
         self.FTE_icon = ui_elements.BackgruondLogo()
         self.copyright = ui_elements.UI_Text(
@@ -433,6 +1028,114 @@ class BriefingScene(Scene):
         )
         self.back_icon_text.set_callback(lambda: self.back_to_top())
 
+    def flight_profile_text(self) -> str:
+        """
+        Make the text of the flight profile from the simulation result.
+
+        Returns:
+            str: Text of the flight profile
+        """
+        text = f"""
+飛行時間 | Flight Time:  {self.rocket.flight_time:.1f} s
+最高高度 | Max Altitude:  {self.rocket.max_altitude:.1f} m
+最高速度 | Max Velocity:  {self.rocket.max_velocity:.1f} m/s
+"""
+        if self.refinement is None:
+            return text
+        if self.refinement.is_running:
+            text += "(精密計算中 | Refining...)\n"
+        elif self.refinement.apogee_difference is not None:
+            text += f"(プレビュー差 | Preview Diff:  {self.refinement.apogee_difference:+.1f} m)\n"
+        return text
+
+    def show_result(self) -> None:
+        """
+        Show the current simulation result on the flight profile, the event timeline and the charts.
+        The charts are rendered again in the background, and the previous ones are shown until then.
+        """
+        self.flight_profile_detail.set_text(self.flight_profile_text())
+        if self.rocket.events is not None:
+            self.event_timeline.set_markers(
+                event_markers(self.rocket.events, 0.0, self.rocket.flight_time, True)
+            )
+
+        flight_data = self.rocket.flight_data
+        time = np.asarray(flight_data[FlightDataType.TYPE_TIME])
+        order = np.argsort(time, kind="stable")
+        columns = [
+            np.asarray(flight_data[FlightDataType.TYPE_ALTITUDE]),
+            np.asarray(flight_data[TOTAL_VELOCITY]),
+            np.degrees(flight_data[FlightDataType.TYPE_AOA]),
+        ]
+        for chart, column in zip(self.charts, columns):
+            chart.set_series(time[order], [column[order]])
+
+    def apply_settings(self, settings: Settings) -> None:
+        """
+        Apply the reloaded settings.
+        Only the simulation is re-run on the loaded document when the [simulation] section is changed.
+
+        Args:
+            settings: New application settings
+        """
+        simulation_changed = settings.simulation != self.settings.simulation
+        super().apply_settings(settings)
+
+        if self.rocket and simulation_changed:
+            print("Simulation settings changed. Re-running the simulation...")
+            self.refinement = self.rocket.simulate_progressive(settings.simulation)
+            self.show_result()
+
+    def apply_refined_result(self) -> None:
+        """
+        Replace the preview result with the refined one when the background simulation is finished.
+        """
+        if self.refinement is None:
+            return
+        if self.refinement.error is not None:
+            # keep the preview result
+            self.refinement = None
+            self.flight_profile_detail.set_text(self.flight_profile_text())
+            return
+        result = self.refinement.poll()
+        if result is None:
+            return
+        self.rocket.apply_result(result)
+        print(
+            f"Refined simulation finished in {result.elapsed:.2f} s "
+            f"(apogee diff from preview: {self.refinement.apogee_difference:+.2f} m)"
+        )
+        self.show_result()
+
+    def is_for(self, ork_file: Path) -> bool:
+        """
+        Check whether the scene shows the given file, to resume it instead of loading the file again.
+
+        Args:
+            ork_file: Path to the ORK file
+
+        Returns:
+            bool: True if the scene can be resumed for the file
+        """
+        if self.rocket is None or not ork_file.exists():
+            return False
+        return (
+            ork_file.resolve() == Path(self.ork_file).resolve()
+            and ork_file.stat().st_mtime == self.ork_mtime
+        )
+
+    def is_settled(self) -> bool:
+        """
+        Check whether the simulation result is final (the refinement is finished and applied).
+
+        Returns:
+            bool: True if the result will not be replaced
+        """
+        if self.rocket is None or self.rocket.flight_data is None:
+            return False
+        refinement = self.refinement
+        return refinement is None or self.rocket.result is refinement.refined
+
     def back_to_top(self):
         """
         Return to the top scene.
@@ -463,6 +1166,8 @@ class BriefingScene(Scene):
                 return SCENE_STATE.TOP
             if event.key == pg.K_RETURN:
                 return SCENE_STATE.GAME
+            if event.key == pg.K_c and self.rocket:
+                self.show_charts = not self.show_charts
         return None
 
     def update(self) -> None:
@@ -475,12 +1180,20 @@ class BriefingScene(Scene):
         self.back_icon_text.update()
 
         if self.rocket:
+            self.apply_refined_result()
             t = pg.time.get_ticks() / 1000.0
             self.rocket.update(np.array([0.2, 0.5]), t * 360 * 3, 15, 0)
             self.specification.update()
             self.spec_detail.update()
             self.flight_profile.update()
             self.flight_profile_detail.update()
+            self.event_timeline.update()
+            self.charts_hint.update()
+            for chart in self.charts:
+                chart.update()  # rendered in the background even while hidden
+            if self.show_charts:
+                for title in self.chart_titles:
+                    title.update()
 
     def draw(self, screen: pg.Surface) -> None:
         """
@@ -496,23 +1209,284 @@ class BriefingScene(Scene):
 
         if self.rocket:
             self.rocket.draw(screen)
-            self.specification.draw(screen)
-            self.spec_detail.draw(screen)
-            self.flight_profile.draw(screen)
-            self.flight_profile_detail.draw(screen)
+            if self.show_charts:
+                for title, chart in zip(self.chart_titles, self.charts):
+                    title.draw(screen)
+                    chart.draw(screen)
+            else:
+                self.specification.draw(screen)
+                self.spec_detail.draw(screen)
+                self.flight_profile.draw(screen)
+                self.flight_profile_detail.draw(screen)
+            self.event_timeline.draw(screen)
+            self.charts_hint.draw(screen)
 
 
 class GameScene(Scene):
     """
-    Flight simulation game scene.
+    Flight playback scene.
     """
 
-    def __init__(self) -> None:
+    GROUND_LEVEL = 0.85  # vertical position of the ground vs. window height
+    VIEW_AREA = 0.75  # height of the view area vs. window height
+    MIN_ROCKET_SIZE = 16  # minimum length of the rocket on the screen (unit: px)
+    SPEEDS = [0.25, 0.5, 1, 2, 4, 8]  # playback speeds
+    SCALED_WORLD = True  # the sky covers the whole world
+
+    def __init__(self, settings: Settings, rocket: Rocket = None) -> None:
         """
         Initialize the game scene.
+
+        Args:
+            settings: Application settings
+            rocket: Simulated rocket to play back, or None if not available
         """
-        super().__init__()
+        super().__init__(settings)
         self.state = SCENE_STATE.GAME
+        self.rocket = rocket
+        self.timeline: Timeline = None
+        self.trajectory: Trajectory = None
+        self.time = 0.0
+        self.speed_index = self.SPEEDS.index(1)
+        self.direction = 1  # 1: forward, -1: reverse
+        self.playing = True
+        self.last_ticks = pg.time.get_ticks()
+        self.zoom = 1.0  # zoom factor by the mouse wheel
+        self.altitude = 0.0
+        self.velocity = 0.0
+        self.ground_y = 0
+        self.pixels_per_meter = 0.0
+        self.background = SkyBackground(settings.game.max_altitude)
+        self.flight_log: FlightLog = None  # real flight log overlaid on the playback
+        self.log_loader: FlightLogLoader = None
+        self.log_altitude: np.ndarray = None  # log altitude at the sorted samples
+        self.log_progress = -1  # percentage of the loaded log shown in the text
+        self.ground_track: GroundTrack = None  # top-down view toggled by the G key
+        self.show_ground_track = False
+        self.events: FlightEventIndex = None
+        # times of the key events to jump to (in time order)
+        self.event_times = np.zeros(0)
+
+        self.flight_data = rocket.flight_data if rocket else None  # played back data
+        if self.flight_data is not None:
+            self.timeline = Timeline(self.flight_data)
+            self.trajectory = Trajectory.from_timeline(self.timeline, self.flight_data)
+            self.time = self.timeline.start
+            self.events = rocket.events
+            self.event_times = np.array([t for _, t in self.events.key_events()])
+            order = self.timeline.sample_order
+            self.ground_track = GroundTrack(
+                (70, 42, 27, 43),
+                np.asarray(self.flight_data[FlightDataType.TYPE_POSITION_X])[order],
+                np.asarray(self.flight_data[FlightDataType.TYPE_POSITION_Y])[order],
+                self.position_at(self.events.index_of(FlightEvent.APOGEE)),
+            )
+
+        self.back_icon = ui_elements.Button(
+            ui_elements.load_transparent_img("img/back.png", cfg.COLOR_GRAY1),
+            (0, 0),
+            4,
+        )
+        self.back_icon.set_callback(lambda: self.back_to_briefing())
+        self.back_icon_text = ui_elements.UI_Text(
+            "戻る | Back", "r_Mplus_regular", 3, cfg.COLOR_GRAY1, (4, 0)
+        )
+        self.back_icon_text.set_callback(lambda: self.back_to_briefing())
+        self.hud_text = ui_elements.TelemetryText(
+            "T+ {:6.1f} s  {:7.1f} m  {:6.1f} m/s  x{:<5g}",
+            "oswald",
+            2,
+            cfg.COLOR_BLACK,
+            (55, 3),
+        )
+        self.hud_text.set_values(*self.hud_values())
+        self.timeline_bar = ui_elements.TimelineBar(10, 90, 95)
+        self.timeline_bar.set_callback(lambda ratio: self.seek_ratio(ratio))
+        if self.timeline is not None:
+            self.timeline_bar.set_markers(
+                event_markers(self.events, self.timeline.start, self.timeline.duration)
+            )
+        self.log_text = ui_elements.UI_Text(
+            "L: 実測ログ | Flight Log", "r_Mplus_regular", 1.5, cfg.COLOR_GRAY2, (70, 8)
+        )
+        self.log_chart = ui_elements.LineChart(
+            (70, 18, 27, 20), [cfg.COLOR_GRAY2, cfg.COLOR_ACCENT]
+        )
+
+    def is_for(self, rocket: Rocket) -> bool:
+        """
+        Check whether the scene plays back the current result of the given rocket.
+
+        Args:
+            rocket: Simulated rocket
+
+        Returns:
+            bool: True if the scene can be resumed for the rocket
+        """
+        return self.rocket is rocket and self.flight_data is rocket.flight_data
+
+    def apply_settings(self, settings: Settings) -> None:
+        """
+        Apply the reloaded settings. The background is rescaled to the new maximum altitude.
+
+        Args:
+            settings: New application settings
+        """
+        super().apply_settings(settings)
+        self.background.set_max_altitude(settings.game.max_altitude)
+
+    def prewarm(self) -> None:
+        """
+        Lay out the UI elements and render the background tiles at the current window size before the scene is shown.
+        """
+        self.background.update()
+        self.back_icon.update()
+        self.back_icon_text.update()
+        self.hud_text.update()
+        self.timeline_bar.update()
+        self.log_text.update()
+        if self.show_ground_track:
+            self.ground_track.update()
+
+    def resume(self) -> None:
+        """
+        Restart the playback clock, so that the time while suspended is not played.
+        """
+        self.last_ticks = pg.time.get_ticks()
+
+    def back_to_briefing(self):
+        """
+        Return to the briefing scene.
+        """
+        self.state = SCENE_STATE.BRIEFING
+
+    def open_flight_log(self) -> None:
+        """
+        Select a flight log and start loading it in the background.
+        """
+        log_file = open_log_file()
+        if not log_file or self.timeline is None:
+            return
+        print(f"Loading the flight log: {log_file}")
+        self.log_loader = FlightLogLoader(log_file).start()
+        self.log_progress = -1
+
+    def set_flight_log(self, flight_log: FlightLog) -> None:
+        """
+        Overlay the loaded flight log and compare it with the simulation.
+
+        Args:
+            flight_log: Loaded flight log
+        """
+        self.flight_log = flight_log
+        time = self.timeline.time
+        altitude = np.nan_to_num(
+            np.asarray(self.flight_data[FlightDataType.TYPE_ALTITUDE])[
+                self.timeline.sample_order
+            ]
+        )
+        self.log_altitude = flight_log.aligned(time, altitude)
+        comparison = flight_log.compare(time, altitude)
+        self.log_text.set_text(
+            f"実測 | Log: {Path(flight_log.path).name}\n"
+            f"最高高度 | Apogee:  {comparison.apogee:.1f} m "
+            f"({comparison.apogee_delta:+.1f} m)\n"
+            f"到達時間 | Timing:  {comparison.apogee_time_delta:+.2f} s\n"
+            f"誤差 | RMS Error:  {comparison.rms_error:.1f} m"
+        )
+        self.log_chart.set_series(time, [altitude, self.log_altitude])
+
+    def update_flight_log(self) -> None:
+        """
+        Check the loading flight log and show the progress.
+        """
+        flight_log = self.log_loader.poll()
+        if flight_log is not None:
+            self.set_flight_log(flight_log)
+            self.log_loader = None
+        elif self.log_loader.error is not None:
+            self.log_text.set_text("ログ読込失敗 | Failed to load the log")
+            self.log_loader = None
+        elif int(self.log_loader.progress * 100) != self.log_progress:
+            self.log_progress = int(self.log_loader.progress * 100)
+            self.log_text.set_text(f"読込中 | Loading:  {self.log_progress} %")
+
+    def position_at(self, index: int | None) -> tuple[float, float] | None:
+        """
+        Get the horizontal position of the sample.
+
+        Args:
+            index: Index of the sample in the flight data, or None
+
+        Returns:
+            tuple[float, float] | None: east and north (unit: m), or None if the index is None
+        """
+        if index is None:
+            return None
+        return (
+            float(self.flight_data[FlightDataType.TYPE_POSITION_X][index]),
+            float(self.flight_data[FlightDataType.TYPE_POSITION_Y][index]),
+        )
+
+    def hud_values(self) -> tuple[float, float, float, float]:
+        """
+        Get the values of the head-up display.
+
+        Returns:
+            tuple[float, float, float, float]: time, altitude, velocity and playback speed
+        """
+        speed = self.SPEEDS[self.speed_index] * self.direction
+        return self.time, self.altitude, self.velocity, speed
+
+    def seek(self, t: float) -> None:
+        """
+        Move the playback time.
+
+        Args:
+            t: Time to move to (unit: s)
+        """
+        if self.timeline is None:
+            return
+        self.time = float(np.clip(t, self.timeline.start, self.timeline.end))
+
+    def seek_event(self, direction: int) -> None:
+        """
+        Jump to the next or the previous key event (e.g. burnout, apogee).
+
+        Args:
+            direction: 1 for the next event, -1 for the previous event
+        """
+        if self.timeline is None or len(self.event_times) == 0:
+            return
+        margin = 1e-3  # not to stay at the current event
+        if direction > 0:
+            index = np.searchsorted(self.event_times, self.time + margin)
+        else:
+            index = np.searchsorted(self.event_times, self.time - margin) - 1
+        if 0 <= index < len(self.event_times):
+            self.seek(float(self.event_times[index]))
+
+    def seek_flight_event(self, flight_event: FlightEvent) -> None:
+        """
+        Jump to the first occurrence of the flight event (nothing if it does not occur).
+
+        Args:
+            flight_event: Flight event to jump to
+        """
+        t = None if self.events is None else self.events.time_of(flight_event)
+        if t is not None:
+            self.seek(t)
+
+    def seek_ratio(self, ratio: float) -> None:
+        """
+        Move the playback time by the ratio of the flight.
+
+        Args:
+            ratio: Ratio of the flight (0 to 1)
+        """
+        if self.timeline is None:
+            return
+        self.seek(self.timeline.start + ratio * self.timeline.duration)
 
     def handle_event(self, event) -> SCENE_STATE:
         """
@@ -527,13 +1501,131 @@ class GameScene(Scene):
         result = super().handle_event(event)
         if result:
             return result
+
+        # dragging and the mouse wheel on the ground track do not move the playback
+        if self.show_ground_track and self.ground_track.event_handler(event):
+            return None
+        self.back_icon.event_handler(event)
+        self.back_icon_text.event_handler(event)
+        self.timeline_bar.event_handler(event)
+
+        if event.type == pg.KEYDOWN:
+            if event.key == pg.K_BACKSPACE:
+                return SCENE_STATE.BRIEFING
+            if event.key == pg.K_SPACE:
+                self.playing = not self.playing
+            if event.key == pg.K_r:
+                self.direction *= -1  # reverse playback
+            if event.key == pg.K_UP:
+                self.speed_index = min(self.speed_index + 1, len(self.SPEEDS) - 1)
+            if event.key == pg.K_DOWN:
+                self.speed_index = max(self.speed_index - 1, 0)
+            if event.key == pg.K_LEFT:
+                self.seek(self.time - 1)
+            if event.key == pg.K_RIGHT:
+                self.seek(self.time + 1)
+            if event.key == pg.K_HOME:
+                self.seek_ratio(0)
+            if event.key == pg.K_END:
+                self.seek_ratio(1)
+            if event.key == pg.K_l:
+                self.open_flight_log()
+            if event.key == pg.K_g and self.ground_track is not None:
+                self.show_ground_track = not self.show_ground_track
+            if event.key == pg.K_PAGEDOWN:
+                self.seek_event(1)
+            if event.key == pg.K_PAGEUP:
+                self.seek_event(-1)
+            if pg.K_1 <= event.key < pg.K_1 + len(KEY_EVENTS):
+                self.seek_flight_event(KEY_EVENTS[event.key - pg.K_1])
+        if event.type == pg.MOUSEWHEEL:
+            self.zoom = float(np.clip(self.zoom * 1.1**event.y, 0.05, 20))
         return None
 
     def update(self) -> None:
         """
         Update the game state.
         """
-        pass
+        self.back_icon.update()
+        self.back_icon_text.update()
+        self.timeline_bar.update()
+
+        ticks = pg.time.get_ticks()
+        if self.playing and not self.timeline_bar.dragging:
+            speed = self.SPEEDS[self.speed_index] * self.direction
+            self.seek(self.time + (ticks - self.last_ticks) / 1000 * speed)
+        self.last_ticks = ticks
+
+        if self.timeline is not None:
+            self.timeline_bar.set_ratio(
+                (self.time - self.timeline.start) / max(self.timeline.duration, 1e-6)
+            )
+            # render state from the keyframes (binary search + one interpolation)
+            position, rotation, scale = self.timeline.state_at(self.time)
+            self.altitude = float(position[1])
+            self.background.set_view(self.altitude, float(position[0]))
+            # the velocity column is derived (and memoized) only when it is displayed
+            self.velocity = float(
+                np.nan_to_num(
+                    self.flight_data[TOTAL_VELOCITY][
+                        self.timeline.sample_index(self.time)
+                    ]
+                )
+            )
+
+            width, height = Layout.get_render_size()
+            pixels_per_meter = height * self.VIEW_AREA * scale * self.zoom
+            self.pixels_per_meter = pixels_per_meter
+            self.ground_y = height * self.GROUND_LEVEL
+            self.trajectory.update(
+                self.time, position, pixels_per_meter, (width / 2, self.ground_y)
+            )
+            min_size = self.MIN_ROCKET_SIZE * Layout.get_render_scale()
+            rocket_scale = max(pixels_per_meter, min_size / self.rocket.length)
+            # the camera follows the rocket horizontally
+            pos = np.array(
+                [
+                    width / 2,
+                    self.ground_y
+                    - self.altitude * pixels_per_meter
+                    - rocket_scale * self.rocket.length / 2,
+                ]
+            )
+            self.rocket.update_pose(pos, rotation, rocket_scale)
+
+        self.background.update()
+        if self.log_loader is not None:
+            self.update_flight_log()
+        self.log_text.update()
+        if self.flight_log is not None:
+            self.log_chart.set_cursor(self.time)
+            self.log_chart.update()
+        if self.show_ground_track:
+            index = self.timeline.sample_index(self.time)
+            self.ground_track.set_cursor(self.position_at(index))
+            self.ground_track.update()
+        self.hud_text.set_values(*self.hud_values())
+        self.hud_text.update()
+
+    def draw_world(self, surface: pg.Surface) -> None:
+        """
+        Draw the sky, the ground, the trajectory and the rocket.
+
+        Args:
+            surface: Pygame surface to draw on
+        """
+        width, height = surface.get_size()
+        self.background.draw(surface)
+        if self.timeline is not None:
+            if self.ground_y < height:
+                pg.draw.rect(
+                    surface,
+                    cfg.COLOR_PALE_GRAY,
+                    (0, self.ground_y, width, height - self.ground_y),
+                )
+            self.trajectory.draw(surface)
+            self.draw_log_marker(surface)
+            self.rocket.draw(surface)
 
     def draw(self, screen: pg.Surface) -> None:
         """
@@ -542,4 +1634,355 @@ class GameScene(Scene):
         Args:
             screen: Pygame surface to draw on
         """
-        pass
+        self.back_icon.draw(screen)
+        self.back_icon_text.draw(screen)
+        self.hud_text.draw(screen)
+        self.timeline_bar.draw(screen)
+        if self.timeline is not None:
+            self.log_text.draw(screen)
+        if self.flight_log is not None:
+            self.log_chart.draw(screen)
+        if self.show_ground_track:
+            self.ground_track.draw(screen)
+
+    def draw_log_marker(self, screen: pg.Surface) -> None:
+        """
+        Draw the altitude of the flight log at the current time beside the rocket.
+
+        Args:
+            screen: Pygame surface to draw on
+        """
+        if self.log_altitude is None:
+            return
+        index = np.searchsorted(self.timeline.time, self.time, side="right") - 1
+        altitude = self.log_altitude[max(index, 0)]
+        if not np.isfinite(altitude):
+            return
+        width, _ = screen.get_size()
+        y = self.ground_y - altitude * self.pixels_per_meter
+        size = width * 0.02
+        pg.draw.line(
+            screen, cfg.COLOR_ACCENT, (width / 2 - size, y), (width / 2 + size, y), 2
+        )
+        pg.draw.circle(screen, cfg.COLOR_ACCENT, (width / 2 + size, y), size / 4)
+
+
+class ComparisonScene(Scene):
+    """
+    Comparison scene that plays back the flights of several rockets side by side with a shared time cursor.
+    The rockets are loaded and simulated in the background thread, and shown when all of them are ready.
+    """
+
+    ROCKET_SIZE = 0.3  # size of the longest rocket vs. window height
+    # vertical position at the ground and the highest apogee vs. window height
+    FLIGHT_AREA = (0.85, 0.3)
+
+    def __init__(self, settings: Settings, ork_files: list[Path] = None) -> None:
+        """
+        Initialize the comparison scene.
+
+        Args:
+            settings: Application settings
+            ork_files: Paths to the ORK files to compare
+        """
+        super().__init__(settings)
+        self.state = SCENE_STATE.COMPARISON
+        self.ork_files: list[Path] = list(ork_files or [])
+        self.rockets: list[Rocket] = []
+        # merged meshes for each level of detail
+        self.batches: dict[int, MeshBatch] = {}
+        self.batch: MeshBatch = None  # merged mesh selected for the current frame
+        self.timelines: list[Timeline] = []
+        self.time = 0.0  # shared time cursor (unit: s)
+        self.playing = True
+        self.last_ticks = pg.time.get_ticks()
+        self.flight_time = 0.0
+        self.max_altitude = 0.0
+        self.error: Exception = None
+        self.labels: list[ui_elements.UI_Text] = []
+        self.__thread: threading.Thread = None
+        self.__lock = threading.Lock()
+        self.__simulated: list[Rocket] = None
+
+        self.FTE_icon = ui_elements.BackgruondLogo()
+        self.copyright = ui_elements.UI_Text(
+            cfg.TEXT_COPYRIGHT, "oswald", 1.25, cfg.COLOR_GRAY1, (87.5, 97)
+        )
+        self.back_icon = ui_elements.Button(
+            ui_elements.load_transparent_img("img/back.png", cfg.COLOR_GRAY1),
+            (0, 0),
+            4,
+        )
+        self.back_icon.set_callback(lambda: self.back_to_top())
+        self.back_icon_text = ui_elements.UI_Text(
+            "戻る | Back", "r_Mplus_regular", 3, cfg.COLOR_GRAY1, (4, 0)
+        )
+        self.back_icon_text.set_callback(lambda: self.back_to_top())
+        self.status_text = ui_elements.UI_Text(
+            "", "r_Mplus_regular", 2, cfg.COLOR_GRAY2, (50, 45), True
+        )
+        self.time_text = ui_elements.TelemetryText(
+            "T+ {:6.1f} s / {:.1f} s", "oswald", 2, cfg.COLOR_BLACK, (50, 5), True
+        )
+        self.time_text.set_values(self.time, self.flight_time)
+        self.timeline_bar = ui_elements.TimelineBar(10, 90, 95)
+        self.timeline_bar.set_callback(
+            lambda ratio: self.seek(ratio * self.flight_time)
+        )
+
+        if ork_files:
+            self.start_simulations(ork_files)
+
+    def start_simulations(self, ork_files: list[Path]) -> None:
+        """
+        Start loading the ORK files and running their simulations in the background thread.
+
+        Args:
+            ork_files: Paths to the ORK files
+        """
+        # start JVM before the workers
+        OpenRocket.get_helper(self.settings.openrocket.url)
+        rockets = [Rocket(ork_file, self.settings) for ork_file in ork_files]
+        self.status_text.set_text(
+            f"シミュレーション中 | Simulating {len(rockets)} rockets..."
+        )
+        self.__thread = threading.Thread(
+            target=self.__run_simulations, args=(rockets,), daemon=True
+        )
+        self.__thread.start()
+
+    def __run_simulations(self, rockets: list[Rocket]) -> None:
+        """
+        Load the rockets and run their simulations concurrently (in the background thread).
+
+        Args:
+            rockets: Rockets to simulate
+        """
+
+        def simulate(rocket: Rocket) -> None:
+            rocket.load()
+            rocket.simulate()
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=min(len(rockets), os.cpu_count() or 1),
+                initializer=OpenRocket.attach_thread,
+            ) as executor:
+                list(executor.map(simulate, rockets))
+        except Exception as e:
+            print(f"Error: failed to simulate the rockets: {e}")
+            with self.__lock:
+                self.error = e
+            return
+        with self.__lock:
+            self.__simulated = rockets
+
+    @property
+    def is_loading(self) -> bool:
+        """Whether the rockets are being simulated (True until the results are shown)"""
+        with self.__lock:
+            started = self.__thread is not None
+            return started and not self.rockets and self.error is None
+
+    def collect_simulations(self) -> None:
+        """
+        Show the rockets when their simulations are finished in the background thread.
+        """
+        with self.__lock:
+            rockets, self.__simulated = self.__simulated, None
+            error = self.error
+        if error is not None and not self.rockets:
+            self.status_text.set_text(
+                f"シミュレーション失敗 | Simulation failed: {error}"
+            )
+        if rockets is not None:
+            self.set_rockets(rockets)
+
+    def set_rockets(self, rockets: list[Rocket]) -> None:
+        """
+        Set the simulated rockets to play back.
+
+        Args:
+            rockets: Simulated rockets
+        """
+        self.rockets = rockets
+        self.flight_time = max(rocket.flight_time for rocket in rockets)
+        self.max_altitude = max(rocket.max_altitude for rocket in rockets)
+        self.lengths = np.array([rocket.length for rocket in rockets])
+        self.timelines = [Timeline(rocket.flight_data) for rocket in rockets]
+        self.time = 0.0
+        self.last_ticks = pg.time.get_ticks()  # the playback starts when shown
+        self.status_text.set_text("")
+        self.labels = [
+            ui_elements.UI_Text(
+                f"{Path(rocket.file_path).stem}\n{rocket.max_altitude:.1f} m",
+                "r_Mplus_regular",
+                min(2.0, 16 / len(rockets)),
+                cfg.COLOR_BLACK,
+                ((i + 0.5) / len(rockets) * 100, 86),
+                True,
+            )
+            for i, rocket in enumerate(rockets)
+        ]
+
+    def is_for(self, ork_files: list[Path]) -> bool:
+        """
+        Check whether the scene compares the given files, to resume it instead of simulating them again.
+
+        Args:
+            ork_files: Paths to the ORK files
+
+        Returns:
+            bool: True if the scene can be resumed for the files
+        """
+        resumable = bool(self.rockets) or self.is_loading
+        return resumable and [Path(f).resolve() for f in ork_files] == [
+            Path(f).resolve() for f in self.ork_files
+        ]
+
+    def resume(self) -> None:
+        """
+        Restart the playback clock, so that the time while suspended is not played.
+        """
+        self.last_ticks = pg.time.get_ticks()
+
+    def back_to_top(self):
+        """
+        Return to the top scene.
+        """
+        self.state = SCENE_STATE.TOP
+
+    def seek(self, t: float) -> None:
+        """
+        Move the shared time cursor.
+
+        Args:
+            t: Time to move to (unit: s)
+        """
+        self.time = float(np.clip(t, 0, self.flight_time))
+
+    def handle_event(self, event) -> SCENE_STATE:
+        """
+        Process events for the comparison scene.
+
+        Args:
+            event: Pygame event to process
+
+        Returns:
+            SCENE_STATE: New scene state if transition is needed, None otherwise
+        """
+        result = super().handle_event(event)
+        if result:
+            return result
+
+        self.back_icon.event_handler(event)
+        self.back_icon_text.event_handler(event)
+        self.timeline_bar.event_handler(event)
+
+        if event.type == pg.KEYDOWN:
+            if event.key == pg.K_BACKSPACE:
+                return SCENE_STATE.TOP
+            if event.key == pg.K_SPACE:
+                self.playing = not self.playing
+            if event.key == pg.K_LEFT:
+                self.seek(self.time - 1)
+            if event.key == pg.K_RIGHT:
+                self.seek(self.time + 1)
+            if event.key == pg.K_HOME:
+                self.seek(0)
+        return None
+
+    def get_batch(self, pixel_length: float) -> MeshBatch:
+        """
+        Get the merged mesh of the level of detail for the given length on the screen.
+
+        Args:
+            pixel_length: Length of the longest rocket on the screen (unit: px)
+
+        Returns:
+            MeshBatch: Merged mesh of all rockets
+        """
+        levels = Rocket.LOD_LEVELS
+        level = next(
+            (i for i, level in enumerate(levels) if pixel_length >= level[0]),
+            len(levels) - 1,
+        )
+        if level not in self.batches:
+            self.batches[level] = MeshBatch(
+                [rocket.meshes[level][1] for rocket in self.rockets]
+            )
+        return self.batches[level]
+
+    def update(self) -> None:
+        """
+        Update the comparison scene elements.
+        """
+        self.FTE_icon.update()
+        self.copyright.update()
+        self.back_icon.update()
+        self.back_icon_text.update()
+        self.collect_simulations()
+        self.status_text.update()
+
+        ticks = pg.time.get_ticks()
+        if self.playing and not self.timeline_bar.dragging:
+            self.seek(self.time + (ticks - self.last_ticks) / 1000)
+        self.last_ticks = ticks
+        self.timeline_bar.update()
+        if self.flight_time > 0:
+            self.timeline_bar.set_ratio(self.time / self.flight_time)
+
+        self.time_text.set_values(self.time, self.flight_time)
+        self.time_text.update()
+        for label in self.labels:
+            label.update()
+
+        if not self.rockets:
+            return
+
+        # state of all rockets at the shared time cursor
+        states = [timeline.state_at(self.time) for timeline in self.timelines]
+        altitudes = np.array([position[1] for position, _, _ in states])
+        rotations = np.stack([rotation for _, rotation, _ in states])
+
+        # geometry of all rockets is updated as one batched array operation
+        width, height = Layout.get_window_size()
+        n_rockets = len(self.rockets)
+        scale_factor = height * self.ROCKET_SIZE / self.lengths.max()
+        ground, top = self.FLIGHT_AREA
+        offsets = np.stack(
+            [
+                (np.arange(n_rockets) + 0.5) / n_rockets * width,
+                height
+                * (ground - (ground - top) * altitudes / max(self.max_altitude, 1e-6)),
+            ],
+            axis=1,
+        ) - np.array([0, scale_factor * self.lengths.max() / 2])
+        self.batch = self.get_batch(scale_factor * self.lengths.max())
+        self.batch.project(
+            rotations,
+            np.full(n_rockets, scale_factor),
+            offsets,
+            self.lengths,
+        )
+
+    def draw(self, screen: pg.Surface) -> None:
+        """
+        Draw the comparison scene elements.
+
+        Args:
+            screen: Pygame surface to draw on
+        """
+        self.FTE_icon.draw(screen)
+        self.copyright.draw(screen)
+        self.back_icon.draw(screen)
+        self.back_icon_text.draw(screen)
+
+        self.status_text.draw(screen)
+        if self.rockets:
+            self.batch.draw(screen)
+
+        self.timeline_bar.draw(screen)
+        self.time_text.draw(screen)
+        for label in self.labels:
+            label.draw(screen)
@@ -0,0 +1,246 @@
+"""settings.py"""
+
+import math
+import os
+import time
+import tomllib
+from dataclasses import dataclass
+
+SETTINGS_FILE = "settings.toml"
+
+
+@dataclass(frozen=True)
+class GameSettings:
+    """
+    Settings of the [game] section.
+
+    Attributes:
+        max_altitude (float): maximum altitude for drawing the background image (unit: m).
+    """
+
+    max_altitude: float = 100.0
+
+    @classmethod
+    def from_dict(cls, section: dict) -> "GameSettings":
+        return cls(max_altitude=float(section.get("maxAltitude", cls.max_altitude)))
+
+
+@dataclass(frozen=True)
+class SimulationSettings:
+    """
+    Settings of the [simulation] section.
+
+    Attributes:
+        launch_rod_angle (float): launch rod angle from vertical (unit: degrees).
+        launch_rod_length (float): launch rod length (unit: m).
+        wind_speed (float): average wind speed (unit: m/s).
+        wind_deviation (float): wind speed deviation (unit: m/s).
+        wind_turbulence_intensity (float): wind turbulence intensity (unit: %(decimal)).
+        wind_direction (float): wind direction (unit: degrees, 0 = from north, 90 = from east).
+    """
+
+    launch_rod_angle: float = 90.0
+    launch_rod_length: float = 1.0
+    wind_speed: float = 0.0
+    wind_deviation: float = 0.0
+    wind_turbulence_intensity: float = 0.0
+    wind_direction: float = 90.0
+
+    @classmethod
+    def from_dict(cls, section: dict) -> "SimulationSettings":
+        launch_rod = section.get("launchRod", {})
+        wind = section.get("wind", {})
+        return cls(
+            launch_rod_angle=float(launch_rod.get("angle", cls.launch_rod_angle)),
+            launch_rod_length=float(launch_rod.get("length", cls.launch_rod_length)),
+            wind_speed=float(wind.get("speed", cls.wind_speed)),
+            wind_deviation=float(wind.get("deviation", cls.wind_deviation)),
+            wind_turbulence_intensity=float(
+                wind.get("turbulenceIntensity", cls.wind_turbulence_intensity)
+            ),
+            wind_direction=float(wind.get("direction", cls.wind_direction)),
+        )
+
+    def apply(self, opts) -> None:
+        """
+        Apply the settings to the OpenRocket simulation options.
+
+        Args:
+            opts: simulation options of OpenRocket (SimulationOptions).
+        """
+        opts.setLaunchRodAngle(
+            math.radians(90 - self.launch_rod_angle)
+        )  # convert to radians
+        opts.setLaunchRodLength(self.launch_rod_length)  # must be in meters
+        opts.setWindSpeedAverage(self.wind_speed)
+        opts.setWindSpeedDeviation(self.wind_deviation)
+        opts.setWindTurbulenceIntensity(self.wind_turbulence_intensity)
+        # opts.setWindDirection(math.radians(self.wind_direction)) # omit
+
+
+@dataclass(frozen=True)
+class OpenRocketSettings:
+    """
+    Settings of the [openrocket] section.
+
+    Attributes:
+        url (str): download URL for the OpenRocket jar file.
+    """
+
+    url: str = ""
+
+    @classmethod
+    def from_dict(cls, section: dict) -> "OpenRocketSettings":
+        return cls(url=str(section.get("url", cls.url)))
+
+
+@dataclass(frozen=True)
+class RenderSettings:
+    """
+    Settings of the [render] section.
+
+    Attributes:
+        scale (float): scale of the internal render resolution of the playback world to the window (0 to 1).
+        dynamic (bool): whether to change the scale by the frame time.
+        min_scale (float): minimum scale in the dynamic mode.
+        frame_budget (float): target work time of a frame in the dynamic mode (unit: ms).
+    """
+
+    scale: float = 1.0
+    dynamic: bool = False
+    min_scale: float = 0.5
+    frame_budget: float = 12.0
+
+    @classmethod
+    def from_dict(cls, section: dict) -> "RenderSettings":
+        return cls(
+            scale=float(section.get("scale", cls.scale)),
+            dynamic=bool(section.get("dynamic", cls.dynamic)),
+            min_scale=float(section.get("minScale", cls.min_scale)),
+            frame_budget=float(section.get("frameBudget", cls.frame_budget)),
+        )
+
+
+@dataclass(frozen=True)
+class LibrarySettings:
+    """
+    Settings of the [library] section.
+
+    Attributes:
+        directories (tuple[str, ...]): directories to search for the ork files (recursively).
+        index_file (str): path to the index of the ork files.
+    """
+
+    directories: tuple[str, ...] = (".",)
+    index_file: str = "library.sqlite"
+
+    @classmethod
+    def from_dict(cls, section: dict) -> "LibrarySettings":
+        return cls(
+            directories=tuple(
+                str(directory)
+                for directory in section.get("directories", cls.directories)
+            ),
+            index_file=str(section.get("indexFile", cls.index_file)),
+        )
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Typed settings parsed from settings.toml.
+    The object is immutable, so that the changed sections can be detected by comparing with the previous one.
+    """
+
+    game: GameSettings = GameSettings()
+    simulation: SimulationSettings = SimulationSettings()
+    openrocket: OpenRocketSettings = OpenRocketSettings()
+    library: LibrarySettings = LibrarySettings()
+    render: RenderSettings = RenderSettings()
+
+    @classmethod
+    def from_dict(cls, settings: dict) -> "Settings":
+        return cls(
+            game=GameSettings.from_dict(settings.get("game", {})),
+            simulation=SimulationSettings.from_dict(settings.get("simulation", {})),
+            openrocket=OpenRocketSettings.from_dict(settings.get("openrocket", {})),
+            library=LibrarySettings.from_dict(settings.get("library", {})),
+            render=RenderSettings.from_dict(settings.get("render", {})),
+        )
+
+    @classmethod
+    def load(cls, path: os.PathLike = SETTINGS_FILE) -> "Settings":
+        """
+        Load the settings from the toml file.
+
+        Args:
+            path (os.PathLike): path to the settings file.
+
+        Returns:
+            Settings: parsed settings.
+        """
+        with open(path, "rb") as f:
+            return cls.from_dict(tomllib.load(f))
+
+
+class SettingsWatcher:
+    """
+    Watch the settings file and reload it when it is modified.
+    The file is polled from the main loop (by `poll`), so that no extra thread is required.
+    """
+
+    def __init__(
+        self,
+        path: os.PathLike = SETTINGS_FILE,
+        settings: Settings | None = None,
+        interval: float = 0.5,
+    ) -> None:
+        """
+        Initialize the watcher.
+
+        Args:
+            path (os.PathLike): path to the settings file.
+            settings (Settings | None): currently applied settings. loaded from the file if None.
+            interval (float): minimum interval between the file checks (unit: s).
+        """
+        self.path = path
+        self.interval = interval
+        self.settings: Settings = settings or Settings.load(path)
+        self.__stamp = self.__get_stamp()
+        self.__last_check = time.monotonic()
+
+    def __get_stamp(self) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def poll(self) -> Settings | None:
+        """
+        Check whether the settings file is modified.
+
+        Returns:
+            Settings | None: new settings if the file is modified and the content is changed, None otherwise.
+        """
+        now = time.monotonic()
+        if now - self.__last_check < self.interval:
+            return None
+        self.__last_check = now
+
+        stamp = self.__get_stamp()
+        if stamp is None or stamp == self.__stamp:
+            return None
+        self.__stamp = stamp
+
+        try:
+            settings = Settings.load(self.path)
+        except (OSError, tomllib.TOMLDecodeError, ValueError) as e:
+            # the file may be in the middle of saving. keep the current settings.
+            print(f"Failed to reload {self.path}: {e}")
+            return None
+
+        if settings == self.settings:
+            return None
+        self.settings = settings
+        return settings
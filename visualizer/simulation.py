@@ -0,0 +1,288 @@
+"""simulation.py"""
+
+import functools
+import threading
+import time
+
+import jpype
+import numpy as np
+import orhelper
+from orhelper import FlightDataType
+
+from visualizer.columns import FlightColumns
+from visualizer.events import FlightEventIndex
+from visualizer.openrocket import OpenRocket
+from visualizer.profiler import PipelineProfiler, profile_phase
+from visualizer.settings import SimulationSettings
+
+
+class SimulationResult:
+    """
+    Result of a simulation run.
+
+    Attributes:
+        flight_data (FlightColumns): timeseries data. other columns are fetched from `sim` on demand.
+        max_altitude (float): apogee (unit: m).
+        max_velocity (float): maximum velocity (unit: m/s).
+        flight_time (float): flight time (unit: s).
+        launch_clear_velocity (float): velocity at the launch rod clearance (unit: m/s).
+        time_step (float): time step used for the simulation (unit: s).
+        elapsed (float): wall-clock time of the simulation (unit: s).
+        sim: simulated simulation object of OpenRocket (retained to fetch more columns).
+        events (FlightEventIndex | None): flight events mapped to the samples. indexed from the columns
+            by `Rocket.apply_result` if None.
+    """
+
+    def __init__(
+        self,
+        flight_data: FlightColumns,
+        max_altitude: float,
+        max_velocity: float,
+        flight_time: float,
+        launch_clear_velocity: float,
+        time_step: float,
+        elapsed: float,
+        sim=None,
+        events: FlightEventIndex | None = None,
+    ) -> None:
+        self.flight_data = flight_data
+        self.max_altitude = max_altitude
+        self.max_velocity = max_velocity
+        self.flight_time = flight_time
+        self.launch_clear_velocity = launch_clear_velocity
+        self.time_step = time_step
+        self.elapsed = elapsed
+        self.sim = sim
+        self.events = events
+
+
+@functools.cache
+def java_unboxing():
+    """
+    Java function unboxing a Double (ToDoubleFunction), so that a list of the boxed values can be converted
+    to `double[]` in Java. Made of the method handle of `Double.doubleValue`, which needs no private access.
+    """
+    MethodHandles = jpype.JClass("java.lang.invoke.MethodHandles")
+    MethodType = jpype.JClass("java.lang.invoke.MethodType")
+    MethodHandleProxies = jpype.JClass("java.lang.invoke.MethodHandleProxies")
+    Double = jpype.JClass("java.lang.Double")
+    handle = MethodHandles.publicLookup().findVirtual(
+        Double, "doubleValue", MethodType.methodType(Double.TYPE)
+    )
+    return MethodHandleProxies.asInterfaceInstance(
+        jpype.JClass("java.util.function.ToDoubleFunction"), handle
+    )
+
+
+def column_to_numpy(column) -> tuple[np.ndarray, bool]:
+    """
+    Convert a column of OpenRocket (java.util.List<Double>) to a NumPy array.
+
+    Args:
+        column: the column.
+
+    Returns:
+        tuple[np.ndarray, bool]: the array, and whether it is transferred in bulk as `double[]`
+            (the values are converted one by one if not possible, e.g. with a null value).
+    """
+    try:
+        values = column.stream().mapToDouble(java_unboxing()).toArray()
+        return np.array(memoryview(values), dtype=np.float64), True  # one copy
+    except Exception:
+        return np.array(column, dtype=np.float64), False
+
+
+def get_timeseries(
+    orh: orhelper.Helper,
+    sim,
+    flight_data_types: list[FlightDataType],
+    branch_number: int = 0,
+    profiler: PipelineProfiler | None = None,
+) -> tuple[np.ndarray, dict[FlightDataType, np.ndarray]]:
+    """
+    Get the timeseries data of the simulation as one 2-D array (replaces `orhelper.Helper.get_timeseries`,
+    which converts the values one by one).
+
+    Args:
+        orh (orhelper.Helper): OpenRocket helper.
+        sim: simulated simulation object of OpenRocket.
+        flight_data_types (list[FlightDataType]): types of the timeseries data to get.
+        branch_number (int): branch of the simulated data (e.g. a stage).
+        profiler (PipelineProfiler | None): profiler of the transfer of each column (benchmark only), or None.
+
+    Returns:
+        tuple[np.ndarray, dict[FlightDataType, np.ndarray]]: float64 array of (types, samples) with NaN for
+            the unavailable values, and the row of each type (views of the array).
+    """
+    branch = sim.getSimulatedData().getBranch(branch_number)
+    columns = []
+    for data_type in flight_data_types:
+        with profile_phase(profiler, f"transfer.{data_type.name}"):
+            column = branch.get(orh.translate_flight_data_type(data_type))
+            if column is None:  # not recorded in this simulation
+                columns.append(np.empty(0))
+                continue
+            array, bulk = column_to_numpy(column)
+            columns.append(array)
+        if profiler is not None:
+            profiler.count("bulk_columns" if bulk else "elementwise_columns")
+
+    data = np.full((len(columns), max(map(len, columns), default=0)), np.nan)
+    for row, column in zip(data, columns):
+        row[: len(column)] = column
+    return data, dict(zip(flight_data_types, data))
+
+
+def run_simulation(
+    orh: orhelper.Helper,
+    sim,
+    settings: SimulationSettings,
+    flight_data_types: list[FlightDataType],
+    time_step: float | None = None,
+    profiler: PipelineProfiler | None = None,
+) -> SimulationResult:
+    """
+    Run the simulation on a copy of the given simulation, so that the runs can be executed concurrently.
+
+    Args:
+        orh (orhelper.Helper): OpenRocket helper.
+        sim: simulation object of OpenRocket.
+        settings (SimulationSettings): simulation settings.
+        flight_data_types (list[FlightDataType]): types of the timeseries data to get.
+        time_step (float | None): time step of the simulation (unit: s). the document default is used if None.
+        profiler (PipelineProfiler | None): profiler of the phases (benchmark only), or None.
+
+    Returns:
+        SimulationResult: result of the simulation.
+    """
+    with profile_phase(profiler, "prepare_simulation"):
+        sim = sim.copy()
+        opts = sim.getOptions()
+        settings.apply(opts)
+        if time_step is not None:
+            opts.setTimeStep(time_step)
+
+    start = time.perf_counter()
+    with profile_phase(profiler, "run_simulation"):
+        orh.run_simulation(sim)  # run simulation
+    with profile_phase(profiler, "get_timeseries"):
+        data, timeseries = get_timeseries(orh, sim, flight_data_types, 0, profiler)
+    if profiler is not None:
+        profiler.count("timeseries_values", data.size)
+    with profile_phase(profiler, "summary"):
+        sim_data = sim.getSimulatedData()
+        summary = [
+            float(sim_data.getMaxAltitude()),
+            float(sim_data.getMaxVelocity()),
+            float(sim_data.getFlightTime()),
+            float(sim_data.getLaunchRodVelocity()),
+            float(opts.getTimeStep()),
+        ]
+    flight_data = FlightColumns(
+        timeseries,
+        lambda data_types: get_timeseries(orh, sim, data_types)[1],
+    )
+    with profile_phase(profiler, "events"):
+        events = FlightEventIndex.build(flight_data, orh.get_events(sim))
+    return SimulationResult(
+        flight_data, *summary, time.perf_counter() - start, sim, events
+    )
+
+
+class ProgressiveSimulation:
+    """
+    Progressive-fidelity simulation.
+    A coarse simulation is run first to give a preview, then the full-fidelity simulation is run in the background.
+    """
+
+    def __init__(
+        self,
+        orh: orhelper.Helper,
+        sim,
+        settings: SimulationSettings,
+        flight_data_types: list[FlightDataType],
+        coarse_factor: float,
+    ) -> None:
+        """
+        Initialize the progressive simulation.
+
+        Args:
+            orh (orhelper.Helper): OpenRocket helper.
+            sim: simulation object of OpenRocket.
+            settings (SimulationSettings): simulation settings.
+            flight_data_types (list[FlightDataType]): types of the timeseries data to get.
+            coarse_factor (float): ratio of the coarse time step to the document default.
+        """
+        self.__orh = orh
+        self.__sim = sim
+        self.__settings = settings
+        self.__flight_data_types = flight_data_types
+        self.coarse_time_step = float(sim.getOptions().getTimeStep()) * coarse_factor
+
+        self.preview: SimulationResult = None
+        self.refined: SimulationResult = None
+        self.error: Exception = None
+        self.__thread: threading.Thread = None
+        self.__lock = threading.Lock()
+        self.__delivered = False
+
+    def start(self) -> SimulationResult:
+        """
+        Run the coarse simulation and start the full-fidelity simulation in the background.
+
+        Returns:
+            SimulationResult: result of the coarse simulation.
+        """
+        self.preview = run_simulation(
+            self.__orh,
+            self.__sim,
+            self.__settings,
+            self.__flight_data_types,
+            self.coarse_time_step,
+        )
+        self.__thread = threading.Thread(target=self.__refine, daemon=True)
+        self.__thread.start()
+        return self.preview
+
+    def __refine(self) -> None:
+        """Run the full-fidelity simulation (in the background thread)."""
+        OpenRocket.attach_thread()
+        try:
+            result = run_simulation(
+                self.__orh, self.__sim, self.__settings, self.__flight_data_types
+            )
+        except Exception as e:
+            print(f"Error: refined simulation failed: {e}")
+            with self.__lock:
+                self.error = e
+            return
+        with self.__lock:
+            self.refined = result
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the full-fidelity simulation is started and its result (or error) is not set yet"""
+        with self.__lock:
+            started = self.__thread is not None
+            return started and self.refined is None and self.error is None
+
+    @property
+    def apogee_difference(self) -> float | None:
+        """Difference of the apogee between the refined and the preview result (unit: m)"""
+        with self.__lock:
+            if self.refined is None or self.preview is None:
+                return None
+            return self.refined.max_altitude - self.preview.max_altitude
+
+    def poll(self) -> SimulationResult | None:
+        """
+        Check whether the full-fidelity simulation is finished.
+
+        Returns:
+            SimulationResult | None: the refined result only at the first call after it is finished, None otherwise.
+        """
+        with self.__lock:
+            if self.refined is None or self.__delivered:
+                return None
+            self.__delivered = True
+            return self.refined
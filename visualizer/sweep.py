@@ -0,0 +1,363 @@
+"""
+sweep.py
+
+Sweep of the component dimensions of a rocket.
+
+Usage:
+    python -m visualizer.sweep simple.ork --vary fin_span 0.03 0.04 0.05 --vary nose_length 0.08 0.1 --output sweep.json
+
+Notes:
+    - A variant is a combination of the values of the design variables (the product of the values).
+      Each variant is simulated on a copy of the rocket modified through the OpenRocket object model,
+      so that the loaded document is not changed and the variants can be simulated in parallel workers.
+    - The parameters are set on the first component of the type in the sustainer, or on the components
+      of the name given as "parameter:component name" (e.g. "body_length:Body tube").
+    - The stability margin is in calibers. The minimum is taken from the launch to the apogee.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+from orhelper import FlightDataType
+
+from visualizer.openrocket import OpenRocket
+from visualizer.rocket import Rocket
+from visualizer.settings import Settings, SimulationSettings
+
+# parameter -> (type name of the component, setter) (unit: m, or kg for the mass)
+PARAMETERS: dict[str, tuple[str, str]] = {
+    "fin_span": ("FinSet", "setHeight"),
+    "fin_root_chord": ("FinSet", "setRootChord"),
+    "nose_length": ("NoseCone", "setLength"),
+    "body_length": ("BodyTube", "setLength"),
+    "ballast_mass": ("MassComponent", "setComponentMass"),
+}
+
+SWEEP_DATA = [
+    FlightDataType.TYPE_TIME,
+    FlightDataType.TYPE_ALTITUDE,
+    FlightDataType.TYPE_STABILITY,
+]
+
+
+@dataclass(frozen=True)
+class DesignVariable:
+    """
+    Design variable of the sweep.
+
+    Attributes:
+        parameter (str): name of the parameter in PARAMETERS.
+        values (tuple[float, ...]): values to sweep.
+        component (str | None): name of the components to set. the first component of the type if None.
+    """
+
+    parameter: str
+    values: tuple[float, ...]
+    component: str | None = None
+
+    def __post_init__(self) -> None:
+        if self.parameter not in PARAMETERS:
+            raise ValueError(
+                f"Unknown parameter: {self.parameter} (one of {', '.join(PARAMETERS)})"
+            )
+
+
+@dataclass(frozen=True)
+class Variant:
+    """
+    Combination of the values of the design variables.
+
+    Attributes:
+        values (tuple[tuple[str, str | None, float], ...]): parameter, component name and value of each variable.
+    """
+
+    values: tuple[tuple[str, str | None, float], ...]
+
+    @property
+    def label(self) -> str:
+        """Short description of the values (e.g. "fin_span=0.04 nose_length=0.1")"""
+        return " ".join(
+            f"{parameter}{'' if component is None else ':' + component}={value:g}"
+            for parameter, component, value in self.values
+        )
+
+    def apply(self, rocket: Any) -> None:
+        """
+        Set the values on the components of the rocket.
+
+        Args:
+            rocket: rocket object of OpenRocket (a copy of the loaded one).
+        """
+        for parameter, component, value in self.values:
+            type_name, setter = PARAMETERS[parameter]
+            targets = find_components(rocket, type_name, component)
+            if not targets:
+                raise ValueError(f"No {component or type_name} found for {parameter}")
+            for target in targets:
+                if not hasattr(target, setter):
+                    raise ValueError(
+                        f"{parameter} cannot be set on {type(target).__name__}"
+                    )
+                getattr(target, setter)(float(value))
+
+
+@dataclass(frozen=True)
+class VariantResult:
+    """
+    Result of a simulated variant.
+
+    Attributes:
+        variant (Variant): the variant.
+        apogee (float): maximum altitude (unit: m).
+        max_velocity (float): maximum velocity (unit: m/s).
+        initial_stability (float): stability margin at the first sample with a value (unit: cal).
+        min_stability (float): minimum stability margin up to the apogee (unit: cal).
+        elapsed (float): wall-clock time of the simulation (unit: s).
+        error (str | None): error message if the simulation failed.
+    """
+
+    variant: Variant
+    apogee: float = np.nan
+    max_velocity: float = np.nan
+    initial_stability: float = np.nan
+    min_stability: float = np.nan
+    elapsed: float = 0.0
+    error: str | None = None
+
+
+def find_components(rocket: Any, type_name: str, name: str | None = None) -> list:
+    """
+    Find the components of the type in the sustainer (depth-first in the order of the document).
+
+    Args:
+        rocket: rocket object of OpenRocket.
+        type_name (str): part of the class name of the components (e.g. "FinSet").
+        name (str | None): name of the components. only the first component of the type if None.
+
+    Returns:
+        list: the matching components.
+    """
+    found = []
+    stack = [rocket.getChild(0)]  # only the sustainer, as in the structure extraction
+    while stack:
+        component = stack.pop()
+        if type_name in type(component).__name__:
+            if name is None:
+                return [component]
+            if str(component.getName()) == name:
+                found.append(component)
+        stack.extend(reversed(list(component.getChildren())))
+    return found
+
+
+def make_variants(variables: list[DesignVariable]) -> list[Variant]:
+    """
+    Make the variants of all the combinations of the values.
+
+    Args:
+        variables (list[DesignVariable]): design variables.
+
+    Returns:
+        list[Variant]: the variants (the last variable changes fastest).
+    """
+    return [
+        Variant(
+            tuple(
+                (variable.parameter, variable.component, float(value))
+                for variable, value in zip(variables, values)
+            )
+        )
+        for values in itertools.product(*(variable.values for variable in variables))
+    ]
+
+
+def stability_summary(
+    altitude: np.ndarray, stability: np.ndarray
+) -> tuple[float, float]:
+    """
+    Get the initial and the minimum stability margin up to the apogee.
+
+    Args:
+        altitude (np.ndarray): altitude in time order (unit: m).
+        stability (np.ndarray): stability margin in time order (unit: cal). NaN where not defined.
+
+    Returns:
+        tuple[float, float]: initial and minimum stability margin (NaN if not defined).
+    """
+    if len(altitude):
+        stability = stability[: int(np.argmax(altitude)) + 1]  # until the apogee
+    finite = stability[np.isfinite(stability)]
+    if len(finite) == 0:
+        return np.nan, np.nan
+    return float(finite[0]), float(finite.min())
+
+
+class DesignSweep:
+    """
+    Parallel simulation of the design variants.
+    """
+
+    def __init__(
+        self,
+        evaluate: Callable[[Variant], VariantResult],
+        max_workers: int | None = None,
+        initializer: Callable[[], None] | None = None,
+    ) -> None:
+        """
+        Initialize the sweep.
+
+        Args:
+            evaluate (Callable[[Variant], VariantResult]): simulates a variant (called concurrently).
+            max_workers (int | None): number of the concurrent simulations. the number of the CPUs if None.
+            initializer (Callable[[], None] | None): called in each worker thread (e.g. to attach it to the JVM).
+        """
+        self.evaluate = evaluate
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.initializer = initializer
+
+    def run(self, variants: list[Variant]) -> list[VariantResult]:
+        """
+        Simulate the variants. A failed variant is reported with its error, not to stop the others.
+
+        Args:
+            variants (list[Variant]): variants to simulate.
+
+        Returns:
+            list[VariantResult]: result of each variant in the same order.
+        """
+        if not variants:
+            return []
+        with ThreadPoolExecutor(
+            max_workers=min(len(variants), self.max_workers),
+            initializer=self.initializer,
+        ) as executor:
+            return list(executor.map(self.evaluate_safely, variants))
+
+    def evaluate_safely(self, variant: Variant) -> VariantResult:
+        """Simulate the variant, returning the error in the result if it fails"""
+        start = time.perf_counter()
+        try:
+            return self.evaluate(variant)
+        except Exception as e:
+            print(f"Error: variant {variant.label} failed: {e}")
+            return VariantResult(
+                variant, elapsed=time.perf_counter() - start, error=str(e)
+            )
+
+
+def rocket_variant_evaluator(
+    rocket: Rocket, settings: SimulationSettings
+) -> Callable[[Variant], VariantResult]:
+    """
+    Make the evaluation function of the variants of the loaded rocket.
+
+    Args:
+        rocket (Rocket): the rocket with the ork file loaded.
+        settings (SimulationSettings): simulation settings of the runs.
+
+    Returns:
+        Callable[[Variant], VariantResult]: simulates a variant on a copy of the rocket (thread-safe).
+    """
+
+    def evaluate(variant: Variant) -> VariantResult:
+        result = rocket.evaluate_design(variant.apply, settings, SWEEP_DATA)
+        order = np.argsort(result.flight_data[FlightDataType.TYPE_TIME], kind="stable")
+        initial, minimum = stability_summary(
+            np.nan_to_num(result.flight_data[FlightDataType.TYPE_ALTITUDE][order]),
+            np.asarray(result.flight_data[FlightDataType.TYPE_STABILITY])[order],
+        )
+        return VariantResult(
+            variant,
+            result.max_altitude,
+            result.max_velocity,
+            initial,
+            minimum,
+            result.elapsed,
+        )
+
+    return evaluate
+
+
+def print_report(results: list[VariantResult]) -> None:
+    """
+    Print the result of each variant.
+
+    Args:
+        results (list[VariantResult]): results of the sweep.
+    """
+    print("apogee[m]  velocity[m/s]  stability[cal]  min[cal]  time[s]  variant")
+    for r in results:
+        if r.error is not None:
+            print(f"{'failed':>9}{'':41}{r.elapsed:7.2f}  {r.variant.label}")
+            continue
+        print(
+            f"{r.apogee:9.2f}  {r.max_velocity:13.2f}  {r.initial_stability:14.2f}  "
+            f"{r.min_stability:8.2f}  {r.elapsed:7.2f}  {r.variant.label}"
+        )
+
+
+def parse_variable(arguments: list[str]) -> DesignVariable:
+    """
+    Parse the design variable of the command line ("parameter[:component] value ...").
+
+    Args:
+        arguments (list[str]): the parameter and its values.
+
+    Returns:
+        DesignVariable: the design variable.
+    """
+    parameter, _, component = arguments[0].partition(":")
+    return DesignVariable(
+        parameter, tuple(float(value) for value in arguments[1:]), component or None
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("ork_file", type=Path)
+    parser.add_argument(
+        "--vary",
+        nargs="+",
+        action="append",
+        required=True,
+        metavar="PARAMETER[:COMPONENT] VALUE",
+        help=f"design variable ({', '.join(PARAMETERS)})",
+    )
+    parser.add_argument("--workers", type=int, help="concurrent simulations")
+    parser.add_argument("--output", type=Path, help="JSON file of the results")
+    args = parser.parse_args(argv)
+
+    try:
+        variables = [parse_variable(arguments) for arguments in args.vary]
+    except ValueError as e:
+        parser.error(str(e))
+    variants = make_variants(variables)
+    print(f"{len(variants)} variants")
+
+    settings = Settings.load()
+    rocket = Rocket(args.ork_file, settings)
+    rocket.load()
+    sweep = DesignSweep(
+        rocket_variant_evaluator(rocket, settings.simulation),
+        args.workers,
+        OpenRocket.attach_thread,
+    )
+    results = sweep.run(variants)
+    print_report(results)
+    if args.output is not None:
+        args.output.write_text(
+            json.dumps([asdict(r) for r in results], indent=2), encoding="utf-8"
+        )
+        print(f"Saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
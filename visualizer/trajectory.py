@@ -0,0 +1,155 @@
+"""
+trajectory.py
+
+Notes:
+    - The path is drawn in the same view as the playback: screen right is east (position x), screen up is altitude.
+"""
+
+import numpy as np
+import pygame as pg
+from orhelper import FlightDataType
+
+import visualizer.config as cfg
+from visualizer.decimate import douglas_peucker_indices
+from visualizer.playback import Timeline
+
+
+class Trajectory:
+    """
+    Flown path drawn behind the rocket in the playback.
+
+    The path is decimated at load into the levels of doubling tolerances, and the level is selected
+    by the current pixels per meter, so that the drawn path has only the vertices visible at the zoom.
+    The passed vertices are the prefix of the level in the world space, extended by moving its end,
+    and are projected by one vectorized transform into a buffer of the level whenever the view moves.
+    """
+
+    LEVELS = 12  # number of the decimation levels (besides the full resolution)
+    # maximum deviation of the drawn path from the flown path (unit: px)
+    TOLERANCE = 0.5
+    COLOR = cfg.COLOR_GRAY2
+    WIDTH = 2
+
+    def __init__(
+        self, time: np.ndarray, east: np.ndarray, altitude: np.ndarray
+    ) -> None:
+        """
+        Initialize the trajectory and decimate the path.
+
+        Args:
+            time (np.ndarray): time of the samples in ascending order (unit: s).
+            east (np.ndarray): east position of the samples (unit: m).
+            altitude (np.ndarray): altitude of the samples (unit: m).
+        """
+        points = np.stack([east, altitude], axis=1)
+        extent = max(np.ptp(east), np.ptp(altitude), 1e-3)
+
+        # level 0 is the full resolution, and each level is decimated from the finer one
+        self.tolerances = [0.0] + [
+            extent * 2.0**-level for level in range(self.LEVELS, 0, -1)
+        ]  # unit: m
+        indices = np.arange(len(points))
+        self.points: list[np.ndarray] = [points]
+        self.time: list[np.ndarray] = [np.asarray(time, dtype=float)]
+        for tolerance in self.tolerances[1:]:
+            indices = indices[douglas_peucker_indices(points[indices], tolerance)]
+            self.points.append(points[indices])
+            self.time.append(self.time[0][indices])
+
+        # each level deviates from the finer one, so that the deviation from the flown path accumulates
+        self.errors = np.cumsum(self.tolerances).tolist()  # unit: m
+
+        self.level = 0  # level selected for the current frame
+        self.end = 0  # number of the passed vertices of the level
+        self.appended = 0  # number of the vertices appended at the last update
+        # number of the updates that restarted the path (level change or seek back)
+        self.restarts = 0
+        # projected vertices up to the current time (view of the buffer of the level)
+        self.screen_points: np.ndarray = np.empty((0, 2))
+        self.tip: tuple[float, float] = None  # current position of the rocket in pixel
+        self.__buffers = [np.empty_like(points) for points in self.points]
+
+    @classmethod
+    def from_timeline(
+        cls, timeline: Timeline, flight_data: dict[FlightDataType, np.ndarray]
+    ) -> "Trajectory":
+        """
+        Make the trajectory of the flight played back by the timeline.
+
+        Args:
+            timeline (Timeline): timeline of the flight (for the samples sorted by time).
+            flight_data (dict[FlightDataType, np.ndarray]): timeseries data including TYPE_POSITION_X and TYPE_ALTITUDE.
+
+        Returns:
+            Trajectory: the trajectory.
+        """
+        order = timeline.sample_order
+        east = np.nan_to_num(np.asarray(flight_data[FlightDataType.TYPE_POSITION_X]))
+        altitude = np.nan_to_num(np.asarray(flight_data[FlightDataType.TYPE_ALTITUDE]))
+        return cls(timeline.time, east[order], altitude[order])
+
+    def select_level(self, pixels_per_meter: float) -> int:
+        """
+        Select the coarsest level whose deviation on the screen is within TOLERANCE.
+
+        Args:
+            pixels_per_meter (float): scale of the view (unit: px/m).
+
+        Returns:
+            int: the level.
+        """
+        level = 0
+        for i, error in enumerate(self.errors):
+            if error * pixels_per_meter <= self.TOLERANCE:
+                level = i
+        return level
+
+    def update(
+        self,
+        t: float,
+        position: np.ndarray,
+        pixels_per_meter: float,
+        origin: tuple[float, float],
+    ) -> None:
+        """
+        Update the drawn path up to the given time.
+
+        Args:
+            t (float): current time (unit: s).
+            position (np.ndarray): current position of the rocket (east, altitude) (unit: m), followed by the camera.
+            pixels_per_meter (float): scale of the view (unit: px/m).
+            origin (tuple[float, float]): screen position of the rocket horizontally and the ground vertically (unit: px).
+        """
+        level = self.select_level(pixels_per_meter)
+        end = int(np.searchsorted(self.time[level], t, side="right"))
+        if level == self.level and end >= self.end:
+            self.appended = (
+                end - self.end
+            )  # only the vertices passed since the last update
+        else:
+            self.appended = end
+            self.restarts += 1
+        self.level = level
+        self.end = end
+
+        # x = origin_x + (east - camera) * scale, y = origin_y - altitude * scale
+        scale = np.array([pixels_per_meter, -pixels_per_meter])
+        shift = np.array([origin[0] - float(position[0]) * pixels_per_meter, origin[1]])
+        screen = self.__buffers[level][:end]
+        np.multiply(self.points[level][:end], scale, out=screen)
+        screen += shift
+        self.screen_points = screen
+        self.tip = (origin[0], origin[1] - float(position[1]) * pixels_per_meter)
+
+    def draw(self, screen: pg.Surface) -> None:
+        """
+        Draw the path on the screen.
+
+        Args:
+            screen (pg.Surface): screen to draw the path.
+        """
+        points = self.screen_points.tolist()
+        if len(points) >= 2:
+            pg.draw.lines(screen, self.COLOR, False, points, self.WIDTH)
+        if points and self.tip is not None:
+            pg.draw.line(screen, self.COLOR, points[-1], self.tip, self.WIDTH)
@@ -5,6 +5,7 @@ import pygame as pg
 
 import visualizer.config as cfg
 from visualizer.fonts import Fonts
+from visualizer.layout import Layout, RenderCache
 
 
 def load_transparent_img(filename: str, filled_color: pg.Color) -> pg.Surface:
@@ -44,29 +45,27 @@ class BackgruondLogo:
         self.image = None
         self.window_size = None
         self.blit_dest = None
+        self.cache = RenderCache()  # scaled images at the previously seen sizes
 
     def update(self) -> None:
         """Update image size"""
-        if self.window_size != pg.display.get_window_size():
-            self.window_size = pg.display.get_window_size()
-            self.row_image = pg.transform.scale(self.row_image, self.window_size)
-            if self.window_size[1] > self.window_size[0]:
-                self.image = pg.transform.scale(
-                    self.row_image, (self.window_size[0], self.window_size[0])
-                )
-                self.blit_dest = (
-                    0,
-                    (self.window_size[1] - self.window_size[0]) // 2
-                    + self.window_size * 0.05,  # shift the image down a bit
-                )
-            else:
-                self.image = pg.transform.scale(
-                    self.row_image, (self.window_size[1], self.window_size[1])
-                )
-                self.blit_dest = (
-                    (self.window_size[0] - self.window_size[1]) // 2,
-                    self.window_size[1] * 0.05,
-                )
+        if self.window_size != Layout.get_window_size():
+            self.window_size = Layout.get_window_size()
+            self.image, self.blit_dest = self.cache.get(self.window_size, self.render)
+
+    def render(self) -> tuple[pg.Surface, tuple[int, int]]:
+        """Scale the image to the current window size"""
+        width, height = self.window_size
+        if height > width:
+            image = pg.transform.scale(self.row_image, (width, width))
+            blit_dest = (
+                0,
+                (height - width) // 2 + height * 0.05,  # shift the image down a bit
+            )
+        else:
+            image = pg.transform.scale(self.row_image, (height, height))
+            blit_dest = ((width - height) // 2, height * 0.05)
+        return image, blit_dest
 
     def draw(self, screen: pg.Surface) -> None:
         """Draw image on screen"""
@@ -99,6 +98,7 @@ class Button(pg.sprite.Sprite):
         self.rect: pg.Rect = None
         self.on_click: callable = lambda: None
         self.debug_collision_rect = debug_collision_rect
+        self.cache = RenderCache()  # scaled images at the previously seen sizes
 
     def set_callback(self, callback) -> None:
         """Set the function to be called when the button is clicked"""
@@ -106,8 +106,8 @@ class Button(pg.sprite.Sprite):
 
     def update(self) -> None:
         """Update the button size and position based on the current window size"""
-        if self.window_size != pg.display.get_window_size():
-            self.window_size = pg.display.get_window_size()
+        if self.window_size != Layout.get_window_size():
+            self.window_size = Layout.get_window_size()
             # Update the button size and position based on the current window size
             size = [
                 int(self.window_size[0] * self.size),
@@ -118,7 +118,9 @@ class Button(pg.sprite.Sprite):
                 int(self.window_size[1] * self.pos[1]),
             ]
             self.rect = pg.Rect(pos[0], pos[1], size[0], size[1])
-            self.image = pg.transform.scale(self.raw_image, size)
+            self.image = self.cache.get(
+                tuple(size), lambda: pg.transform.scale(self.raw_image, size)
+            )
 
     def event_handler(self, event: pg.event.Event) -> None:
         """Handle the mouse click event"""
@@ -178,6 +180,7 @@ class UI_Text(pg.sprite.Sprite):
         self.underline_width: int = underline_width
         self.underline_color: pg.Color = underline_color or font_color
         self.debug_collision_rect: bool = debug_collision_rect
+        self.cache = RenderCache()  # rendered lines at the previously seen sizes
 
     def set_callback(self, callback) -> None:
         """Set the function to be called when the text is clicked"""
@@ -186,39 +189,44 @@ class UI_Text(pg.sprite.Sprite):
     def set_text(self, text: str) -> None:
         """Set the text to be displayed"""
         self.text = text
+        self.window_size = None  # force re-rendering
         self.update()  # update the text size and position
 
     def update(self) -> None:
         """Update the text size and position based on the current window size"""
-        if self.window_size != pg.display.get_window_size():
-            self.window_size = pg.display.get_window_size()
-            font_size = int(self.window_size[0] * self.font_size)
-            pos = [
-                int(self.window_size[0] * self.pos[0]),
-                int(self.window_size[1] * self.pos[1]),
-            ]
-            font = Fonts.get_font(self.font_name, font_size)
-            self.rendered_text = [
-                font.render(line, True, self.font_color)
-                for line in self.text.split("\n")
-            ]  # list of rendered text lines
-            ascent = font.get_ascent()  # length of the text above the baseline
-            descent = font.get_descent()  # length of the text below the baseline
-            height = font.get_height()  # total height of the text
-            linesize = font.get_linesize()  # height of a line of text
-
-            self.rects = [
-                pg.Rect(
-                    pos[0],
-                    pos[1] + i * linesize * self.line_height,
-                    text.get_width(),
-                    linesize,
-                )
-                for i, text in enumerate(self.rendered_text)
-            ]
-            if self.centering:
-                for rect in self.rects:
-                    rect.x -= rect.width // 2
+        if self.window_size != Layout.get_window_size():
+            self.window_size = Layout.get_window_size()
+            self.rendered_text, rects = self.cache.get(
+                (self.window_size, self.text), self.render
+            )
+            self.rects = [rect.copy() for rect in rects]
+
+    def render(self) -> tuple[list[pg.Surface], list[pg.Rect]]:
+        """Render the text lines and their rects for the current window size"""
+        font_size = int(self.window_size[0] * self.font_size)
+        pos = [
+            int(self.window_size[0] * self.pos[0]),
+            int(self.window_size[1] * self.pos[1]),
+        ]
+        font = Fonts.get_font(self.font_name, font_size)
+        rendered_text = [
+            font.render(line, True, self.font_color) for line in self.text.split("\n")
+        ]  # list of rendered text lines
+        linesize = font.get_linesize()  # height of a line of text
+
+        rects = [
+            pg.Rect(
+                pos[0],
+                pos[1] + i * linesize * self.line_height,
+                text.get_width(),
+                linesize,
+            )
+            for i, text in enumerate(rendered_text)
+        ]
+        if self.centering:
+            for rect in rects:
+                rect.x -= rect.width // 2
+        return rendered_text, rects
 
     def event_handler(self, event: pg.event.Event) -> None:
         if event.type == pg.MOUSEBUTTONDOWN:
@@ -244,3 +252,386 @@ class UI_Text(pg.sprite.Sprite):
             )
         for text, rect in zip(self.rendered_text, self.rects):
             screen.blit(text, rect)
+
+
+class GlyphAtlas:
+    """
+    Glyph atlas class. The glyphs are pre-rendered into one surface per font, size and color,
+    and shared by the telemetry texts.
+
+    Digits and the characters in TABULAR share the width of the widest digit,
+    so that the layout of a formatted number does not change with its value.
+    """
+
+    CHARACTERS = "".join(chr(code) for code in range(0x20, 0x7F))  # printable ASCII
+    TABULAR = "0123456789+-. "
+
+    __atlases: dict[tuple[str, int, tuple[int, int, int, int]], "GlyphAtlas"] = {}
+
+    @classmethod
+    def get_atlas(
+        cls, font_name: str, font_size: int, font_color: pg.Color
+    ) -> "GlyphAtlas":
+        """
+        Get the glyph atlas. The atlas is rendered at the first call for each font, size and color.
+
+        Args:
+            font_name (str): The name of the font.
+            font_size (int): The size of the font in pixels.
+            font_color (pg.Color): The color of the font.
+
+        Returns:
+            GlyphAtlas: The glyph atlas.
+        """
+        key = (font_name, font_size, tuple(pg.Color(font_color)))
+        if key not in cls.__atlases:
+            cls.__atlases[key] = GlyphAtlas(font_name, font_size, font_color)
+        return cls.__atlases[key]
+
+    def __init__(self, font_name: str, font_size: int, font_color: pg.Color) -> None:
+        """
+        Render the glyph atlas. Use get_atlas to share the atlas.
+
+        Args:
+            font_name (str): The name of the font.
+            font_size (int): The size of the font in pixels.
+            font_color (pg.Color): The color of the font.
+        """
+        self.font = Fonts.get_font(font_name, font_size)
+        self.font_color = font_color
+        self.height = self.font.get_linesize()
+        glyphs = [self.font.render(char, True, font_color) for char in self.CHARACTERS]
+        self.cell_width = max(
+            glyph.get_width()
+            for char, glyph in zip(self.CHARACTERS, glyphs)
+            if char.isdigit()
+        )
+
+        # advance of each character and the source rect in the atlas surface
+        self.advances: dict[str, int] = {}
+        self.areas: dict[str, pg.Rect] = {}
+        self.offsets: dict[str, int] = {}  # to center the tabular glyphs in the cell
+        self.surface = pg.Surface(
+            (sum(glyph.get_width() for glyph in glyphs), self.height), pg.SRCALPHA
+        )
+        x = 0
+        for char, glyph in zip(self.CHARACTERS, glyphs):
+            self.surface.blit(glyph, (x, 0))
+            self.areas[char] = pg.Rect(x, 0, glyph.get_width(), glyph.get_height())
+            if char in self.TABULAR:
+                self.advances[char] = self.cell_width
+                self.offsets[char] = (self.cell_width - glyph.get_width()) // 2
+            else:
+                self.advances[char] = glyph.get_width()
+                self.offsets[char] = 0
+            x += glyph.get_width()
+
+    def layout(
+        self, text: str, pos: tuple[int, int]
+    ) -> list[tuple[pg.Surface, tuple[int, int], pg.Rect]]:
+        """
+        Lay out the text with the glyphs. Characters not in the atlas are drawn as "?".
+
+        Args:
+            text (str): The text to be laid out.
+            pos (tuple[int, int]): The top-left position of the text.
+
+        Returns:
+            list[tuple[pg.Surface, tuple[int, int], pg.Rect]]: The blit sequence for Surface.blits.
+        """
+        x, y = pos
+        sequence = []
+        for char in text:
+            if char not in self.areas:
+                char = "?"
+            if char != " ":
+                sequence.append(
+                    (self.surface, (x + self.offsets[char], y), self.areas[char])
+                )
+            x += self.advances[char]
+        return sequence
+
+    def width(self, text: str) -> int:
+        """Width of the laid out text in pixels"""
+        return sum(self.advances.get(char, self.advances["?"]) for char in text)
+
+
+class TelemetryText(pg.sprite.Sprite):
+    def __init__(
+        self,
+        text_format: str,
+        font_name: str,
+        font_size: float,
+        font_color: pg.Color,
+        pos: tuple[float, float],
+        centering: bool = False,
+    ) -> None:
+        """
+        Telemetry text class for the numbers changing every frame.
+        The values are composed of the cached glyphs of GlyphAtlas instead of rendering the text,
+        and the layout has a fixed width so that the drawn area is stable.
+
+        Args:
+            text_format (str): The format string of the values (e.g. "{:6.1f} m").
+                use fixed-width format specs to keep the layout stable.
+            font_name (str): The name of the font to be used.
+            font_size (float): The size of the font as a percentage of the window width.
+            font_color (pg.Color): The color of the font.
+            pos (tuple[float, float]): The position of the text as a percentage of the window size.
+            centering (bool): Whether to center the text.
+        """
+        super().__init__()
+        self.text_format: str = text_format
+        self.font_name: str = font_name
+        self.font_size: float = font_size / 100
+        self.font_color: pg.Color = font_color
+        self.pos: tuple[float, float] = [pos[0] / 100, pos[1] / 100]
+        self.centering: bool = centering
+        self.values: tuple = None
+        self.text: str = ""
+        self.window_size: tuple[int, int] = None
+        self.atlas: GlyphAtlas = None
+        self.rect: pg.Rect = None  # drawn area
+        self.blit_sequence: list[tuple[pg.Surface, tuple[int, int], pg.Rect]] = []
+
+    def set_values(self, *values) -> None:
+        """Set the values to be displayed. The text is laid out again only if the values are changed."""
+        if values == self.values:
+            return
+        self.values = values
+        self.text = self.text_format.format(*values)
+        if self.atlas is not None:
+            self.__layout()
+
+    def __layout(self) -> None:
+        width = self.atlas.width(self.text)
+        if width > self.rect.width:  # grow only, to keep the drawn area stable
+            if self.centering:
+                self.rect.x -= (width - self.rect.width + 1) // 2
+            self.rect.width = width
+        x = self.rect.centerx - width // 2 if self.centering else self.rect.x
+        self.blit_sequence = self.atlas.layout(self.text, (x, self.rect.y))
+
+    def update(self) -> None:
+        """Update the atlas and the position based on the current window size"""
+        if self.window_size != Layout.get_window_size():
+            self.window_size = Layout.get_window_size()
+            self.atlas = GlyphAtlas.get_atlas(
+                self.font_name,
+                int(self.window_size[0] * self.font_size),
+                self.font_color,
+            )
+            x = int(self.window_size[0] * self.pos[0])
+            y = int(self.window_size[1] * self.pos[1])
+            width = self.atlas.width(self.text)
+            if self.centering:
+                x -= width // 2
+            self.rect = pg.Rect(x, y, width, self.atlas.height)
+            self.__layout()
+
+    def draw(self, screen: pg.Surface) -> None:
+        """Draw the text on the screen with one batched blit"""
+        screen.blits(self.blit_sequence, doreturn=False)
+
+
+class TimelineBar(pg.sprite.Sprite):
+    def __init__(
+        self,
+        left: float,
+        right: float,
+        y: float,
+        color: pg.Color = cfg.COLOR_GRAY1,
+        cursor_color: pg.Color | None = cfg.COLOR_BLACK,
+        width: int = 2,
+        label_color: pg.Color = cfg.COLOR_GRAY2,
+    ) -> None:
+        """
+        Timeline bar class. The cursor can be dragged to seek.
+
+        Args:
+            left (float): The left end of the bar as a percentage of the window width.
+            right (float): The right end of the bar as a percentage of the window width.
+            y (float): The vertical position of the bar as a percentage of the window height.
+            color (pg.Color): The color of the bar.
+            cursor_color (pg.Color | None): The color of the cursor. the cursor is hidden if None.
+            width (int): The width of the bar line.
+            label_color (pg.Color): The color of the marker labels.
+        """
+        super().__init__()
+        self.area: tuple[float, float, float] = (left / 100, right / 100, y / 100)
+        self.color: pg.Color = color
+        self.cursor_color: pg.Color = cursor_color
+        self.width: int = width
+        self.label_color: pg.Color = label_color
+        # (ratio, label) e.g. of the flight events
+        self.markers: list[tuple[float, str]] = []
+        self.marker_images: list[tuple[float, pg.Surface, pg.Rect]] = []
+        self.ratio: float = 0.0  # position of the cursor (0 to 1)
+        self.dragging: bool = False
+        self.window_size: tuple[int, int] = None
+        self.rect: pg.Rect = None  # collision rect of the bar
+        self.on_seek: callable = lambda ratio: None
+
+    def set_callback(self, callback) -> None:
+        """Set the function to be called with the ratio (0 to 1) when the cursor is dragged"""
+        self.on_seek = callback
+
+    def set_ratio(self, ratio: float) -> None:
+        """Set the position of the cursor (0 to 1)"""
+        self.ratio = min(max(ratio, 0.0), 1.0)
+
+    def set_markers(self, markers: list[tuple[float, str]]) -> None:
+        """Set the markers (ratio 0 to 1, label) on the bar. The labels are rendered at the next update"""
+        self.markers = [(min(max(ratio, 0.0), 1.0), label) for ratio, label in markers]
+        self.window_size = None  # force re-rendering
+
+    def update(self) -> None:
+        """Update the bar position based on the current window size"""
+        if self.window_size != Layout.get_window_size():
+            self.window_size = Layout.get_window_size()
+            left, right, y = self.area
+            margin = int(self.window_size[1] * 0.02)
+            self.rect = pg.Rect(
+                int(self.window_size[0] * left),
+                int(self.window_size[1] * y) - margin,
+                int(self.window_size[0] * (right - left)),
+                2 * margin,
+            )
+            # labels alternately below and above the bar, not to overlap the neighbors
+            font = Fonts.get_font("r_Mplus_regular", max(int(margin * 0.9), 8))
+            self.marker_images = []
+            for i, (ratio, label) in enumerate(self.markers):
+                x = self.rect.x + self.rect.width * ratio
+                image = font.render(label, True, self.label_color)
+                if i % 2 == 0:
+                    rect = image.get_rect(midtop=(x, self.rect.bottom))
+                else:
+                    rect = image.get_rect(midbottom=(x, self.rect.top))
+                self.marker_images.append((x, image, rect))
+
+    def __seek(self, x: int) -> None:
+        self.set_ratio((x - self.rect.x) / max(self.rect.width, 1))
+        self.on_seek(self.ratio)
+
+    def event_handler(self, event: pg.event.Event) -> None:
+        """Handle the mouse events to drag the cursor"""
+        if event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
+            if self.rect.collidepoint(event.pos):
+                self.dragging = True
+                self.__seek(event.pos[0])
+        elif event.type == pg.MOUSEMOTION and self.dragging:
+            self.__seek(event.pos[0])
+        elif event.type == pg.MOUSEBUTTONUP and event.button == 1:
+            self.dragging = False
+
+    def draw(self, screen: pg.Surface) -> None:
+        """Draw the bar and the cursor on the screen"""
+        y = self.rect.centery
+        pg.draw.line(
+            screen, self.color, (self.rect.left, y), (self.rect.right, y), self.width
+        )
+        tick = self.rect.height // 4
+        for x, image, rect in self.marker_images:
+            pg.draw.line(screen, self.label_color, (x, y - tick), (x, y + tick))
+            screen.blit(image, rect)
+        if self.cursor_color is not None:
+            x = self.rect.x + self.rect.width * self.ratio
+            pg.draw.circle(screen, self.cursor_color, (x, y), tick)
+
+
+class LineChart(pg.sprite.Sprite):
+    def __init__(
+        self,
+        area: tuple[float, float, float, float],
+        colors: list[pg.Color],
+        axis_color: pg.Color = cfg.COLOR_GRAY1,
+        cursor_color: pg.Color = cfg.COLOR_BLACK,
+        width: int = 2,
+    ) -> None:
+        """
+        Line chart class. The lines are rendered once for each window size, and only the cursor is drawn every frame.
+
+        Args:
+            area (tuple[float, float, float, float]): left, top, width and height of the chart as percentages of the window size.
+            colors (list[pg.Color]): The colors of the series.
+            axis_color (pg.Color): The color of the axes.
+            cursor_color (pg.Color): The color of the cursor.
+            width (int): The width of the lines.
+        """
+        super().__init__()
+        self.area: tuple[float, ...] = tuple(value / 100 for value in area)
+        self.colors: list[pg.Color] = colors
+        self.axis_color: pg.Color = axis_color
+        self.cursor_color: pg.Color = cursor_color
+        self.width: int = width
+        self.x: np.ndarray = np.zeros(0)
+        self.series: list[np.ndarray] = []
+        self.cursor: float = None  # x value of the cursor
+        self.window_size: tuple[int, int] = None
+        self.image: pg.Surface = None
+        self.rect: pg.Rect = None
+        self.cache = RenderCache()  # rendered charts at the previously seen sizes
+
+    def set_series(self, x: np.ndarray, series: list[np.ndarray]) -> None:
+        """Set the x values and the y values of each series (NaN is not drawn)"""
+        self.x = np.asarray(x, dtype=float)
+        self.series = [np.asarray(y, dtype=float) for y in series]
+        self.cache = RenderCache()
+        self.window_size = None  # force re-rendering
+        self.update()
+
+    def set_cursor(self, x: float | None) -> None:
+        """Set the x value of the cursor (hidden if None)"""
+        self.cursor = x
+
+    def update(self) -> None:
+        """Update the chart size and position based on the current window size"""
+        if self.window_size != Layout.get_window_size():
+            self.window_size = Layout.get_window_size()
+            self.image, self.rect = self.cache.get(self.window_size, self.render)
+
+    def render(self) -> tuple[pg.Surface, pg.Rect]:
+        """Render the axes and the lines for the current window size"""
+        left, top, width, height = self.area
+        rect = pg.Rect(
+            int(self.window_size[0] * left),
+            int(self.window_size[1] * top),
+            max(int(self.window_size[0] * width), 2),
+            max(int(self.window_size[1] * height), 2),
+        )
+        image = pg.Surface(rect.size, pg.SRCALPHA)
+        pg.draw.lines(
+            image,
+            self.axis_color,
+            False,
+            [(0, 0), (0, rect.height - 1), (rect.width - 1, rect.height - 1)],
+        )
+        if len(self.x) < 2:
+            return image, rect
+
+        finite = [y[np.isfinite(y)] for y in self.series]
+        y_max = max((float(y.max()) for y in finite if len(y)), default=1.0)
+        x_min, x_max = float(self.x[0]), float(self.x[-1])
+        px = (self.x - x_min) / max(x_max - x_min, 1e-9) * (rect.width - 1)
+        for y, color in zip(self.series, self.colors):
+            py = (1 - y / max(y_max, 1e-9)) * (rect.height - 1)
+            points = np.stack([px, py], axis=1)
+            # split the line at NaN
+            valid = np.isfinite(py)
+            edges = np.flatnonzero(np.diff(np.concatenate([[0], valid, [0]])))
+            for start, end in zip(edges[::2], edges[1::2]):
+                if end - start >= 2:
+                    pg.draw.lines(
+                        image, color, False, points[start:end].tolist(), self.width
+                    )
+        return image, rect
+
+    def draw(self, screen: pg.Surface) -> None:
+        """Draw the chart and the cursor on the screen"""
+        screen.blit(self.image, self.rect)
+        if self.cursor is not None and len(self.x) >= 2:
+            ratio = (self.cursor - self.x[0]) / max(self.x[-1] - self.x[0], 1e-9)
+            x = self.rect.x + min(max(ratio, 0.0), 1.0) * (self.rect.width - 1)
+            pg.draw.line(
+                screen, self.cursor_color, (x, self.rect.top), (x, self.rect.bottom)
+            )